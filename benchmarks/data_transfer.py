@@ -0,0 +1,47 @@
+""" Times the setup of the data transfers of a flat model with many connected
+variables, for which the index offset of every connection is needed."""
+
+from __future__ import print_function
+
+import sys
+import time
+
+import numpy as np
+
+from openmdao.core.problem import Problem
+from openmdao.core.group import Group
+from openmdao.components.indep_var_comp import IndepVarComp
+from openmdao.components.exec_comp import ExecComp
+
+
+class Chain(Group):
+
+    def __init__(self, size):
+        super(Chain, self).__init__()
+
+        self.add('p', IndepVarComp('x', np.ones(3)))
+        for i in range(size):
+            self.add('c%d' % i, ExecComp('y = 2.0*x', x=np.ones(3), y=np.ones(3)))
+            self.connect('p.x' if i == 0 else 'c%d.y' % (i - 1), 'c%d.x' % i)
+
+
+if __name__ == '__main__':
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    print("SIZE: %d" % size)
+
+    elapsed = [0.0]
+    setup_data_transfer = Group._setup_data_transfer
+
+    def timed(self, my_params, var_of_interest):
+        st = time.time()
+        setup_data_transfer(self, my_params, var_of_interest)
+        elapsed[0] += time.time() - st
+
+    Group._setup_data_transfer = timed
+
+    prob = Problem(Chain(size))
+
+    st = time.time()
+    prob.setup(check=False)
+    print("setup time", time.time() - st)
+    print("data transfer setup time", elapsed[0])
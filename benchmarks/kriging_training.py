@@ -0,0 +1,42 @@
+""" Times KrigingSurrogate training against the number of training points,
+for each of the optimizers it supports."""
+
+from __future__ import print_function
+
+import sys
+import time
+
+import numpy as np
+
+from openmdao.surrogate_models import KrigingSurrogate
+
+
+def func(x):
+    return np.sin(3. * x).dot(np.arange(1., x.shape[1] + 1.)) + x[:, 0] * x[:, -1]
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 200, 400, 800, 1600]
+    num_inputs = 4
+
+    np.random.seed(11)
+
+    print("%8s %12s %10s %16s" % ('n', 'optimizer', 'time (s)', 'log likelihood'))
+    for n in sizes:
+        x = np.random.random((n, num_inputs))
+        y = func(x).reshape(n, 1)
+
+        for optimizer in ('COBYLA', 'L-BFGS-B'):
+            surrogate = KrigingSurrogate(optimizer=optimizer)
+
+            # without a little smoothing, R is too ill-conditioned for a
+            # Cholesky factorization once there are more than a few hundred
+            # points
+            surrogate.nugget = 1e-6
+
+            st = time.time()
+            surrogate.train(x, y)
+            elapsed = time.time() - st
+
+            print("%8d %12s %10.3f %16.4f" % (n, optimizer, elapsed,
+                                              surrogate.log_likelihood))
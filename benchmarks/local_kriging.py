@@ -0,0 +1,51 @@
+""" Compares the accuracy and speed of LocalKrigingSurrogate and
+KrigingSurrogate as the number of training points grows."""
+
+from __future__ import print_function
+
+import sys
+import time
+
+import numpy as np
+
+from openmdao.surrogate_models import KrigingSurrogate, LocalKrigingSurrogate
+
+
+def func(x):
+    return np.sin(3. * x).dot(np.arange(1., x.shape[1] + 1.)) + x[:, 0] * x[:, -1]
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    num_inputs = 4
+
+    np.random.seed(11)
+    xtest = np.random.random((1000, num_inputs))
+    ytest = func(xtest)
+
+    print("%8s %22s %10s %10s %12s" % ('n', 'surrogate', 'train (s)',
+                                       'pred (s)', 'max error'))
+    for n in sizes:
+        x = np.random.random((n, num_inputs))
+        y = func(x).reshape(n, 1)
+
+        surrogates = [('local, 20 neighbors', LocalKrigingSurrogate(num_neighbors=20)),
+                      ('local, 50 neighbors', LocalKrigingSurrogate(num_neighbors=50)),
+                      ('local, 100 neighbors', LocalKrigingSurrogate(num_neighbors=100))]
+        if n <= 2000:
+            full = KrigingSurrogate()
+            full.nugget = 1e-6
+            surrogates.insert(0, ('full', full))
+
+        for name, surrogate in surrogates:
+            st = time.time()
+            surrogate.train(x, y)
+            train_time = time.time() - st
+
+            st = time.time()
+            f, rmse = surrogate.predict_batch(xtest)
+            pred_time = time.time() - st
+
+            error = np.abs(f[:, 0] - ytest).max()
+            print("%8d %22s %10.3f %10.3f %12.3e" % (n, name, train_time,
+                                                    pred_time, error))
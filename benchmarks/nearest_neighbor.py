@@ -0,0 +1,48 @@
+""" Times NearestNeighbor training, prediction and gradients against the
+number of training points, for each interpolant type."""
+
+from __future__ import print_function
+
+import sys
+import time
+
+import numpy as np
+
+from openmdao.surrogate_models import NearestNeighbor
+
+
+def func(x):
+    return np.sin(3. * x).dot(np.arange(1., x.shape[1] + 1.)) + x[:, 0] * x[:, -1]
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 4000, 16000, 64000]
+    num_inputs = 3
+    num_predict = 1000
+
+    np.random.seed(11)
+    xp = np.random.random((num_predict, num_inputs))
+
+    print("%8s %10s %10s %12s %12s" % ('n', 'type', 'train (s)',
+                                       'predict (s)', 'gradient (s)'))
+    for n in sizes:
+        x = np.random.random((n, num_inputs))
+        y = func(x).reshape(n, 1)
+
+        for itype in ('linear', 'weighted', 'rbf'):
+            surrogate = NearestNeighbor(interpolant_type=itype)
+
+            st = time.time()
+            surrogate.train(x, y)
+            train = time.time() - st
+
+            st = time.time()
+            surrogate.predict_batch(xp)
+            predict = time.time() - st
+
+            st = time.time()
+            surrogate.jacobian_batch(xp)
+            grad = time.time() - st
+
+            print("%8d %10s %10.3f %12.3f %12.3f" % (n, itype, train,
+                                                     predict, grad))
@@ -0,0 +1,51 @@
+""" Times setup and total derivatives of a multipoint model with a design
+variable and a constraint per point, which needs many relevance checks."""
+
+from __future__ import print_function
+
+import sys
+import time
+
+import numpy as np
+
+from openmdao.core.problem import Problem
+from openmdao.core.group import Group
+from openmdao.components.indep_var_comp import IndepVarComp
+from openmdao.components.exec_comp import ExecComp
+from openmdao.solvers.ln_gauss_seidel import LinearGaussSeidel
+
+
+class MultiPoint(Group):
+
+    def __init__(self, size):
+        super(MultiPoint, self).__init__()
+
+        for i in range(size):
+            self.add('x%d' % i, IndepVarComp('x', np.random.random()))
+            self.add('p%d' % i, ExecComp('y = 2.0*x + 1.0'))
+            self.connect('x%d.x' % i, 'p%d.x' % i)
+
+        self.ln_solver = LinearGaussSeidel()
+
+
+if __name__ == '__main__':
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    print("SIZE: %d" % size)
+
+    prob = Problem(MultiPoint(size))
+    for i in range(size):
+        prob.driver.add_desvar('x%d.x' % i)
+        prob.driver.add_constraint('p%d.y' % i, upper=0.)
+
+    st = time.time()
+    prob.setup(check=False)
+    print("setup time", time.time() - st)
+
+    prob.run()
+
+    for mode in ('fwd', 'rev'):
+        st = time.time()
+        prob.calc_gradient(['x%d.x' % i for i in range(size)],
+                           ['p%d.y' % i for i in range(size)],
+                           mode=mode, return_format='dict')
+        print("%s derivative time" % mode, time.time() - st)
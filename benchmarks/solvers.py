@@ -0,0 +1,367 @@
+""" Compares the options of the solvers on models chosen to stress them. Run
+with the name of a study, followed by its optional size arguments:
+
+    python solvers.py gauss_seidel [size]
+    python solvers.py newton [size]
+    python solvers.py broyden [size]
+    python solvers.py precon [nblocks] [size]
+    python solvers.py gmres [size] [nsteps]
+"""
+
+from __future__ import print_function
+
+import sys
+import time
+
+import numpy as np
+
+from openmdao.core.problem import Problem
+from openmdao.core.group import Group
+from openmdao.core.component import Component
+from openmdao.components.indep_var_comp import IndepVarComp
+from openmdao.solvers.broyden import Broyden
+from openmdao.solvers.newton import Newton
+from openmdao.solvers.nl_gauss_seidel import NLGaussSeidel
+from openmdao.solvers.scipy_gmres import ScipyGMRES
+
+
+class ModalDiscipline(Component):
+    """ y = tanh(A*x) + b, where A is dominated by a few strongly coupled
+    modes, as is typical for multidisciplinary analyses."""
+
+    def __init__(self, size, scale, seed=1):
+        super(ModalDiscipline, self).__init__()
+        rand = np.random.RandomState(seed)
+        U = np.linalg.qr(rand.standard_normal((size, 3)))[0]
+        noise = rand.random_sample((size, size)) - 0.5
+        self.A = scale * U.dot(U.T) + 0.3 * noise / np.sqrt(size)
+        self.b = rand.random_sample(size)
+
+        self.add_param('x', np.zeros(size))
+        self.add_output('y', np.zeros(size))
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        unknowns['y'] = np.tanh(self.A.dot(params['x'])) + self.b
+
+
+class ModalCoupled(Group):
+
+    def __init__(self, size, scale):
+        super(ModalCoupled, self).__init__()
+        self.add('d1', ModalDiscipline(size, scale))
+        self.add('d2', ModalDiscipline(size, -scale))
+        self.connect('d1.y', 'd2.x')
+        self.connect('d2.y', 'd1.x')
+
+        self.nl_solver = NLGaussSeidel()
+        self.nl_solver.options['atol'] = 1e-10
+        self.nl_solver.options['rtol'] = 1e-10
+        self.nl_solver.options['maxiter'] = 1000
+
+
+class FDDiscipline(Component):
+    """ y = tanh(A*x) + b, with derivatives by finite difference."""
+
+    def __init__(self, size, scale, seed):
+        super(FDDiscipline, self).__init__()
+        rand = np.random.RandomState(seed)
+        self.A = scale * (rand.random_sample((size, size)) - 0.5) / np.sqrt(size)
+        self.b = rand.random_sample(size)
+
+        self.add_param('x', np.zeros(size))
+        self.add_output('y', np.zeros(size))
+
+        self.fd_options['force_fd'] = True
+        self.num_solve = 0
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        unknowns['y'] = np.tanh(self.A.dot(params['x'])) + self.b
+        self.num_solve += 1
+
+
+class FDCoupled(Group):
+
+    def __init__(self, size):
+        super(FDCoupled, self).__init__()
+        self.add('p', IndepVarComp('b', np.ones(size)))
+        self.add('d1', FDDiscipline(size, 2.0, 1))
+        self.add('d2', FDDiscipline(size, -2.0, 2))
+        self.connect('d1.y', 'd2.x')
+        self.connect('d2.y', 'd1.x')
+
+        self.ln_solver = ScipyGMRES()
+
+
+class CubicState(Component):
+    """ R(x) = A*x + x**3 - b, with a Jacobian computed by finite differences,
+    which costs as much as one residual evaluation per state."""
+
+    def __init__(self, size):
+        super(CubicState, self).__init__()
+        rand = np.random.RandomState(0)
+        M = rand.random_sample((size, size)) - 0.5
+        self.A = M.dot(M.T) / size + np.eye(size)
+
+        self.add_param('b', np.zeros(size))
+        self.add_state('x', np.ones(size) * 3.0)
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        pass
+
+    def apply_nonlinear(self, params, unknowns, resids):
+        resids['x'] = self._resid(unknowns['x'], params['b'])
+
+    def _resid(self, x, b):
+        return self.A.dot(x) + x**3 - b
+
+    def jacobian(self, params, unknowns, resids):
+        x = unknowns['x'].copy()
+        b = params['b']
+        r0 = self._resid(x, b)
+        J = np.empty(self.A.shape)
+        for i in range(x.size):
+            x[i] += 1e-7
+            J[:, i] = (self._resid(x, b) - r0) / 1e-7
+            x[i] -= 1e-7
+        return {('x', 'x'): J, ('x', 'b'): -np.eye(x.size)}
+
+
+class LinearBlock(Component):
+    """ R(x) = D*x + C*x_in - b, where D is badly conditioned and C is a
+    weak coupling to the previous block."""
+
+    def __init__(self, size, seed):
+        super(LinearBlock, self).__init__()
+        rand = np.random.RandomState(seed)
+        Q = np.linalg.qr(rand.standard_normal((size, size)))[0]
+        self.D = Q.dot(np.diag(np.logspace(0, 3, size))).dot(Q.T)
+        self.C = 0.1 * rand.standard_normal((size, size))
+
+        self.add_param('x_in', np.zeros(size))
+        self.add_param('b', np.zeros(size))
+        self.add_state('x', np.zeros(size))
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        pass
+
+    def apply_nonlinear(self, params, unknowns, resids):
+        resids['x'] = self.D.dot(unknowns['x']) + self.C.dot(params['x_in']) - params['b']
+
+    def jacobian(self, params, unknowns, resids):
+        return {('x', 'x'): self.D, ('x', 'x_in'): self.C,
+                ('x', 'b'): -np.eye(self.D.shape[0])}
+
+
+class Ring(Group):
+
+    def __init__(self, nblocks, size):
+        super(Ring, self).__init__()
+        self.add('p', IndepVarComp('b', np.ones(size)))
+        for i in range(nblocks):
+            self.add('blk%d' % i, LinearBlock(size, i))
+            self.connect('p.b', 'blk%d.b' % i)
+            self.connect('blk%d.x' % i, 'blk%d.x_in' % ((i + 1) % nblocks))
+
+        self.ln_solver = ScipyGMRES()
+        self.ln_solver.options['atol'] = 1e-10
+        self.ln_solver.options['maxiter'] = 5000
+
+
+class LinearState(Component):
+    """ R(x) = b - A*x, where A has a few small eigenvalues that restarted
+    GMRES is slow to resolve."""
+
+    def __init__(self, size):
+        super(LinearState, self).__init__()
+        rand = np.random.RandomState(0)
+        eigs = np.hstack((np.logspace(-2, -1, 5), np.linspace(1, 10, size - 5)))
+        self.A = np.diag(eigs) + 0.1 * rand.standard_normal((size, size)) / np.sqrt(size)
+
+        self.add_param('b', np.zeros(size))
+        self.add_state('x', np.zeros(size))
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        pass
+
+    def apply_nonlinear(self, params, unknowns, resids):
+        resids['x'] = params['b'] - self.A.dot(unknowns['x'])
+
+    def jacobian(self, params, unknowns, resids):
+        return {('x', 'x'): -self.A, ('x', 'b'): np.eye(self.A.shape[0])}
+
+
+def _timed_run(prob):
+    """ Runs the problem and returns the elapsed time."""
+    st = time.time()
+    prob.run()
+    return time.time() - st
+
+
+def _count_iterations(solver):
+    """ Wraps the monitor of a ScipyGMRES solver so that it counts every
+    iteration, and returns the one element list holding the count."""
+    iters = [0]
+    monitor = solver.monitor
+
+    def counting_monitor(res):
+        monitor(res)
+        iters[0] += 1
+
+    solver.monitor = counting_monitor
+    return iters
+
+
+def gauss_seidel(size=100):
+    """ Nonlinear Gauss-Seidel iterations on a tightly coupled pair of
+    disciplines, with and without acceleration."""
+    print("%10s %8s %10s" % ('accel', 'iters', 'time (s)'))
+    for accel in ('none', 'aitken', 'anderson'):
+        prob = Problem(ModalCoupled(size, 0.95))
+        prob.root.nl_solver.options['accel'] = accel
+        prob.setup(check=False)
+
+        elapsed = _timed_run(prob)
+        print("%10s %8d %10.3f" % (accel, prob.root.nl_solver.iter_count, elapsed))
+
+
+def newton(size=500):
+    """ Newton on a large implicit component whose linearization is much
+    more expensive than a residual evaluation, for several combinations of
+    Jacobian reuse, Eisenstat-Walker forcing and line search."""
+    cases = [
+        {},
+        {'jac_reuse': 3},
+        {'forcing': 'eisenstat_walker'},
+        {'line_search': 'armijo'},
+        {'jac_reuse': 3, 'forcing': 'eisenstat_walker', 'line_search': 'armijo'},
+    ]
+
+    print("%-60s %6s %6s %10s" % ('options', 'iters', 'jacs', 'time (s)'))
+    for opts in cases:
+        prob = Problem(Group())
+        prob.root.add('p', IndepVarComp('b', np.linspace(1., 10., size)))
+        prob.root.add('comp', CubicState(size))
+        prob.root.connect('p.b', 'comp.b')
+
+        prob.root.nl_solver = Newton()
+        prob.root.nl_solver.options['maxiter'] = 50
+        for name, val in opts.items():
+            prob.root.nl_solver.options[name] = val
+        prob.root.ln_solver = ScipyGMRES()
+
+        prob.setup(check=False)
+
+        elapsed = _timed_run(prob)
+        solver = prob.root.nl_solver
+        print("%-60s %6d %6d %10.3f" % (opts, solver.iter_count, solver.jac_count,
+                                         elapsed))
+
+
+def broyden(size=200):
+    """ Newton and Broyden on a coupled group whose components only have
+    finite difference derivatives, so that every linearization costs one
+    evaluation per input."""
+    cases = [
+        (Newton, {}),
+        (Broyden, {'update': 'good'}),
+        (Broyden, {'update': 'bad'}),
+        (Broyden, {'update': 'good', 'memory': 5}),
+    ]
+
+    print("%-10s %-35s %6s %6s %8s %10s" % ('solver', 'options', 'iters', 'jacs',
+                                             'evals', 'time (s)'))
+    for solver, opts in cases:
+        prob = Problem(FDCoupled(size))
+        prob.root.nl_solver = solver()
+        prob.root.nl_solver.options['atol'] = 1e-10
+        prob.root.nl_solver.options['maxiter'] = 100
+        for name, val in opts.items():
+            prob.root.nl_solver.options[name] = val
+
+        prob.setup(check=False)
+
+        elapsed = _timed_run(prob)
+        s = prob.root.nl_solver
+        evals = prob.root.d1.num_solve + prob.root.d2.num_solve
+        print("%-10s %-35s %6d %6d %8d %10.3f" % (solver.__name__, opts, s.iter_count,
+                                                  s.jac_count, evals, elapsed))
+
+
+def precon(nblocks=8, size=50):
+    """ GMRES iterations for the derivatives of a ring of coupled implicit
+    components, each with a badly conditioned Jacobian, with each of the
+    preconditioners."""
+    print("%20s %12s %10s" % ('preconditioner', 'iters/rhs', 'time (s)'))
+    for pc_type in ('none', 'block_jacobi', 'block_gauss_seidel', 'ilu'):
+        prob = Problem(Ring(nblocks, size))
+        solver = prob.root.ln_solver
+        if pc_type != 'none':
+            solver.options['precondition'] = True
+            solver.options['pc_type'] = pc_type
+        prob.setup(check=False)
+        prob.run()
+
+        iters = _count_iterations(solver)
+
+        st = time.time()
+        prob.calc_gradient(['p.b'], ['blk0.x'], mode='fwd')
+        elapsed = time.time() - st
+
+        print("%20s %12.1f %10.3f" % (pc_type, float(iters[0]) / size, elapsed))
+
+
+def gmres(size=100, nsteps=3):
+    """ GMRES iterations for all of the derivatives of an implicit component
+    over several optimizer-like iterations, in which the Jacobian changes
+    slightly, with warm starts, restarts and recycling."""
+    cases = [
+        {},
+        {'restart': 50},
+        {'warm_start': True},
+        {'recycle': 10},
+        {'recycle': 10, 'restart': 50},
+    ]
+
+    print("%-35s %10s %10s" % ('options', 'iters', 'time (s)'))
+    for opts in cases:
+        prob = Problem(Group())
+        prob.root.add('p', IndepVarComp('b', np.ones(size)))
+        comp = prob.root.add('c', LinearState(size))
+        prob.root.connect('p.b', 'c.b')
+
+        solver = prob.root.ln_solver = ScipyGMRES()
+        solver.options['atol'] = 1e-10
+        solver.options['maxiter'] = 100000
+        for name, val in opts.items():
+            solver.options[name] = val
+
+        iters = _count_iterations(solver)
+
+        prob.setup(check=False)
+        prob.run()
+
+        rand = np.random.RandomState(1)
+        st = time.time()
+        for step in range(nsteps):
+            prob.calc_gradient(['p.b'], ['c.x'], mode='fwd')
+            comp.A += 1e-3 * rand.standard_normal((size, size)) / np.sqrt(size)
+        elapsed = time.time() - st
+
+        print("%-35s %10d %10.3f" % (opts, iters[0], elapsed))
+
+
+STUDIES = {
+    'gauss_seidel': gauss_seidel,
+    'newton': newton,
+    'broyden': broyden,
+    'precon': precon,
+    'gmres': gmres,
+}
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] not in STUDIES:
+        print(__doc__)
+        sys.exit("study must be one of %s" % sorted(STUDIES))
+
+    STUDIES[sys.argv[1]](*[int(arg) for arg in sys.argv[2:]])
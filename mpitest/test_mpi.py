@@ -11,8 +11,10 @@ from openmdao.core.component import Component
 from openmdao.core.mpi_wrap import MPI, MultiProcFailCheck
 
 from openmdao.components.indep_var_comp import IndepVarComp
+from openmdao.solvers.nl_block_jacobi import NLBlockJacobi
 
 from openmdao.test.mpi_util import MPITestCase
+from openmdao.test.sellar import SellarDis1, SellarDis2
 
 if MPI: # pragma: no cover
     from openmdao.core.petsc_impl import PetscImpl as impl
@@ -170,13 +172,38 @@ class MPITests2(MPITestCase):
             assert_rel_error(self, prob.root.G1.C2.unknowns['d'],
                              np.ones(size)*-.1, 1.e-10)
 
+    def test_block_jacobi(self):
+        prob = Problem(Group(), impl=impl)
+        root = prob.root
+        root.add('px', IndepVarComp('x', 1.0), promotes=['*'])
+        root.add('pz', IndepVarComp('z', np.array([5.0, 2.0])), promotes=['*'])
+
+        mda = root.add('mda', ParallelGroup(), promotes=['x', 'z'])
+        mda.add('d1', SellarDis1(), promotes=['x', 'z'])
+        mda.add('d2', SellarDis2(), promotes=['z'])
+        mda.connect('d1.y1', 'd2.y1')
+        mda.connect('d2.y2', 'd1.y2')
+
+        mda.nl_solver = NLBlockJacobi()
+        mda.nl_solver.options['atol'] = 1e-9
+
+        prob.setup(check=False)
+        prob.run()
+
+        if not MPI or self.comm.rank == 0:
+            assert_rel_error(self, mda.d1.unknowns['y1'], 25.58830273, .00001)
+
+        if not MPI or self.comm.rank == 1:
+            assert_rel_error(self, mda.d2.unknowns['y2'], 12.05848819, .00001)
+
     def test_wrong_impl(self):
         if MPI: # pragma: no cover
             try:
                 prob = Problem(Group())
             except Exception as err:
                 self.assertEqual(str(err),
-                   "To run under MPI, the impl for a Problem must be PetscImpl.")
+                   "To run under MPI, the impl for a Problem must be "
+                   "PetscImpl or Mpi4pyImpl.")
             else:
                 self.fail("Exception expected")
 
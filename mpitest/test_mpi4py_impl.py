@@ -0,0 +1,112 @@
+""" Tests for the mpi4py impl, which runs under MPI without petsc4py. """
+
+import unittest
+
+import numpy as np
+
+from openmdao.core.problem import Problem
+from openmdao.core.group import Group
+from openmdao.core.parallel_group import ParallelGroup
+from openmdao.core.mpi_wrap import MPI
+from openmdao.components.indep_var_comp import IndepVarComp
+from openmdao.components.exec_comp import ExecComp
+from openmdao.solvers.ln_gauss_seidel import LinearGaussSeidel
+from openmdao.test.mpi_util import MPITestCase
+from openmdao.test.util import assert_rel_error
+
+if MPI: # pragma: no cover
+    from openmdao.core.mpi4py_impl import Mpi4pyImpl as impl
+else:
+    from openmdao.core import BasicImpl as impl
+
+
+def _fan_out_problem(size=3):
+    prob = Problem(Group(), impl=impl)
+    root = prob.root
+
+    root.add('p', IndepVarComp('x', np.ones(size, float)))
+    sub = root.add('sub', ParallelGroup())
+    sub.add('comp1', ExecComp('y=3.0*x', x=np.zeros(size), y=np.zeros(size)))
+    sub.add('comp2', ExecComp('y=-2.0*x', x=np.zeros(size), y=np.zeros(size)))
+    sub.add('comp3', ExecComp('y=5.0*x', x=np.zeros(size), y=np.zeros(size)))
+    root.add('total', ExecComp('y=a+b+c', a=np.zeros(size), b=np.zeros(size),
+                               c=np.zeros(size), y=np.zeros(size)))
+
+    root.connect('p.x', ['sub.comp1.x', 'sub.comp2.x', 'sub.comp3.x'])
+    root.connect('sub.comp1.y', 'total.a')
+    root.connect('sub.comp2.y', 'total.b')
+    root.connect('sub.comp3.y', 'total.c')
+
+    root.ln_solver = LinearGaussSeidel()
+    sub.ln_solver = LinearGaussSeidel()
+
+    return prob
+
+
+class Mpi4pyImplTests1(MPITestCase):
+
+    N_PROCS = 1
+
+    def test_serial_chain(self):
+        size = 5
+        prob = Problem(Group(), impl=impl)
+        prob.root.add('A1', IndepVarComp('a', np.ones(size, float) * 3.0))
+        prob.root.add('B1', IndepVarComp('b', np.ones(size, float) * 7.0))
+        prob.root.add('C1', ExecComp('c=a+b', a=np.zeros(size),
+                                     b=np.zeros(size), c=np.zeros(size)))
+        prob.root.add('C2', ExecComp('c=a-b', a=np.zeros(size),
+                                     b=np.zeros(size), c=np.zeros(size)))
+        prob.root.connect('A1.a', 'C1.a')
+        prob.root.connect('B1.b', ['C1.b', 'C2.b'])
+        prob.root.connect('C1.c', 'C2.a')
+
+        prob.setup(check=False)
+        prob.run()
+
+        assert_rel_error(self, prob['C2.a'], np.ones(size)*10., 1.e-10)
+        assert_rel_error(self, prob['C2.c'], np.ones(size)*3., 1.e-10)
+
+
+class Mpi4pyImplTests3(MPITestCase):
+
+    N_PROCS = 3
+
+    def test_fan_out_in(self):
+        size = 3
+        prob = _fan_out_problem(size)
+        prob.setup(check=False)
+        prob['p.x'] = np.arange(size, dtype=float) + 1.0
+        prob.run()
+
+        if not MPI or self.comm.rank == 0:
+            assert_rel_error(self, prob['total.y'],
+                             6.0 * (np.arange(size) + 1.0), 1.e-10)
+
+    def test_derivs(self):
+        size = 3
+        prob = _fan_out_problem(size)
+        prob.setup(check=False)
+        prob.run()
+
+        for mode in ('fwd', 'rev'):
+            J = prob.calc_gradient(['p.x'], ['total.y'], mode=mode,
+                                   return_format='dict')
+            assert_rel_error(self, J['total.y']['p.x'],
+                             np.eye(size) * 6.0, 1.e-10)
+
+    def test_norm(self):
+        prob = _fan_out_problem()
+        prob.setup(check=False)
+
+        uvec = prob.root.sub.unknowns
+        uvec.vec[:] = 2.0
+        if MPI: # pragma: no cover
+            total = prob.root.sub.comm.allreduce(uvec.vec.size)
+        else:
+            total = uvec.vec.size
+        assert_rel_error(self, uvec.norm(), 2.0 * np.sqrt(total), 1.e-10)
+
+
+if __name__ == '__main__':
+    from openmdao.test.mpi_util import mpirun_tests
+    mpirun_tests()
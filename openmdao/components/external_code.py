@@ -4,13 +4,29 @@
 
 import sys
 import os
+import hashlib
+import tempfile
+import threading
+from functools import partial
+
+import numpy as np
 from numpy.distutils.exec_command import find_executable
+from six.moves import cPickle as pickle
 
 from openmdao.core.component import Component
 from openmdao.core.options import OptionsDictionary
-from openmdao.util.shell_proc import STDOUT, DEV_NULL, ShellProc
+from openmdao.util.file_cache import FileCache, hash_file
+from openmdao.util.file_util import build_directory, link_file, remove_directory
+from openmdao.util.shell_proc import STDOUT, DEV_NULL, ShellProc, proc_slot
+
+from six import iteritems, itervalues, iterkeys, string_types
 
-from six import iteritems, itervalues, iterkeys
+# memory-backed filesystem used for scratch directories when requested
+TMPFS_DIR = '/dev/shm'
+
+# FileCache objects shared by all ExternalCodes, keyed on cache directory
+_caches = {}
+_caches_lock = threading.Lock()
 
 class ExternalCode(Component):
     """
@@ -19,6 +35,22 @@ class ExternalCode(Component):
     Default stdin is the 'null' device, default stdout is the console, and
     default stderr is ``error.out``.
 
+    If options['scratch_dirs'] is True, each evaluation runs in a new
+    scratch directory (see `create_scratch_dir`) so that concurrent runs
+    don't clobber each other's files. Relative stream and output file names
+    then refer to files in that directory, which remains available as
+    `scratch_dir` until the next evaluation starts.
+
+    If options['cache_dir'] is set, the output files of each successful run
+    are stored in a persistent cache keyed on the component class, the values
+    of the params, the command, env_vars and the contents of stdin and the
+    external input files. Params that aren't arrays are keyed on their
+    pickled value, so pass-by-object params must be picklable. A later
+    evaluation with the same key restores the output files from the cache
+    instead of running the command, and sets `from_cache` to True. The cache
+    can be shared by several processes, but see `FileCache` for what that
+    implies.
+
     Options
     -------
     fd_options['force_fd'] :  bool(False)
@@ -29,18 +61,34 @@ class ExternalCode(Component):
         Default finite difference stepsize
     fd_options['step_type'] :  str('absolute')
         Set to absolute, relative
+    options['cache_dir'] :  str('')
+        Directory of the persistent result cache. An empty string disables caching
+    options['cache_max_size'] :  int(0)
+        Maximum size in bytes of the result cache. Least recently used results are evicted when it is exceeded. A value of zero implies no limit
     options['check_external_outputs'] :  bool(True)
         Check that all input or output external files exist
     options['command'] :  list([])
         command to be executed
+    options['concurrent'] :  bool(False)
+        Set to True to allow this command to run concurrently with other external codes in the same ParallelGroup
     options['env_vars'] :  dict({})
         Environment variables required by the command
     options['external_input_files'] :  list([])
         (optional) list of input file names to check the pressence of before solve_nonlinear
     options['external_output_files'] :  list([])
         (optional) list of input file names to check the pressence of after solve_nonlinear
+    options['input_file_mode'] :  str('symlink')
+        How external_input_files are placed in a scratch directory: symlink, hardlink or copy
+    options['keep_scratch_dirs'] :  bool(False)
+        Set to True to keep scratch directories instead of removing them
     options['poll_delay'] :  float(0.0)
-        Delay between polling for command completion. A value of zero will use an internally computed default
+        Delay between polling for command completion. A value of zero waits for completion without polling
+    options['scratch_dirs'] :  bool(False)
+        Set to True to run each evaluation in its own scratch directory
+    options['scratch_root'] :  str('')
+        Directory where scratch directories are created. An empty string uses the current directory
+    options['scratch_tmpfs'] :  bool(False)
+        Create scratch directories on a memory-backed filesystem (/dev/shm) if it exists and scratch_root is empty
     options['timeout'] :  float(0.0)
         Maximum time to wait for command completion. A value of zero implies an infinite wait
 
@@ -57,8 +105,10 @@ class ExternalCode(Component):
         self.options.add_option('command', [], desc='command to be executed')
         self.options.add_option('env_vars', {}, desc='Environment variables required by the command')
         self.options.add_option('poll_delay', 0.0,
-            desc='Delay between polling for command completion. A value of zero will use an internally computed default')
+            desc='Delay between polling for command completion. A value of zero waits for completion without polling')
         self.options.add_option('timeout', 0.0, desc='Maximum time to wait for command completion. A value of zero implies an infinite wait')
+        self.options.add_option('concurrent', False,
+            desc='Set to True to allow this command to run concurrently with other external codes in the same ParallelGroup')
         self.options.add_option('check_external_outputs', True,
             desc='Check that all input or output external files exist')
 
@@ -67,12 +117,32 @@ class ExternalCode(Component):
         self.options.add_option( 'external_output_files', [],
             desc='(optional) list of input file names to check the pressence of after solve_nonlinear')
 
+        self.options.add_option('scratch_dirs', False,
+            desc='Set to True to run each evaluation in its own scratch directory')
+        self.options.add_option('scratch_root', '',
+            desc='Directory where scratch directories are created. An empty string uses the current directory')
+        self.options.add_option('scratch_tmpfs', False,
+            desc='Create scratch directories on a memory-backed filesystem (/dev/shm) if it exists and scratch_root is empty')
+        self.options.add_option('input_file_mode', 'symlink',
+            values=['symlink', 'hardlink', 'copy'],
+            desc='How external_input_files are placed in a scratch directory: symlink, hardlink or copy')
+        self.options.add_option('keep_scratch_dirs', False,
+            desc='Set to True to keep scratch directories instead of removing them')
+
+        self.options.add_option('cache_dir', '',
+            desc='Directory of the persistent result cache. An empty string disables caching')
+        self.options.add_option('cache_max_size', 0, low=0,
+            desc='Maximum size in bytes of the result cache. Least recently used results are evicted when it is exceeded. A value of zero implies no limit')
+
         # Outputs of the run of the component or items that will not work with the OptionsDictionary
         self.return_code = 0 # Return code from the command
         self.timed_out = False # True if the command timed-out
+        self.from_cache = False # True if the results were restored from the cache
         self.stdin  = self.DEV_NULL
         self.stdout = None
         self.stderr = "error.out"
+        self.scratch_dir = None # Scratch directory of the current or last evaluation
+        self._scratch_ready = False
 
     def check_setup(self, out_stream=sys.stdout):
         """Write a report to the given stream indicating any potential problems found
@@ -103,12 +173,23 @@ class ExternalCode(Component):
             msg = "The %s file %s is missing" % ( iotype, path )
             out_stream.write(msg)
 
+    def is_concurrent(self):
+        """
+        Returns
+        -------
+        bool
+            True if options['concurrent'] is set, so that this command runs at
+            the same time as other concurrent systems in a `ParallelGroup`.
+        """
+        return self.options['concurrent']
+
     def solve_nonlinear(self, params, unknowns, resids):
         """Runs the component
         """
 
         self.return_code = -12345678
         self.timed_out = False
+        self.from_cache = False
 
         if not self.options['command']:
             raise ValueError('Empty command list')
@@ -118,6 +199,17 @@ class ExternalCode(Component):
         return_code = None
         error_msg = ''
         try:
+            if self.options['scratch_dirs'] and not self._scratch_ready:
+                self.create_scratch_dir()
+
+            cache = self._get_cache()
+            if cache is not None:
+                key = self._cache_key(params)
+                if cache.get(key, self._run_path) is not None:
+                    self.from_cache = True
+                    return_code = 0
+                    return
+
             return_code, error_msg = self._execute_local()
 
             if return_code is None:
@@ -129,8 +221,9 @@ class ExternalCode(Component):
 
             elif return_code:
                 if isinstance(self.stderr, str):
-                    if os.path.exists(self.stderr):
-                        stderrfile = open(self.stderr, 'r')
+                    stderr_path = self._run_path(self.stderr)
+                    if os.path.exists(stderr_path):
+                        stderrfile = open(stderr_path, 'r')
                         error_desc = stderrfile.read()
                         stderrfile.close()
                         err_fragment = "\nError Output:\n%s" % error_desc
@@ -150,8 +243,149 @@ class ExternalCode(Component):
                 if msg:
                     raise RuntimeError( "Missing files: %s" % msg )
                 # self.check_files(inputs=False)
+
+            if cache is not None:
+                cache.put(key, self._cached_files(),
+                          meta={'command': self.options['command']})
         finally:
             self.return_code = -999999 if return_code is None else return_code
+            self._scratch_ready = False
+
+    def create_scratch_dir(self):
+        """
+        Create a new scratch directory for the next evaluation and place the
+        relative `external_input_files` that exist into it, linked or copied
+        according to options['input_file_mode']. Linked files must not be
+        modified by the command. The previous scratch directory is removed
+        in the background unless options['keep_scratch_dirs'] is True.
+
+        This is called by solve_nonlinear when needed. Subclasses that
+        generate input files may call it first and write them into the
+        returned directory.
+
+        Returns
+        -------
+        str
+            Absolute path of the new scratch directory.
+        """
+        self.remove_scratch_dir(background=True)
+
+        root = self.options['scratch_root']
+        if not root:
+            if self.options['scratch_tmpfs'] and os.path.isdir(TMPFS_DIR):
+                root = TMPFS_DIR
+            else:
+                root = os.getcwd()
+
+        prefix = '%s-' % (self.pathname or 'extcode')
+        self.scratch_dir = os.path.abspath(tempfile.mkdtemp(prefix=prefix, dir=root))
+
+        mode = self.options['input_file_mode']
+        staged = {}
+        for path in self.options['external_input_files']:
+            if not os.path.isabs(path) and os.path.exists(path):
+                staged[path] = partial(link_file, os.path.abspath(path), mode=mode)
+        build_directory(staged, topdir=self.scratch_dir)
+
+        self._scratch_ready = True
+        return self.scratch_dir
+
+    def remove_scratch_dir(self, background=False):
+        """
+        Remove the current scratch directory, if any, unless
+        options['keep_scratch_dirs'] is True.
+
+        Args
+        ----
+        background : bool, optional
+            If True, don't wait for the directory to be removed.
+        """
+        if self.scratch_dir is not None:
+            if not self.options['keep_scratch_dirs']:
+                remove_directory(self.scratch_dir, background=background)
+            self.scratch_dir = None
+        self._scratch_ready = False
+
+    def _get_cache(self):
+        """ Return the `FileCache` for options['cache_dir'], or None if
+        caching is disabled."""
+        cache_dir = self.options['cache_dir']
+        if not cache_dir:
+            return None
+
+        cache_dir = os.path.abspath(cache_dir)
+        with _caches_lock:
+            cache = _caches.get(cache_dir)
+            if cache is None:
+                cache = _caches[cache_dir] = FileCache(cache_dir)
+        cache.max_size = self.options['cache_max_size']
+        return cache
+
+    def _cache_key(self, params):
+        """ Return a hash of everything that determines the results of a
+        run: component class, param values, command, env_vars and the
+        contents of stdin and the input files."""
+        sha = hashlib.sha1()
+
+        def _update(val, name=None):
+            if isinstance(val, np.ndarray) and not val.dtype.hasobject:
+                sha.update(('%s%s' % (val.dtype.str, val.shape)).encode())
+                sha.update(np.ascontiguousarray(val).tobytes())
+                return
+            # the repr of an object may include its address, so objects are
+            # keyed on their pickled state instead
+            try:
+                data = pickle.dumps(val, 2)
+            except Exception as err:
+                raise TypeError("%s: can't cache the result of a run because "
+                                "param '%s' can't be pickled: %s" %
+                                (self.pathname, name, err))
+            sha.update(data)
+
+        _update('%s.%s' % (type(self).__module__, type(self).__name__))
+
+        for name in sorted(params.keys()):
+            _update(name)
+            _update(params[name], name)
+
+        _update(self.options['command'])
+        _update(sorted(self.options['env_vars'].items()))
+
+        paths = list(self.options['external_input_files'])
+        if isinstance(self.stdin, string_types) and self.stdin != DEV_NULL:
+            paths.append(self.stdin)
+
+        for path in paths:
+            # inputs may have been generated in the run directory
+            run_path = self._run_path(path)
+            if not os.path.exists(run_path):
+                run_path = path
+            _update(path)
+            _update(hash_file(run_path) if os.path.exists(run_path) else None)
+
+        return sha.hexdigest()
+
+    def _cached_files(self):
+        """ Return a dict of the output and stream files of the last run to
+        be stored in the cache, mapped to their current paths."""
+        names = list(self.options['external_output_files'])
+        for stream in (self.stdout, self.stderr):
+            if isinstance(stream, string_types) and stream != DEV_NULL:
+                names.append(stream)
+
+        files = {}
+        for name in names:
+            path = self._run_path(name)
+            if os.path.isfile(path):
+                files[name] = path
+        return files
+
+    def _run_path(self, path):
+        """ Return `path` relative to the directory where the command runs. """
+        if self.options['scratch_dirs'] and self.scratch_dir is not None and \
+           isinstance(path, string_types) and path != DEV_NULL and not os.path.isabs(path):
+            return os.path.join(self.scratch_dir, path)
+        return path
 
     def _check_for_files(self, input=True):
         """
@@ -164,13 +398,16 @@ class ExternalCode(Component):
         missing_files = []
 
         if input:
+            iotype = 'input'
             files = self.options['external_input_files']
         else:
-            files = self.options['external_output_files']
+            iotype = 'output'
+            files = [self._run_path(path)
+                     for path in self.options['external_output_files']]
 
         for path in files:
             if not os.path.exists(path):
-                missing_files.append(('input', path))
+                missing_files.append((iotype, path))
 
         return missing_files
 
@@ -193,17 +430,21 @@ class ExternalCode(Component):
         if sys.platform == 'win32':
             command_for_shell_proc = ['cmd.exe', '/c' ] + command_for_shell_proc
 
-        self._process = \
-            ShellProc(command_for_shell_proc, self.stdin,
-                      self.stdout, self.stderr, self.options['env_vars'])
-        #self._logger.debug('PID = %d', self._process.pid)
-
-        try:
-            return_code, error_msg = \
-                self._process.wait(self.options['poll_delay'], self.options['timeout'])
-        finally:
-            self._process.close_files()
-            self._process = None
+        # wait for a free slot if the number of concurrent processes is limited
+        with proc_slot():
+            self._process = \
+                ShellProc(command_for_shell_proc, self._run_path(self.stdin),
+                          self._run_path(self.stdout), self._run_path(self.stderr),
+                          self.options['env_vars'],
+                          cwd=self.scratch_dir if self.options['scratch_dirs'] else None)
+            #self._logger.debug('PID = %d', self._process.pid)
+
+            try:
+                return_code, error_msg = \
+                    self._process.wait(self.options['poll_delay'], self.options['timeout'])
+            finally:
+                self._process.close_files()
+                self._process = None
 
         # et = time.time() - start_time
         #if et >= 60:  #pragma no cover
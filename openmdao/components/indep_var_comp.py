@@ -1,7 +1,7 @@
 """ OpenMDAO class definition for IndepVarComp"""
 
 import collections
-from six import string_types, iteritems
+from six import string_types
 
 from openmdao.core.component import Component
 
@@ -82,9 +82,8 @@ class IndepVarComp(Component):
             if gs_outputs is None:
                 rhs_vec[voi].vec[:] += sol_vec[voi].vec
             else:
-                for var, meta in iteritems(self.dumat[voi]):
-                    if var in gs_outputs[voi]:
-                        rhs_vec[voi][var] += sol_vec[voi][var]
+                idxs = self._gs_diag_idxs(voi, gs_outputs[voi])
+                rhs_vec[voi].vec[idxs] += sol_vec[voi].vec[idxs]
 
     def solve_nonlinear(self, params, unknowns, resids):
         """ Performs no operation. """
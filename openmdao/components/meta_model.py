@@ -1,11 +1,16 @@
 """ Metamodel provides basic Meta Modeling capability."""
 
 import sys
+import os
+import hashlib
+import threading
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
 import numpy as np
 from copy import deepcopy
 
 from openmdao.core.component import Component, _NotSet
-from six import iteritems
+from six import iteritems, string_types
 
 
 class MetaModel(Component):
@@ -15,6 +20,10 @@ class MetaModel(Component):
     'train:' prepended to the corresponding parameter/output name.
 
     For a Float variable, the training data is an array of length m.
+    For an array variable, it is a sequence of m arrays, or an array whose
+    first dimension is m. The training data can also be the name of a .npy
+    file holding such an array, which is then memory-mapped rather than
+    read.
 
     Options
     -------
@@ -47,10 +56,30 @@ class MetaModel(Component):
 
         # When set to False (default), the metamodel retrains with the new
         # dataset whenever the training data values are changed. When set to
-        # True, the new data is appended to the old data and all of the data
-        # is used to train.
+        # True, the new data is appended to the old data. Surrogates that
+        # have an `update` method are then just updated with the new data,
+        # and the others are trained again on all of the data.
         self.warm_restart = False
 
+        # When set to a directory, each trained surrogate is saved there,
+        # keyed on its type, settings and training data, and later training
+        # with the same data, e.g. in another process, just loads the saved
+        # surrogate.
+        self.cache_dir = None
+
+        # Number of surrogates that are trained at the same time, each in a
+        # separate process, or in a separate thread if train_in_threads is
+        # True. Threads avoid copying the surrogates and training data, but
+        # only run in parallel while numpy releases the GIL. Surrogates that
+        # aren't thread safe, which includes the Kriging and MultiFiCoKriging
+        # surrogates, are still trained one at a time, so threads don't
+        # speed up their training and processes should be used instead.
+        # Each surrogate is trained after seeding numpy's random number
+        # generator from a seed drawn from it in this process, so the results
+        # don't depend on the number of workers.
+        self.num_train_workers = 1
+        self.train_in_threads = False
+
         # keeps track of which sur_<name> slots are full
         self._surrogate_overrides = set()
 
@@ -187,6 +216,67 @@ class MetaModel(Component):
                 raise RuntimeError("Metamodel '%s': No surrogate specified for output '%s'"
                                    % (self.pathname, name))
 
+    def predict_batch(self, inputs):
+        """Predict outputs at several points at once, so each surrogate
+        is only called once. If the training flag is set, train the
+        metamodel first.
+
+        Args
+        ----
+        inputs : dict
+            Maps the name of each param to a sequence holding its value at
+            each point, in the same form as the training data.
+
+        Returns
+        -------
+        dict
+            Maps the name of each output to its predicted values, stacked
+            along the first axis.
+        """
+        num_pts = None
+        for name, sz in self._surrogate_param_names:
+            val = inputs[name]
+            if num_pts is None:
+                num_pts = len(val)
+            elif len(val) != num_pts:
+                msg = "MetaModel: Each variable must have the same number"\
+                      " of points. Expected {0} but found {1} "\
+                      "points for '{2}'."\
+                      .format(num_pts, len(val), name)
+                raise RuntimeError(msg)
+
+        if num_pts is None:
+            raise RuntimeError("Metamodel '%s': predict_batch needs at least one "
+                               "param to tell how many points to predict."
+                               % self.pathname)
+
+        if self.train:
+            self._train()
+
+        x = np.zeros((num_pts, self._input_size))
+        idx = 0
+        for name, sz in self._surrogate_param_names:
+            x[:, idx:idx + sz] = np.asarray(inputs[name], dtype=float).reshape(num_pts, sz)
+            idx += sz
+
+        outputs = {}
+        for name, shape in self._surrogate_output_names:
+            surrogate = self._unknowns_dict[name].get('surrogate')
+            if not surrogate:
+                raise RuntimeError("Metamodel '%s': No surrogate specified for output '%s'"
+                                   % (self.pathname, name))
+
+            pred = surrogate.predict_batch(x)
+            if isinstance(pred, np.ndarray) and \
+                    not self._unknowns_dict[name].get('pass_by_obj'):
+                if isinstance(shape, tuple):
+                    pred = pred.reshape((num_pts,) + shape)
+                else:
+                    pred = pred.reshape(num_pts)
+            outputs[name] = pred
+
+        return outputs
+
     def _params_to_inputs(self, params, out=None):
         """
         Converts from a dictionary of parameters to the ndarray input.
@@ -252,8 +342,9 @@ class MetaModel(Component):
         """
 
         num_sample = None
+        train_params = {}
         for name, sz in self._surrogate_param_names:
-            val = self.params['train:' + name]
+            val = train_params[name] = _get_training_data(self.params, name)
             if num_sample is None:
                 num_sample = len(val)
             elif len(val) != num_sample:
@@ -263,8 +354,9 @@ class MetaModel(Component):
                       .format(num_sample, len(val), name)
                 raise RuntimeError(msg)
 
+        train_outputs = {}
         for name, shape in self._surrogate_output_names:
-            val = self.unknowns['train:' + name]
+            val = train_outputs[name] = _get_training_data(self.unknowns, name)
             if len(val) != num_sample:
                 msg = "MetaModel: Each variable must have the same number" \
                       " of training points. Expected {0} but found {1} " \
@@ -289,17 +381,17 @@ class MetaModel(Component):
         if num_sample > 0:
             idx = 0
             for name, sz in self._surrogate_param_names:
-                val = self.params['train:' + name]
-                if isinstance(val[0], float):
-                    new_input[:, idx] = val
-                    idx += 1
-                else:
-                    for row_idx, v in enumerate(val):
-                        if not isinstance(v, np.ndarray):
-                            v = np.array(v)
-                        new_input[row_idx, idx:idx+sz] = v.flat
+                new_input[:, idx:idx+sz] = _training_array(train_params[name],
+                                                           num_sample, sz)
+                idx += sz
+
+        # the inputs are the same for every output
+        input_hash = None
+        if self.cache_dir:
+            input_hash = _hash_array(self._training_input)
 
         # add training data for each output
+        to_train = []
         for name, shape in self._surrogate_output_names:
             if num_sample > 0:
                 output_size = np.prod(shape)
@@ -316,22 +408,114 @@ class MetaModel(Component):
                     self._training_output[name] = outputs
                     new_output = outputs
 
-                val = self.unknowns['train:' + name]
-
-                if isinstance(val[0], float):
-                    new_output[:, 0] = val
-                else:
-                    for row_idx, v in enumerate(val):
-                        if not isinstance(v, np.ndarray):
-                            v = np.array(v)
-                        new_output[row_idx, :] = v.flat
+                new_output[:] = _training_array(train_outputs[name], num_sample,
+                                                output_size)
 
             surrogate = self._unknowns_dict[name].get('surrogate')
-            if surrogate is not None:
-                surrogate.train(self._training_input, self._training_output[name])
+            if surrogate is None:
+                continue
+
+            if self.cache_dir:
+                path = os.path.join(self.cache_dir,
+                                    self._cache_key(surrogate, name, input_hash))
+                if os.path.exists(path):
+                    surrogate.load(path)
+                    continue
+
+            if self.warm_restart and num_old_pts > 0 and \
+                    surrogate.trained and hasattr(surrogate, 'update'):
+                if num_sample > 0:
+                    surrogate.update(new_input, new_output)
+                if self.cache_dir:
+                    self._save_surrogate(surrogate, path)
+            else:
+                to_train.append((name, surrogate,
+                                 path if self.cache_dir else None))
+
+        self._train_surrogates(to_train)
 
         self.train = False
 
+    def _train_surrogates(self, to_train):
+        """
+        Train surrogates on all of the training data, using a pool of
+        processes or threads if num_train_workers is more than 1.
+
+        Args
+        ----
+        to_train : list of (name, surrogate, path) tuples
+            The output name and surrogate to be trained, and the path where
+            the trained surrogate is saved, or None.
+        """
+        num_workers = min(self.num_train_workers, len(to_train))
+
+        # one seed per surrogate, drawn in output order, whichever way they
+        # are trained
+        seeds = np.random.randint(0, 2**31 - 1, len(to_train))
+        jobs = [(surrogate, self._training_input, self._training_output[name],
+                 seed, False)
+                for (name, surrogate, path), seed in zip(to_train, seeds)]
+
+        # training reseeds the generator in this process when it's done
+        # serially or in threads, so leave it as it would be after training
+        # in worker processes
+        state = np.random.get_state()
+        try:
+            if num_workers > 1:
+                if self.train_in_threads:
+                    pool = ThreadPool(num_workers)
+                    jobs = [job[:4] + (True,) for job in jobs]
+                else:
+                    # the inputs are the same for every output, so they're
+                    # only sent once to each process
+                    pool = Pool(num_workers, initializer=_init_train_worker,
+                                initargs=(self._training_input,))
+                    jobs = [(job[0], None) + job[2:] for job in jobs]
+
+                try:
+                    trained = pool.map(_train_surrogate, jobs)
+                finally:
+                    pool.terminate()
+                    pool.join()
+
+                for (name, surrogate, path), result in zip(to_train, trained):
+                    if result is not surrogate:
+                        surrogate.__dict__.clear()
+                        surrogate.__dict__.update(result.__dict__)
+            else:
+                for job in jobs:
+                    _train_surrogate(job)
+        finally:
+            np.random.set_state(state)
+
+        for name, surrogate, path in to_train:
+            if path is not None:
+                self._save_surrogate(surrogate, path)
+
+    def _save_surrogate(self, surrogate, path):
+        """ Save a trained surrogate in the cache directory."""
+        if not os.path.isdir(self.cache_dir):
+            try:
+                os.makedirs(self.cache_dir)
+            except OSError:
+                if not os.path.isdir(self.cache_dir):  # not just created by someone else
+                    raise
+        surrogate.save(path)
+
+    def _cache_key(self, surrogate, name, input_hash):
+        """
+        Returns the key of the trained surrogate for output `name` in the
+        cache, which is a hash of the surrogate type, its settings and the
+        training data.
+        """
+        sha = hashlib.sha1()
+        sha.update(('%s.%s' % (type(surrogate).__module__,
+                               type(surrogate).__name__)).encode('utf-8'))
+        sha.update(repr(sorted(surrogate._cache_params().items())).encode('utf-8'))
+        sha.update(input_hash.encode('utf-8'))
+        sha.update(_hash_array(self._training_output[name]).encode('utf-8'))
+        return sha.hexdigest()
+
     def _get_fd_params(self):
         """
         Get the list of parameters that are needed to perform a
@@ -355,3 +539,66 @@ class MetaModel(Component):
             List of names of unknowns for this `Component`.
         """
         return [k for k, m in iteritems(self.unknowns) if not (m.get('pass_by_obj') or k.startswith('train'))]
+
+
+def _get_training_data(vec, name):
+    """
+    Returns the training data for variable `name` from `vec`, memory-mapping
+    it if it's given as the name of a .npy file.
+    """
+    val = vec['train:' + name]
+    if isinstance(val, string_types):
+        val = np.load(val, mmap_mode='r')
+    return val
+
+
+def _training_array(val, num_sample, size):
+    """
+    Returns training data as an array of shape (num_sample, size), which
+    takes a single conversion whether `val` is an array or a sequence of
+    floats or arrays.
+    """
+    return np.asarray(val, dtype=float).reshape(num_sample, size)
+
+
+# training inputs shared by all surrogates trained in a worker process
+_worker_input = None
+
+# held while training surrogates that aren't thread safe in a worker thread
+_train_lock = threading.Lock()
+
+
+def _init_train_worker(training_input):
+    global _worker_input
+    _worker_input = training_input
+
+
+def _train_surrogate(job):
+    """
+    Trains a surrogate, in this process or in a worker process or thread,
+    and returns it.
+    """
+    surrogate, training_input, training_output, seed, in_thread = job
+    if training_input is None:
+        training_input = _worker_input
+    if in_thread and surrogate.thread_safe:
+        # thread safe surrogates don't use numpy's random number generator,
+        # which every thread shares, so there is nothing to seed
+        surrogate.train(training_input, training_output)
+    elif in_thread:
+        with _train_lock:
+            np.random.seed(seed)
+            surrogate.train(training_input, training_output)
+    else:
+        np.random.seed(seed)
+        surrogate.train(training_input, training_output)
+    return surrogate
+
+
+def _hash_array(data):
+    """ Returns a hex digest of the shape and contents of an array."""
+    data = np.ascontiguousarray(data, dtype=float)
+    sha = hashlib.sha1()
+    sha.update(str(data.shape).encode('utf-8'))
+    sha.update(data.data)
+    return sha.hexdigest()
@@ -1,6 +1,6 @@
 import numpy as np
 
-from openmdao.components.meta_model import MetaModel
+from openmdao.components.meta_model import MetaModel, _get_training_data, _training_array
 from openmdao.core.component import _NotSet
 
 # generate variable names taking into account fidelity level
@@ -105,10 +105,11 @@ class MultiFiMetaModel(MetaModel):
             return
 
         num_sample = self._nfi*[None]
+        train_params = {}
         for name, sz in self._surrogate_param_names:
             for fi in range(self._nfi):
                 name = _get_name_fi(name, fi)
-                val = self.params['train:' + name]
+                val = train_params[name] = _get_training_data(self.params, name)
                 if num_sample[fi] is None:
                     num_sample[fi] = len(val)
                 elif len(val) != num_sample[fi]:
@@ -118,10 +119,11 @@ class MultiFiMetaModel(MetaModel):
                           .format(num_sample[fi], len(val), name)
                     raise RuntimeError(msg)
 
+        train_outputs = {}
         for name, shape in self._surrogate_output_names:
             for fi in range(self._nfi):
                 name = _get_name_fi(name, fi)
-                val = self.unknowns['train:' + name]
+                val = train_outputs[name] = _get_training_data(self.unknowns, name)
                 if len(val) != num_sample[fi]:
                     msg = "MetaModel: Each variable must have the same number" \
                           " of training points. Expected {0} but found {1} " \
@@ -153,15 +155,9 @@ class MultiFiMetaModel(MetaModel):
             for fi in range(self._nfi):
                 if num_sample[fi] > 0:
                     name = _get_name_fi(name, fi)
-                    val = self.params['train:' + name]
-                    if isinstance(val[0], float):
-                        new_inputs[fi][:, idx[fi]] = val
-                        idx[fi] += 1
-                    else:
-                        for row_idx, v in enumerate(val):
-                            if not isinstance(v, np.ndarray):
-                                v = np.array(v)
-                            new_inputs[fi][row_idx, idx[fi]:idx[fi]+sz] = v.flat
+                    new_inputs[fi][:, idx[fi]:idx[fi]+sz] = \
+                        _training_array(train_params[name], num_sample[fi], sz)
+                    idx[fi] += sz
 
         # add training data for each output
         outputs=self._nfi*[None]
@@ -184,15 +180,8 @@ class MultiFiMetaModel(MetaModel):
                         self._training_output[name].extend(outputs)
                         new_outputs = outputs
 
-                    val = self.unknowns['train:' + name_fi]
-
-                    if isinstance(val[0], float):
-                        new_outputs[fi][:, 0] = val
-                    else:
-                        for row_idx, v in enumerate(val):
-                            if not isinstance(v, np.ndarray):
-                                v = np.array(v)
-                            new_outputs[fi][row_idx, :] = v.flat
+                    new_outputs[fi][:] = _training_array(train_outputs[name_fi],
+                                                         num_sample[fi], output_size)
 
             surrogate = self._unknowns_dict[name].get('surrogate')
             if surrogate is not None:
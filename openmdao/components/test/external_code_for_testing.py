@@ -11,9 +11,12 @@ def main():
                     action="store_true", default=False)
     parser.add_argument("-d", "--delay", type=float,
                     help="time in seconds to delay")
+    parser.add_argument("-t", "--write_times", help="Write the start and end times of the run to the file",
+                    action="store_true", default=False)
 
     args = parser.parse_args()
 
+    start = time.time()
     if args.delay:
         if args.delay < 0:
             raise ValueError('delay must be >= 0')
@@ -23,6 +26,8 @@ def main():
         out.write("test data\n")
         if args.write_test_env_var:
             out.write("%s\n" % os.environ['TEST_ENV_VAR'])
+        if args.write_times:
+            out.write("%r %r\n" % (start, time.time()))
 
     return 0
 
@@ -5,11 +5,13 @@ import os
 import sys
 import tempfile
 import shutil
+import time
 import pkg_resources
 
-from openmdao.core import Problem, Group
+from openmdao.core import Problem, Group, ParallelGroup
 from openmdao.components.external_code import STDOUT
 from openmdao.components import ExternalCode
+from openmdao.util.shell_proc import set_max_procs
 
 
 DIRECTORY = pkg_resources.resource_filename('openmdao.components', 'test')
@@ -19,6 +21,16 @@ class ExternalCodeForTesting(ExternalCode):
         super(ExternalCodeForTesting, self).__init__()
 
 
+class OtherExternalCode(ExternalCodeForTesting):
+    pass
+
+
+class Settings(object):
+    """ Pass-by-object param whose repr includes its address. """
+    def __init__(self, value):
+        self.value = value
+
+
 class TestExternalCode(unittest.TestCase):
 
     def setUp(self):
@@ -148,6 +160,216 @@ class TestExternalCode(unittest.TestCase):
         self.top.run()
 
 
+    def test_scratch_dirs(self):
+        self.extcode.options['command'] = ['python', 'external_code_for_testing.py',
+                                           'external_code_output.txt']
+        self.extcode.options['external_input_files'] = ['external_code_for_testing.py',]
+        self.extcode.options['external_output_files'] = ['external_code_output.txt',]
+        self.extcode.options['scratch_dirs'] = True
+        self.extcode.stdout = 'extcode.out'
+
+        self.top.setup(check=False)
+        self.top.run()
+
+        scratch = self.extcode.scratch_dir
+        self.assertEqual(os.path.dirname(scratch), os.path.realpath(self.tempdir))
+        self.assertTrue(os.path.exists(os.path.join(scratch, 'external_code_output.txt')))
+        self.assertTrue(os.path.exists(os.path.join(scratch, 'extcode.out')))
+        self.assertFalse(os.path.exists('external_code_output.txt'))
+        if hasattr(os, 'symlink'):
+            self.assertTrue(os.path.islink(os.path.join(scratch,
+                                                        'external_code_for_testing.py')))
+
+        # a new directory is used for the next evaluation and the old one
+        # is removed
+        self.top.run()
+        self.assertNotEqual(self.extcode.scratch_dir, scratch)
+        self.extcode.remove_scratch_dir()
+        for i in range(50):
+            if not os.path.exists(scratch):
+                break
+            time.sleep(0.1)
+        self.assertFalse(os.path.exists(scratch))
+        self.assertEqual(self.extcode.scratch_dir, None)
+
+    def test_scratch_dirs_copy(self):
+        self.extcode.options['command'] = ['python', 'external_code_for_testing.py',
+                                           'external_code_output.txt']
+        self.extcode.options['external_input_files'] = ['external_code_for_testing.py',]
+        self.extcode.options['scratch_dirs'] = True
+        self.extcode.options['input_file_mode'] = 'copy'
+        self.extcode.options['keep_scratch_dirs'] = True
+        os.mkdir('scratch')
+        self.extcode.options['scratch_root'] = 'scratch'
+
+        self.top.setup(check=False)
+        self.top.run()
+        scratch = self.extcode.scratch_dir
+        self.top.run()
+
+        self.assertTrue(os.path.isdir(scratch))
+        self.assertEqual(len(os.listdir('scratch')), 2)
+        staged = os.path.join(self.extcode.scratch_dir, 'external_code_for_testing.py')
+        self.assertTrue(os.path.isfile(staged))
+        self.assertFalse(os.path.islink(staged))
+
+    def test_scratch_dirs_missing_output(self):
+        self.extcode.options['command'] = ['python', 'external_code_for_testing.py',
+                                           'external_code_output.txt']
+        self.extcode.options['external_input_files'] = ['external_code_for_testing.py',]
+        self.extcode.options['external_output_files'] = ['does_not_exist.txt',]
+        self.extcode.options['scratch_dirs'] = True
+
+        self.top.setup(check=False)
+        try:
+            self.top.run()
+        except RuntimeError as exc:
+            self.assertTrue('output file' in str(exc))
+            self.assertTrue(self.extcode.scratch_dir in str(exc))
+        else:
+            self.fail('Expected RuntimeError')
+
+    def test_cache(self):
+        self.extcode.add_param('x', 1.0)
+        self.extcode.options['command'] = ['python', 'external_code_for_testing.py',
+                                           'external_code_output.txt']
+        self.extcode.options['external_input_files'] = ['external_code_for_testing.py',]
+        self.extcode.options['external_output_files'] = ['external_code_output.txt',]
+        self.extcode.options['cache_dir'] = 'cache'
+
+        self.top.setup(check=False)
+        self.top.run()
+        self.assertFalse(self.extcode.from_cache)
+
+        # identical inputs restore the output file without running the command
+        os.remove('external_code_output.txt')
+        self.top.run()
+        self.assertTrue(self.extcode.from_cache)
+        self.assertEqual(self.extcode.return_code, 0)
+        with open('external_code_output.txt') as f:
+            self.assertEqual(f.read(), 'test data\n')
+
+        # a different param value or input file contents is a miss
+        self.top['extcode.x'] = 2.0
+        self.top.run()
+        self.assertFalse(self.extcode.from_cache)
+
+        with open('external_code_for_testing.py', 'a') as f:
+            f.write('\n')
+        self.top.run()
+        self.assertFalse(self.extcode.from_cache)
+
+        self.top.run()
+        self.assertTrue(self.extcode.from_cache)
+
+    def test_cache_key(self):
+        self.extcode.add_param('settings', Settings(1), pass_by_obj=True)
+        self.extcode.options['command'] = ['python', 'external_code_for_testing.py',
+                                           'external_code_output.txt']
+        self.extcode.options['external_output_files'] = ['external_code_output.txt',]
+        self.extcode.options['cache_dir'] = 'cache'
+        self.extcode.stdin = 'input.txt'
+        with open('input.txt', 'w') as f:
+            f.write('1\n')
+
+        self.top.setup(check=False)
+        self.top.run()
+        self.assertFalse(self.extcode.from_cache)
+
+        # an equal object is a hit, although its repr differs
+        self.top['extcode.settings'] = Settings(1)
+        self.top.run()
+        self.assertTrue(self.extcode.from_cache)
+
+        self.top['extcode.settings'] = Settings(2)
+        self.top.run()
+        self.assertFalse(self.extcode.from_cache)
+
+        # so are different stdin contents
+        with open('input.txt', 'w') as f:
+            f.write('2\n')
+        self.top.run()
+        self.assertFalse(self.extcode.from_cache)
+        self.top.run()
+        self.assertTrue(self.extcode.from_cache)
+
+        # and a different component class
+        key = self.extcode._cache_key(self.extcode.params)
+        self.extcode.__class__ = OtherExternalCode
+        self.assertNotEqual(self.extcode._cache_key(self.extcode.params), key)
+
+        self.top['extcode.settings'] = lambda: None
+        with self.assertRaises(TypeError) as cm:
+            self.top.run()
+        self.assertTrue(str(cm.exception).startswith(
+            "extcode: can't cache the result of a run because param "
+            "'settings' can't be pickled"), str(cm.exception))
+
+    def _add_parallel_codes(self, concurrent):
+        par = self.top.root.add('par', ParallelGroup())
+        for i in range(2):
+            ext = par.add('extcode%d' % i, ExternalCodeForTesting())
+            ext.options['command'] = ['python', 'external_code_for_testing.py',
+                                      'external_code_output%d.txt' % i,
+                                      '--write_times', '--delay', '1']
+            ext.options['external_output_files'] = ['external_code_output%d.txt' % i]
+            ext.options['concurrent'] = concurrent
+        self.extcode.options['command'] = ['python', 'external_code_for_testing.py',
+                                           'external_code_output.txt']
+
+    def _run_times(self):
+        # the (start, end) time of the run of each of the parallel codes
+        times = []
+        for i in range(2):
+            with open('external_code_output%d.txt' % i) as f:
+                times.append(tuple(float(t) for t in f.readlines()[-1].split()))
+        return times
+
+    def test_concurrent(self):
+        self._add_parallel_codes(concurrent=True)
+
+        self.top.setup(check=False)
+        self.top.run()
+
+        # the runs overlap
+        times = self._run_times()
+        self.assertTrue(max(start for start, end in times) <
+                        min(end for start, end in times), 'run times %s' % times)
+        for i in range(2):
+            self.assertTrue(os.path.exists('external_code_output%d.txt' % i))
+            self.assertEqual(self.top.root.par._subsystems['extcode%d' % i].return_code, 0)
+
+    def test_concurrent_max_procs(self):
+        self._add_parallel_codes(concurrent=True)
+
+        self.top.setup(check=False)
+        set_max_procs(1)
+        try:
+            self.top.run()
+        finally:
+            set_max_procs(0)
+
+        # one run starts after the other ends
+        times = self._run_times()
+        self.assertTrue(max(start for start, end in times) >=
+                        min(end for start, end in times), 'run times %s' % times)
+
+    def test_concurrent_timeout(self):
+        self._add_parallel_codes(concurrent=True)
+        ext = self.top.root.par.extcode1
+        ext.options['command'][-1] = '5'
+        ext.options['timeout'] = 0.5
+
+        self.top.setup(check=False)
+        try:
+            self.top.run()
+        except RuntimeError as exc:
+            self.assertEqual(str(exc), 'Timed out')
+            self.assertEqual(ext.timed_out, True)
+            self.assertEqual(self.top.root.par.extcode0.return_code, 0)
+        else:
+            self.fail('Expected RuntimeError')
+
 
 if __name__ == "__main__":
     unittest.main()
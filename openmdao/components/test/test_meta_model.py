@@ -1,3 +1,6 @@
+import os
+import shutil
+import tempfile
 import numpy as np
 import unittest
 
@@ -197,6 +200,172 @@ class TestMetaModel(unittest.TestCase):
         assert_rel_error(self, prob['meta.y1'], 2.0, .00001)
         assert_rel_error(self, prob['meta.y2'], 4.0, .00001)
 
+    def test_warm_start_update(self):
+        # surrogates with an update method aren't trained again from scratch
+        meta = MetaModel()
+        meta.add_param('x', 0.)
+        meta.add_output('y', 0., surrogate=FloatKrigingSurrogate())
+        meta.warm_restart = True
+
+        prob = Problem(Group())
+        prob.root.add('meta', meta)
+        prob.setup(check=False)
+
+        prob['meta.train:x'] = [0.0, 1.0, 3.0, 4.5, 6.0]
+        prob['meta.train:y'] = list(np.sin(prob['meta.train:x']))
+        prob['meta.x'] = 2.0
+        prob.run()
+
+        surrogate = meta._unknowns_dict['y']['surrogate']
+        thetas = surrogate.thetas.copy()
+
+        prob['meta.train:x'] = [2.0]
+        prob['meta.train:y'] = [np.sin(2.0)]
+        meta.train = True
+        prob.run()
+
+        self.assertEqual(surrogate.n, 6)
+        assert_rel_error(self, surrogate.thetas, thetas, 1e-15)
+        assert_rel_error(self, prob['meta.y'], np.sin(2.0), 1e-8)
+
+    def test_cache_dir(self):
+        tempdir = tempfile.mkdtemp(prefix='test_meta_model-')
+
+        def build(cache_dir):
+            meta = MetaModel()
+            meta.add_param('x', 0.)
+            meta.add_output('y1', 0.)
+            meta.add_output('y2', 0.)
+            meta.default_surrogate = FloatKrigingSurrogate()
+            meta.cache_dir = cache_dir
+
+            prob = Problem(Group())
+            prob.root.add('meta', meta)
+            prob.setup(check=False)
+
+            prob['meta.train:x'] = [0.0, 1.0, 3.0, 4.5, 6.0]
+            prob['meta.train:y1'] = list(np.sin(prob['meta.train:x']))
+            prob['meta.train:y2'] = list(np.cos(prob['meta.train:x']))
+            prob['meta.x'] = 2.0
+            return prob, meta
+
+        try:
+            cache_dir = os.path.join(tempdir, 'surrogates')
+            prob, meta = build(cache_dir)
+            prob.run()
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+
+            # a new model with the same training data loads the surrogates
+            prob2, meta2 = build(cache_dir)
+            for name in ('y1', 'y2'):
+                surrogate = meta2._unknowns_dict[name]['surrogate']
+                surrogate.train = lambda x, y: self.fail('surrogate was trained')
+            prob2.run()
+
+            for name in ('y1', 'y2'):
+                assert_rel_error(self, prob2['meta.' + name], prob['meta.' + name], 1e-15)
+                assert_rel_error(self, meta2._unknowns_dict[name]['surrogate'].thetas,
+                                 meta._unknowns_dict[name]['surrogate'].thetas, 1e-15)
+
+            # different training data is trained and added to the cache
+            prob2['meta.train:y1'] = list(np.sin(prob2['meta.train:x']) + 1.)
+            meta2._unknowns_dict['y1']['surrogate'] = FloatKrigingSurrogate()
+            meta2.train = True
+            prob2.run()
+            self.assertEqual(len(os.listdir(cache_dir)), 3)
+            assert_rel_error(self, prob2['meta.y1'], prob['meta.y1'] + 1., 1e-6)
+
+            # so is a surrogate with different settings
+            surrogate = FloatKrigingSurrogate()
+            surrogate.nugget = 1e-6
+            meta2._unknowns_dict['y2']['surrogate'] = surrogate
+            meta2.train = True
+            prob2.run()
+            self.assertEqual(len(os.listdir(cache_dir)), 4)
+            self.assertEqual(surrogate.nugget, 1e-6)
+        finally:
+            shutil.rmtree(tempdir)
+
+    def test_array_training_data(self):
+        # training data given as arrays, or as a .npy file, instead of lists
+        meta = MetaModel()
+        meta.add_param('x', np.zeros(2))
+        meta.add_param('z', 0.)
+        meta.add_output('y', np.zeros(2))
+        meta.default_surrogate = ResponseSurface()
+
+        prob = Problem(Group())
+        prob.root.add('meta', meta)
+        prob.setup(check=False)
+
+        x = np.array([[a, b] for a in np.linspace(0, 1, 4)
+                      for b in np.linspace(0, 1, 3)])
+        z = np.random.RandomState(0).uniform(0., 1., 12)
+        y = np.column_stack([x[:, 0] + 2. * x[:, 1] - z, 3. * z])
+
+        tempdir = tempfile.mkdtemp(prefix='test_meta_model-')
+        try:
+            fname = os.path.join(tempdir, 'x.npy')
+            np.save(fname, x)
+
+            prob['meta.train:x'] = fname
+            prob['meta.train:z'] = z
+            prob['meta.train:y'] = y
+            prob['meta.x'] = np.array([0.5, 0.25])
+            prob['meta.z'] = 0.4
+            prob.run()
+        finally:
+            shutil.rmtree(tempdir)
+
+        assert_rel_error(self, meta._training_input, np.column_stack([x, z]), 1e-15)
+        assert_rel_error(self, prob['meta.y'], np.array([0.6, 1.2]), 1e-10)
+
+    def test_parallel_training(self):
+        def train(num_workers, threads, num_starts=1):
+            meta = MetaModel()
+            meta.add_param('x', np.zeros(2))
+            for i in range(3):
+                meta.add_output('y%d' % i, 0.)
+            meta.default_surrogate = FloatKrigingSurrogate(num_starts=num_starts)
+            meta.num_train_workers = num_workers
+            meta.train_in_threads = threads
+
+            prob = Problem(Group())
+            prob.root.add('meta', meta)
+            prob.setup(check=False)
+
+            x = np.random.RandomState(0).uniform(0., 1., (20, 2))
+            prob['meta.train:x'] = x
+            for i in range(3):
+                prob['meta.train:y%d' % i] = np.sin((i + 1.) * x).sum(axis=1)
+
+            np.random.seed(11)
+            prob.run()
+            return [meta._unknowns_dict['y%d' % i]['surrogate'].thetas
+                    for i in range(3)]
+
+        serial = train(1, False)
+        for actual, expected in zip(train(2, False), serial):
+            assert_rel_error(self, actual, expected, 1e-15)
+        for actual, expected in zip(train(3, True), serial):
+            assert_rel_error(self, actual, expected, 1e-15)
+
+        # with random starting points, each surrogate is seeded so that the
+        # results don't depend on the number of workers
+        serial = train(1, False, num_starts=3)
+        for workers, threads in ((2, False), (3, False), (2, True), (3, True)):
+            for actual, expected in zip(train(workers, threads, num_starts=3),
+                                        serial):
+                assert_rel_error(self, actual, expected, 1e-15)
+
+        # training leaves the random number generator in the same state
+        np.random.seed(11)
+        np.random.randint(0, 2**31 - 1, 3)
+        expected = np.random.random()
+        for workers, threads in ((1, False), (2, False), (2, True)):
+            train(workers, threads, num_starts=3)
+            self.assertEqual(np.random.random(), expected)
+
     def test_vector_inputs(self):
 
         meta = MetaModel()
@@ -367,5 +536,62 @@ class TestMetaModel(unittest.TestCase):
             abs_error = float(match)
             self.assertTrue(abs_error < 1e-6)
 
+    def test_predict_batch(self):
+        meta = MetaModel()
+        meta.add_param('x', np.zeros((2, 2)))
+        meta.add_output('y', np.zeros(2,))
+        meta.add_output('z', 0.)
+        meta.default_surrogate = FloatKrigingSurrogate()
+
+        prob = Problem(Group())
+        prob.root.add('meta', meta)
+        prob.setup(check=False)
+
+        prob['meta.train:x'] = [
+            [[1.0, 1.0], [1.0, 1.0]],
+            [[2.0, 1.0], [1.0, 1.0]],
+            [[1.0, 2.0], [1.0, 1.0]],
+            [[1.0, 1.0], [2.0, 1.0]],
+            [[1.0, 1.0], [1.0, 2.0]]
+        ]
+        prob['meta.train:y'] = [[3.0, 1.0],
+                                [2.0, 4.0],
+                                [1.0, 7.0],
+                                [6.0, -3.0],
+                                [-2.0, 3.0]]
+        prob['meta.train:z'] = [1.0, 2.0, 3.0, 4.0, 5.0]
+
+        outputs = meta.predict_batch({'x': [[[1.0, 2.0], [1.0, 1.0]],
+                                            [[1.0, 1.0], [1.0, 2.0]],
+                                            [[1.5, 1.0], [1.0, 1.5]]]})
+
+        self.assertEqual(outputs['y'].shape, (3, 2))
+        self.assertEqual(outputs['z'].shape, (3,))
+        assert_rel_error(self, outputs['y'][0], np.array([1.0, 7.0]), .00001)
+        assert_rel_error(self, outputs['y'][1], np.array([-2.0, 3.0]), .00001)
+        assert_rel_error(self, outputs['z'][:2], np.array([3.0, 5.0]), .00001)
+
+        prob['meta.x'] = [[1.5, 1.0], [1.0, 1.5]]
+        prob.run()
+        assert_rel_error(self, outputs['y'][2], prob['meta.y'], 1e-10)
+        assert_rel_error(self, outputs['z'][2], prob['meta.z'], 1e-10)
+
+    def test_predict_batch_no_params(self):
+        meta = MetaModel()
+        meta.add_output('y', 0.)
+        meta.default_surrogate = FloatKrigingSurrogate()
+
+        prob = Problem(Group())
+        prob.root.add('meta', meta)
+        prob.setup(check=False)
+
+        with self.assertRaises(RuntimeError) as cm:
+            meta.predict_batch({})
+
+        self.assertEqual(str(cm.exception),
+                         "Metamodel 'meta': predict_batch needs at least one "
+                         "param to tell how many points to predict.")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -64,6 +64,10 @@ class Group(System):
         # Flag is true after order is set
         self._order_set = False
 
+        # Number of times jacobian has been called, so that anything built
+        # from the cached Jacobians knows when to rebuild.
+        self._linearize_count = 0
+
     def _subsystem(self, name):
         """
         Returns a reference to a named subsystem that is a direct or an indirect
@@ -421,7 +425,6 @@ class Group(System):
         # create implementation specific VecWrappers
         if var_of_interest is None:
             self.unknowns = impl.create_src_vecwrapper(sys_pathname, comm)
-            self.states = set((n for n,m in iteritems(self.unknowns) if m.get('state')))
             self.resids = impl.create_src_vecwrapper(sys_pathname, comm)
             self.params = impl.create_tgt_vecwrapper(sys_pathname, comm)
 
@@ -429,6 +432,7 @@ class Group(System):
             self.unknowns.setup(unknowns_dict,
                                 relevance=self._relevance,
                                 var_of_interest=None, store_byobjs=True)
+            self.states = set((n for n,m in iteritems(self.unknowns) if m.get('state')))
             self.resids.setup(unknowns_dict,
                               relevance=self._relevance,
                               var_of_interest=None)
@@ -661,6 +665,8 @@ class Group(System):
                     if len(shape) < 2:
                         jacobian_cache[key] = jacobian_cache[key].reshape((shape[0], 1))
 
+        self._linearize_count += 1
+
     def apply_linear(self, mode, ls_inputs=None, vois=(None,), gs_outputs=None):
         """Calls apply_linear on our children. If our child is a `Component`,
         then we need to also take care of the additional 1.0 on the diagonal
@@ -733,7 +739,6 @@ class Group(System):
         gs_outputs : dict, optional
             Linear Gauss-Siedel can limit the outputs when calling apply.
         """
-        states = system.states
         force_fd = system.fd_options['force_fd']
 
         for voi in vois:
@@ -767,21 +772,16 @@ class Group(System):
                                             dunknowns, dresids, mode)
                 dresids.vec *= -1.0
 
-                for var, val in iteritems(dunknowns.flat):
-                    # Skip all states
-                    if (gsouts is None or var in gsouts) and \
-                           var not in states:
-                        dresids.flat[var] += val
+                # Skip all states
+                idxs = system._gs_diag_idxs(voi, gsouts)
+                dresids.vec[idxs] += dunknowns.vec[idxs]
 
             # Adjoint Mode
             elif mode == 'rev':
 
-                # Clear out our inputs. TODO: Once we have memory packing, we
-                # might be able to just do dparams[:]=0.
-                for val in itervalues(dparams.flat):
-                    val[:] = 0.0
-                for val in itervalues(dunknowns.flat):
-                    val[:] = 0.0
+                # Clear out our inputs.
+                dparams._zero()
+                dunknowns.vec[:] = 0.0
 
                 # Sign on the local Jacobian needs to be -1 before
                 # we add in the fake residual. Since we can't modify
@@ -807,11 +807,9 @@ class Group(System):
 
                 dresids.vec *= -1.0
 
-                for var, val in iteritems(dresids.flat):
-                    # Skip all states
-                    if (gsouts is None or var in gsouts) and \
-                            var not in states:
-                        dunknowns.flat[var] += val
+                # Skip all states
+                idxs = system._gs_diag_idxs(voi, gsouts)
+                dunknowns.vec[idxs] += dresids.vec[idxs]
 
     def solve_linear(self, dumat, drmat, vois, mode=None, precon=False):
         """
@@ -1189,7 +1187,8 @@ class Group(System):
         return (min_procs, max_procs)
 
     def _get_global_idxs(self, uname, pname, top_uname, top_pname, u_var_idxs,
-                         u_sizes, p_var_idxs, p_sizes, var_of_interest, mode):
+                         u_offsets, u_dist_ends, p_var_idxs, p_offsets,
+                         var_of_interest, mode):
         """
         Return the global indices into the distributed unknowns and params vectors
         for the given unknown and param.  The given unknown and param have already
@@ -1207,15 +1206,21 @@ class Group(System):
             Names of relevant vars in the unknowns vector and their index
             into the sizes table.
 
-        u_sizes : ndarray
-            (rank x var) array of unknown sizes.
+        u_offsets : ndarray
+            (rank x var) array of the offsets of the unknowns into the global
+            unknowns vector.
+
+        u_dist_ends : ndarray
+            (rank x var) array of the end of the part of each unknown on each
+            rank, relative to the start of the full distributed variable.
 
         p_var_idxs : OrderedDict of (name : idx)
             Names of relevant vars in the params vector and their index
             into the sizes table.
 
-        p_sizes : ndarray
-            (rank x var) array of parameter sizes.
+        p_offsets : ndarray
+            (rank x var) array of the offsets of the params into the global
+            params vector.
 
         var_of_interest : str or None
             Name of variable of interest used to determine relevance.
@@ -1257,38 +1262,28 @@ class Group(System):
         if udist or pdist:
             new_indices = np.zeros(arg_idxs.shape, dtype=arg_idxs.dtype)
 
-            for irank in range(self.comm.size):
-                start = np.sum(u_sizes[:irank, ivar])
-                end = start + u_sizes[irank, ivar]
-                on_irank = np.logical_and(start <= arg_idxs,
-                                             arg_idxs < end)
+            # arg_idxs are provided wrt the full distributed variable, so find
+            # the rank that holds each one and convert it to an offset into
+            # the global vector from the start of the var on that rank.
+            ends = u_dist_ends[:, ivar]
+            starts = np.concatenate(([0], ends[:-1]))
+            irank = np.searchsorted(ends, arg_idxs, side='right')
+            on_rank = irank < ends.size
+            irank = irank[on_rank]
 
-                # Compute conversion to new ordering
-
-                # arg_idxs are provided wrt the full distributed variable,
-                # so we subtract off the start of the var in the current rank
-                # in order to make the overall offset relative to the
-                # beginning of the full distributed variable.
-                offset = -start
-
-                offset += np.sum(u_sizes[:irank, :])
-                offset += np.sum(u_sizes[irank, :ivar])
-
-                # Apply conversion only to relevant parts of input
-                new_indices[on_irank] = arg_idxs[on_irank] + offset
+            new_indices[on_rank] = (arg_idxs[on_rank] - starts[irank] +
+                                    u_offsets[irank, ivar])
 
             src_idxs = new_indices
             var_rank = iproc
 
         else:
             var_rank = self._owning_ranks[uname] if not rev else iproc
-            offset = np.sum(u_sizes[:var_rank]) + np.sum(u_sizes[var_rank, :ivar])
-            src_idxs = arg_idxs + offset
+            src_idxs = arg_idxs + u_offsets[var_rank, ivar]
 
             var_rank = self._owning_ranks[pname] if rev else iproc
 
-        tgt_start = (np.sum(p_sizes[:var_rank]) +
-                     np.sum(p_sizes[var_rank, :p_var_idxs[pname]]))
+        tgt_start = p_offsets[var_rank, p_var_idxs[pname]]
         tgt_idxs = tgt_start + self.params.make_idx_array(0, len(arg_idxs))
 
         return src_idxs, tgt_idxs
@@ -1339,6 +1334,21 @@ class Group(System):
                                dtype=self._impl.idx_arr_type)
         self._local_param_sizes[var_of_interest] = param_sizes
 
+        # The global vectors are ordered by rank and then by var, so the
+        # offset of each (rank, var) is the sum of all of the sizes before it.
+        # Compute these once here rather than summing the sizes table for
+        # every connection.
+        idx_type = self._impl.idx_arr_type
+        u_flat = unknown_sizes.ravel()
+        u_offsets = (np.cumsum(u_flat, dtype=idx_type) -
+                     u_flat).reshape(unknown_sizes.shape)
+        p_flat = param_sizes.ravel()
+        p_offsets = (np.cumsum(p_flat, dtype=idx_type) -
+                     p_flat).reshape(param_sizes.shape)
+
+        # end of the part of each distributed unknown that is on each rank
+        u_dist_ends = np.cumsum(unknown_sizes, axis=0, dtype=idx_type)
+
         xfer_dict = {}
         for param, unknown in iteritems(self.connections):
             if param in my_params:
@@ -1371,8 +1381,9 @@ class Group(System):
                     else: # pass by vector
                         sidxs, didxs = self._get_global_idxs(urelname, prelname,
                                                              top_urelname, top_prelname,
-                                                             vec_unames, unknown_sizes,
-                                                             vec_pnames, param_sizes,
+                                                             vec_unames, u_offsets,
+                                                             u_dist_ends,
+                                                             vec_pnames, p_offsets,
                                                              var_of_interest, mode)
                         vec_conns.append((prelname, urelname))
                         src_idx_list.append(sidxs)
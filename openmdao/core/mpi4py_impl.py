@@ -0,0 +1,345 @@
+"""MPI vector and data transfer implementation factory that uses mpi4py
+directly and does not require PETSc."""
+
+from __future__ import print_function
+
+import os
+
+import numpy as np
+from mpi4py import MPI
+
+from openmdao.core.vec_wrapper import SrcVecWrapper, TgtVecWrapper
+
+trace = os.environ.get('TRACE_PETSC')
+if trace:
+    from openmdao.devtools.debug import debug
+
+# communicator attribute holding the last message tag used by a transfer
+_tag_keyval = MPI.Comm.Create_keyval()
+
+
+class Mpi4pyImpl(object):
+    """MPI vector and data transfer implementation factory that uses mpi4py
+    directly and does not require PETSc."""
+
+    idx_arr_type = int
+
+    @staticmethod
+    def world_comm():
+        return MPI.COMM_WORLD
+
+    @staticmethod
+    def create_src_vecwrapper(pathname, comm):
+        """
+        Create a `Mpi4pySrcVecWrapper`.
+
+        Returns
+        -------
+        `Mpi4pySrcVecWrapper`
+        """
+        return Mpi4pySrcVecWrapper(pathname, comm)
+
+    @staticmethod
+    def create_tgt_vecwrapper(pathname, comm):
+        """
+        Create a `Mpi4pyTgtVecWrapper`.
+
+        Returns
+        -------
+        `Mpi4pyTgtVecWrapper`
+        """
+        return Mpi4pyTgtVecWrapper(pathname, comm)
+
+    @staticmethod
+    def create_data_xfer(src_vec, tgt_vec,
+                         src_idxs, tgt_idxs, vec_conns, byobj_conns, mode):
+        """
+        Create an object for performing data transfer between source
+        and target vectors.
+
+        Args
+        ----
+        src_vec : `VecWrapper`
+            Variables that are the source of the transfer in fwd mode and
+            the destination of the transfer in rev mode.
+
+        tgt_vec : `VecWrapper`
+            Variables that are the destination of the transfer in fwd mode and
+            the source of the transfer in rev mode.
+
+        src_idxs : array
+            Indices of the source variables in the source vector.
+
+        tgt_idxs : array
+            Indices of the target variables in the target vector.
+
+        vec_conns : dict
+            Mapping of 'pass by vector' variables to the source variables that
+            they are connected to.
+
+        byobj_conns : dict
+            Mapping of 'pass by object' variables to the source variables that
+            they are connected to.
+
+        mode : str
+            Either 'fwd' or 'rev', indicating a forward or reverse scatter.
+
+        Returns
+        -------
+        `Mpi4pyDataTransfer`
+            A `Mpi4pyDataTransfer` object.
+        """
+        return Mpi4pyDataTransfer(src_vec, tgt_vec, src_idxs, tgt_idxs,
+                                  vec_conns, byobj_conns, mode)
+
+
+class Mpi4pySrcVecWrapper(SrcVecWrapper):
+
+    idx_arr_type = Mpi4pyImpl.idx_arr_type
+
+    def _get_flattened_sizes(self):
+        """
+        Collect all flattened sizes of vars stored in our internal array.
+
+        Returns
+        -------
+        list of lists of (name, size) tuples
+            Contains an entry for each process in this object's communicator.
+        """
+        sizes = []
+        for name, meta in self._get_vecvars():
+            if meta.get('remote'):
+                sizes.append((name, 0))
+            else:
+                sizes.append((name, meta['size']))
+
+        return self.comm.allgather(sizes)
+
+    def norm(self):
+        """
+        Returns
+        -------
+        float
+            The norm of the distributed vector.
+        """
+        return np.sqrt(self.comm.allreduce(self.vec.dot(self.vec), op=MPI.SUM))
+
+
+class Mpi4pyTgtVecWrapper(TgtVecWrapper):
+
+    idx_arr_type = Mpi4pyImpl.idx_arr_type
+
+    def _get_flattened_sizes(self):
+        """
+        Returns
+        -------
+        list of lists of (name, size) tuples
+            Contains an entry for each process in this object's communicator.
+            Each entry is an `OrderedDict` mapping var name to local size for
+            'pass by vector' params.
+        """
+        psizes = []
+        for name, m in self._get_vecvars():
+            if m.get('owned'):
+                if m.get('remote'):
+                    psizes.append((name, 0))
+                else:
+                    psizes.append((name, m['size']))
+
+        return self.comm.allgather(psizes)
+
+
+class Mpi4pyDataTransfer(object):
+    """
+    Performs data transfer between distributed vectors using mpi4py.
+    The global src and tgt indices are converted once, when the transfer is
+    created, into the local indices each process sends to or receives from
+    every other process. Each transfer then just packs the values into a
+    preallocated buffer and starts persistent requests to the processes that
+    actually exchange data.
+
+    Args
+    ----
+    src_vec : `VecWrapper`
+        Variables that are the source of the transfer in fwd mode and
+        the destination of the transfer in rev mode.
+
+    tgt_vec : `VecWrapper`
+        Variables that are the destination of the transfer in fwd mode and
+        the source of the transfer in rev mode.
+
+    src_idxs : array
+        indices of the source variables in the source vector.
+
+    tgt_idxs : array
+        indices of the target variables in the target vector.
+
+    vec_conns : dict
+        mapping of 'pass by vector' variables to the source variables that
+        they are connected to.
+
+    byobj_conns : dict
+        mapping of 'pass by object' variables to the source variables that
+        they are connected to.
+
+    mode : str
+        Either 'fwd' or 'rev', indicating a forward or reverse scatter.
+    """
+    def __init__(self, src_vec, tgt_vec,
+                 src_idxs, tgt_idxs, vec_conns, byobj_conns, mode):
+
+        self.byobj_conns = byobj_conns
+        self.vec_conns = vec_conns
+        self.comm = comm = src_vec.comm
+        nprocs = comm.size
+        rank = comm.rank
+
+        src_idxs = np.asarray(src_idxs, dtype=int)
+        tgt_idxs = np.asarray(tgt_idxs, dtype=int)
+
+        if trace:
+            debug("'%s': creating %s Mpi4pyDataTransfer: %s %s" %
+                  (src_vec.pathname, mode, src_idxs, tgt_idxs))
+
+        # global offsets of each process's part of the src and tgt vectors
+        src_offsets = np.zeros(nprocs+1, dtype=int)
+        src_offsets[1:] = np.cumsum(comm.allgather(src_vec.vec.size))
+        tgt_offsets = np.zeros(nprocs+1, dtype=int)
+        tgt_offsets[1:] = np.cumsum(comm.allgather(tgt_vec.vec.size))
+
+        src_owner = np.searchsorted(src_offsets, src_idxs, side='right') - 1
+        tgt_owner = np.searchsorted(tgt_offsets, tgt_idxs, side='right') - 1
+        src_local = src_idxs - src_offsets[src_owner]
+        tgt_local = tgt_idxs - tgt_offsets[tgt_owner]
+
+        # Any process may specify a connection, so send each one to the
+        # owner of its source, which is the process that sends the data.
+        to_src_owner = []
+        for proc in range(nprocs):
+            mask = src_owner == proc
+            to_src_owner.append((src_local[mask], tgt_owner[mask], tgt_local[mask]))
+        owned = comm.alltoall(to_src_owner)
+        send_idxs = np.concatenate([s for s, _, _ in owned]).astype(int)
+        dest = np.concatenate([d for _, d, _ in owned]).astype(int)
+        dest_idxs = np.concatenate([t for _, _, t in owned]).astype(int)
+
+        # transfers within this process don't involve MPI
+        local = dest == rank
+        self._local_src = send_idxs[local]
+        self._local_tgt = dest_idxs[local]
+        send_idxs, dest, dest_idxs = send_idxs[~local], dest[~local], dest_idxs[~local]
+
+        # group the remaining data by destination process and tell each
+        # destination where to put the values it will receive, in order.
+        order = np.argsort(dest, kind='mergesort')
+        send_idxs, dest, dest_idxs = send_idxs[order], dest[order], dest_idxs[order]
+        send_counts = np.bincount(dest, minlength=nprocs)
+        starts = np.zeros(nprocs+1, dtype=int)
+        starts[1:] = np.cumsum(send_counts)
+        recv_parts = comm.alltoall([dest_idxs[starts[p]:starts[p+1]]
+                                    for p in range(nprocs)])
+        recv_counts = np.array([len(part) for part in recv_parts], dtype=int)
+
+        self._send_idxs = send_idxs
+        self._recv_idxs = np.concatenate(recv_parts).astype(int)
+
+        # in reverse mode values from several targets may be added to the
+        # same source entry, which requires np.add.at
+        self._local_src_unique = np.unique(self._local_src).size == self._local_src.size
+        self._send_unique = np.unique(self._send_idxs).size == self._send_idxs.size
+
+        # buffers are reused by every transfer in both directions
+        self._sendbuf = np.empty(send_idxs.size, dtype=src_vec.vec.dtype)
+        self._recvbuf = np.empty(self._recv_idxs.size, dtype=src_vec.vec.dtype)
+
+        # Persistent requests, so a transfer only involves the processes
+        # that actually exchange data, the same as a PETSc scatter. In
+        # reverse mode the data goes back the other way using the same buffers.
+        tag = _new_tag(comm)
+        self._fwd_reqs = []
+        self._rev_reqs = []
+        for proc, buf in _buffer_parts(self._sendbuf, send_counts):
+            self._fwd_reqs.append(comm.Send_init(buf, proc, tag=tag))
+            self._rev_reqs.append(comm.Recv_init(buf, proc, tag=tag))
+        for proc, buf in _buffer_parts(self._recvbuf, recv_counts):
+            self._fwd_reqs.append(comm.Recv_init(buf, proc, tag=tag))
+            self._rev_reqs.append(comm.Send_init(buf, proc, tag=tag))
+
+    def transfer(self, srcvec, tgtvec, mode='fwd', deriv=False):
+        """Performs data transfer between a distributed source vector and
+        a distributed target vector.
+
+        Args
+        ----
+        srcvec : `VecWrapper`
+            Variables that are the source of the transfer in fwd mode and
+            the destination of the transfer in rev mode.
+
+        tgtvec : `VecWrapper`
+            Variables that are the destination of the transfer in fwd mode and
+            the source of the transfer in rev mode.
+
+        mode : 'fwd' or 'rev', optional
+            Direction of the data transfer, source to target ('fwd', the default)
+            or target to source ('rev').
+
+        deriv : bool, optional
+            If True, this is a derivative data transfer, so no pass_by_obj
+            variables will be transferred.
+        """
+        if mode == 'rev':
+            # in reverse mode, srcvec and tgtvec are switched. Note, we only
+            # run in reverse for derivatives, and derivatives accumulate from
+            # all targets. This does not involve pass_by_object.
+            if self._rev_reqs:
+                self._recvbuf[:] = tgtvec.vec[self._recv_idxs]
+                MPI.Prequest.Startall(self._rev_reqs)
+                MPI.Prequest.Waitall(self._rev_reqs)
+                if self._send_unique:
+                    srcvec.vec[self._send_idxs] += self._sendbuf
+                else:
+                    np.add.at(srcvec.vec, self._send_idxs, self._sendbuf)
+
+            if self._local_src_unique:
+                srcvec.vec[self._local_src] += tgtvec.vec[self._local_tgt]
+            else:
+                np.add.at(srcvec.vec, self._local_src, tgtvec.vec[self._local_tgt])
+        else:
+            # forward mode, source to target including pass_by_object
+            tgtvec.vec[self._local_tgt] = srcvec.vec[self._local_src]
+
+            if self._fwd_reqs:
+                self._sendbuf[:] = srcvec.vec[self._send_idxs]
+                MPI.Prequest.Startall(self._fwd_reqs)
+                MPI.Prequest.Waitall(self._fwd_reqs)
+                tgtvec.vec[self._recv_idxs] = self._recvbuf
+
+            if trace:
+                debug("%s:    tgtvec = %s" % (tgtvec.pathname, tgtvec.vec))
+
+            if not deriv:
+                for tgt, src in self.byobj_conns:
+                    raise NotImplementedError("can't transfer '%s' to '%s'" %
+                                              (src, tgt))
+
+
+def _new_tag(comm):
+    """ Return a message tag for a new transfer on `comm`. Transfers are
+    created in the same order on every process in `comm`, so they all agree
+    on the tag, and messages from different transfers can't be mixed up."""
+    tag = comm.Get_attr(_tag_keyval)
+    tag = 1 if tag is None or tag >= MPI.COMM_WORLD.Get_attr(MPI.TAG_UB) else tag + 1
+    comm.Set_attr(_tag_keyval, tag)
+    return tag
+
+
+def _buffer_parts(buf, counts):
+    """ Split `buf` into the consecutive parts exchanged with each process,
+    skipping processes that don't exchange anything."""
+    parts = []
+    start = 0
+    for proc, count in enumerate(counts):
+        if count > 0:
+            parts.append((proc, buf[start:start+count]))
+        start += count
+    return parts
@@ -7,6 +7,7 @@ from six import itervalues
 from openmdao.core.component import Component
 from openmdao.core.group import Group
 from openmdao.core.mpi_wrap import MPI
+from openmdao.util.thread_util import WorkerThreads
 
 
 class ParallelGroup(Group):
@@ -56,18 +57,38 @@ class ParallelGroup(Group):
                                     metadata)
 
     def children_solve_nonlinear(self, metadata):
-        """Loops over our children systems and asks them to solve."""
+        """Loops over our children systems and asks them to solve. Children
+        whose `is_concurrent` method returns True, such as `ExternalCode`
+        components with options['concurrent'] set, are run at the same time,
+        each in its own thread, so that e.g. their external processes are
+        waited on concurrently.
+        """
 
         # full scatter
         self._transfer_data()
 
-        for sub in self._local_subsystems:
+        def solve(sub):
             if isinstance(sub, Component):
                 sub.solve_nonlinear(sub.params, sub.unknowns, sub.resids)
             else:
                 sub.solve_nonlinear(sub.params, sub.unknowns, sub.resids,
                                     metadata)
 
+        concurrent = [sub for sub in self._local_subsystems
+                      if sub.is_concurrent()]
+        threads = WorkerThreads(solve, [[sub] for sub in concurrent])
+        threads.start()
+
+        try:
+            for sub in self._local_subsystems:
+                if not sub.is_concurrent():
+                    solve(sub)
+        finally:
+            threads.join()
+
+        # report the first failure in execution order
+        threads.reraise(concurrent)
+
     def get_req_procs(self):
         """
         Returns
@@ -181,3 +202,4 @@ class ParallelGroup(Group):
                 sub._setup_communicators(sub_comm)
             else:
                 sub._setup_communicators(MPI.COMM_NULL)
+
@@ -52,9 +52,9 @@ class Problem(System):
         self.root = root
 
         if MPI: # pragma: no cover
-            from openmdao.core.petsc_impl import PetscImpl
-            if impl != PetscImpl:
-                raise ValueError("To run under MPI, the impl for a Problem must be PetscImpl." )
+            if impl is None or impl is BasicImpl:
+                raise ValueError("To run under MPI, the impl for a Problem must be "
+                                 "PetscImpl or Mpi4pyImpl.")
 
         if impl is None:
             self._impl = BasicImpl
@@ -49,8 +49,9 @@ class Relevance(object):
             self.outputs.append(out)
 
         self._vgraph, self._sgraph = self._setup_graphs(group, connections)
-        self.relevant = self._get_relevant_vars(self._vgraph)
-        self._relevant_systems = self._get_relevant_systems()
+        self._voi_bits, self._var_masks = self._get_relevant_vars(self._vgraph)
+        self._sys_masks = self._get_relevant_systems()
+        self._relevant = None
 
         if mode == 'fwd':
             self.groups = param_groups
@@ -61,10 +62,24 @@ class Relevance(object):
         # if name is None, everything is relevant
         if name is None:
             return set(self._vgraph.nodes_iter())
-        elif name in self.relevant:
+        elif name in self._voi_bits:
             return self.relevant[name]
         return ()
 
+    @property
+    def relevant(self):
+        """
+        Dictionary that maps each variable of interest to the set of
+        variables that are relevant to it. It's only built on demand, since
+        the relevance checks don't need it.
+        """
+        if self._relevant is None:
+            self._relevant = relevant = {}
+            for voi, bit in iteritems(self._voi_bits):
+                relevant[voi] = set(v for v, mask in iteritems(self._var_masks)
+                                    if mask >> bit & 1)
+        return self._relevant
+
     def is_relevant(self, var_of_interest, varname):
         """ Returns True if a variable is relevant to a particular variable
         of interest.
@@ -84,7 +99,8 @@ class Relevance(object):
         """
         if var_of_interest is None:
             return True
-        return varname in self.relevant[var_of_interest]
+        return bool(self._var_masks.get(varname, 0) >>
+                    self._voi_bits[var_of_interest] & 1)
 
     def vars_of_interest(self, mode=None):
         """ Determines our list of var_of_interest depending on mode.
@@ -127,7 +143,8 @@ class Relevance(object):
         """
         if var_of_interest is None:
             return True
-        return system.pathname in self._relevant_systems[var_of_interest]
+        return bool(self._sys_masks.get(system.pathname, 0) >>
+                    self._voi_bits[var_of_interest] & 1)
 
     def _setup_graphs(self, group, connections):
         """
@@ -201,6 +218,16 @@ class Relevance(object):
 
     def _get_relevant_vars(self, g):
         """
+        Finds the variables relevant to each variable of interest. A variable
+        is relevant to an input if it depends on that input and some output
+        depends on it, and to an output if that output depends on it and it
+        depends on some input.
+
+        Each variable of interest is assigned a bit, and reachability is
+        found with one pass over the strongly connected components of the
+        graph in topological order in each direction, combining the bits of
+        the inputs that reach, or outputs reachable from, each component.
+
         Args
         ----
         g : nx.DiGraph
@@ -208,50 +235,69 @@ class Relevance(object):
 
         Returns
         -------
-        dict
-            Dictionary that maps a variable name to all other variables in the
-            graph that are relevant to it.
+        tuple of (dict, dict)
+            Dictionary that maps each variable of interest to its bit, and
+            dictionary that maps each variable in the graph to the bits of
+            the variables of interest it's relevant to.
         """
-        succs = {}
-        for nodes in self.inputs:
-            for node in nodes:
-                if node in g:
-                    succs[node] = set([v for u, v in nx.dfs_edges(g, node)])
-                    succs[node].add(node)
-
-        relevant = {}
-        grev = g.reverse()
-        for nodes in self.outputs:
-            for node in nodes:
-                if node in g:
-                    relevant[node] = set()
-                    preds = set([v for u, v in nx.dfs_edges(grev, node)])
-                    preds.add(node)
-                    for inps in self.inputs:
-                        for inp in inps:
-                            if inp in g:
-                                common = preds.intersection(succs[inp])
-                                relevant[node].update(common)
-                                relevant.setdefault(inp, set()).update(common)
-
-        return relevant
+        inputs = [node for nodes in self.inputs for node in nodes if node in g]
+        outputs = [node for nodes in self.outputs for node in nodes if node in g]
+        if not outputs:
+            inputs = []
+
+        voi_bits = {}
+        if outputs:
+            for node in inputs:
+                voi_bits.setdefault(node, len(voi_bits))
+        for node in outputs:
+            voi_bits.setdefault(node, len(voi_bits))
+
+        if not voi_bits:
+            return voi_bits, {}
+
+        dag = nx.condensation(g)
+        scc = dag.graph['mapping']
+        order = nx.topological_sort(dag)
+
+        # bits of the inputs each component depends on
+        in_bits = [0] * len(dag)
+        for node in inputs:
+            in_bits[scc[node]] |= 1 << voi_bits[node]
+        for u in order:
+            if in_bits[u]:
+                for v in dag.successors_iter(u):
+                    in_bits[v] |= in_bits[u]
+
+        # bits of the outputs that depend on each component
+        out_bits = [0] * len(dag)
+        for node in outputs:
+            out_bits[scc[node]] |= 1 << voi_bits[node]
+        for u in reversed(order):
+            for v in dag.successors_iter(u):
+                out_bits[u] |= out_bits[v]
+
+        var_masks = {}
+        for node, c in iteritems(scc):
+            if in_bits[c] and out_bits[c]:
+                var_masks[node] = in_bits[c] | out_bits[c]
+
+        return voi_bits, var_masks
 
     def _get_relevant_systems(self):
         """
-        Given the dict that maps relevant vars to each VOI, find the mapping
-        of each VOI to the set of systems that need to run.
+        Given the bits of the variables of interest each variable is relevant
+        to, find the bits of the variables of interest each system is
+        relevant to. A system is relevant if any of its variables is.
         """
-        relevant_systems = {}
-        for voi, relvars in iteritems(self.relevant):
-            comps = set()
-            for relvar in relvars:
-                for absvar in self._prom_to_abs[relvar]:
-                    parts = absvar.split('.')
-                    for i in range(len(parts)-1):
-                        comps.add('.'.join(parts[:i+1]))
-            relevant_systems[voi] = tuple(comps)
-
-        return relevant_systems
+        sys_masks = {}
+        for relvar, mask in iteritems(self._var_masks):
+            for absvar in self._prom_to_abs[relvar]:
+                parts = absvar.split('.')
+                for i in range(len(parts)-1):
+                    path = '.'.join(parts[:i+1])
+                    sys_masks[path] = sys_masks.get(path, 0) | mask
+
+        return sys_masks
 
     def json_dependencies(self):
         """ Returns a json representation of a model's data dependency graph.
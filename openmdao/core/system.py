@@ -13,6 +13,23 @@ from collections import OrderedDict
 from openmdao.core.vec_wrapper import VecWrapper
 from openmdao.core.vec_wrapper import _PlaceholderVecWrapper
 
+class _GSOutputs(object):
+    """
+    The variables in a `Group`'s dumat[voi] that aren't in one of its
+    subsystems' dumat[voi]. Membership is checked against the `Group`'s
+    vector, so its variable names aren't copied for every subsystem.
+    """
+
+    __slots__ = ('_names', '_excluded')
+
+    def __init__(self, names, excluded=frozenset()):
+        self._names = names
+        self._excluded = excluded
+
+    def __contains__(self, name):
+        return name in self._names and name not in self._excluded
+
+
 class System(object):
     """ Base class for systems in OpenMDAO. When building models, user should
     inherit from `Group` or `Component`"""
@@ -246,6 +263,18 @@ class System(object):
         """
         return (1, 1)
 
+    def is_concurrent(self):
+        """
+        Returns
+        -------
+        bool
+            True if this `System` can be solved in its own thread at the same
+            time as its siblings in a `ParallelGroup`, e.g. because it spends
+            most of its time waiting on an external process. Override this to
+            return True only if solve_nonlinear is thread safe.
+        """
+        return False
+
     def _setup_communicators(self, comm):
         """
         Assign communicator to this `System` and all of its subsystems.
@@ -565,20 +594,59 @@ class System(object):
 
     def _setup_gs_outputs(self, vois):
         self.gs_outputs = { 'fwd': {}, 'rev': {}}
+        self._gs_idx_cache = {}
         dumat = self.dumat
-        gso = self.gs_outputs['fwd']
+        none = _GSOutputs(())
+        gso_fwd = self.gs_outputs['fwd']
+        gso_rev = self.gs_outputs['rev']
         for sub in self._local_subsystems:
-            gso[sub.name] = outs = {}
+            gso_fwd[sub.name] = fwd = {}
+            gso_rev[sub.name] = rev = {}
             for voi in vois:
-                outs[voi] = set([x for x in dumat[voi] if
-                                           sub.dumat and x not in sub.dumat[voi]])
-        gso = self.gs_outputs['rev']
-        for sub in reversed(self._local_subsystems):
-            gso[sub.name] = outs = {}
-            for voi in vois:
-                outs[voi] = set([x for x in dumat[voi] if
-                                           not sub.dumat or
-                                           (sub.dumat and x not in sub.dumat[voi])])
+                if sub.dumat:
+                    fwd[voi] = rev[voi] = _GSOutputs(dumat[voi],
+                                                     frozenset(sub.dumat[voi]))
+                else:
+                    fwd[voi] = none
+                    rev[voi] = _GSOutputs(dumat[voi])
+
+    def _gs_diag_idxs(self, voi, gs_outputs):
+        """
+        Args
+        ----
+        voi : str
+            Variable of interest.
+
+        gs_outputs : container or None
+            The outputs Linear Gauss-Seidel lets this system update, or None
+            for all of them.
+
+        Returns
+        -------
+        ndarray
+            Indices in the flat derivative vectors of this system of the
+            explicit outputs in `gs_outputs`, which get a 1 on the diagonal.
+            They're computed once for each voi and `gs_outputs`.
+        """
+        key = (voi, id(gs_outputs))
+        try:
+            return self._gs_idx_cache[key][1]
+        except KeyError:
+            pass
+
+        dunknowns = self.dumat[voi]
+        states = self.states
+        idxs = []
+        for var, val in iteritems(dunknowns.setup_flat()):
+            if val.size and (gs_outputs is None or var in gs_outputs) and \
+                    var not in states:
+                idxs.append(np.arange(*dunknowns._slices[var]))
+
+        idxs = np.concatenate(idxs) if idxs else np.zeros(0, dtype=int)
+
+        # keep gs_outputs alive so its id can't be reused
+        self._gs_idx_cache[key] = (gs_outputs, idxs)
+        return idxs
 
     def get_combined_jac(self, J):
         """
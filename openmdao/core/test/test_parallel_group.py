@@ -1,12 +1,37 @@
+import threading
 import unittest
 
 from openmdao.core.problem import Problem
 from openmdao.core import ParallelGroup
+from openmdao.core.component import Component
 from openmdao.components.indep_var_comp import IndepVarComp
 from openmdao.components.exec_comp import ExecComp
 from openmdao.solvers.nl_gauss_seidel import NLGaussSeidel
 
 
+class Handshake(Component):
+    """ Signals that it has started and waits for the other component to
+    start, which only works if they are solved at the same time."""
+
+    def __init__(self, started, other):
+        super(Handshake, self).__init__()
+        self.add_param('x', 0.)
+        self.add_output('y', 0.)
+        self.started = started
+        self.other = other
+        self.thread = None
+
+    def is_concurrent(self):
+        return True
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        self.thread = threading.current_thread()
+        self.started.set()
+        if not self.other.wait(10.):
+            raise RuntimeError('%s timed out' % self.pathname)
+        unknowns['y'] = params['x'] + 1.
+
+
 class TestGroup(unittest.TestCase):
 
     def test_run(self):
@@ -31,5 +56,22 @@ class TestGroup(unittest.TestCase):
         self.assertEqual(root.nl_solver.iter_count, 3)
         self.assertEqual(prob['C4.y'], 40.)
 
+    def test_concurrent(self):
+
+        root = ParallelGroup()
+        events = [threading.Event(), threading.Event()]
+        root.add('C1', Handshake(events[0], events[1]))
+        root.add('C2', Handshake(events[1], events[0]))
+        root.add('C3', ExecComp('y=x*2.0'))
+
+        prob = Problem(root)
+        prob.setup(check=False)
+        prob.run()
+
+        self.assertEqual(prob['C1.y'], 1.)
+        self.assertEqual(prob['C2.y'], 1.)
+        self.assertNotEqual(root.C1.thread, root.C2.thread)
+        self.assertNotEqual(root.C1.thread, threading.current_thread())
+
 if __name__ == "__main__":
     unittest.main()
@@ -83,3 +83,44 @@ class TestLinearGaussSeidel(unittest.TestCase):
                                 msg="%s should be irrelevant" % s.pathname)
                 self.assertFalse(root._relevance.is_relevant_system('C8.y', s),
                                  msg="%s should be irrelevant" % s.pathname)
+
+    def test_relevant_cycle(self):
+        p = self.p
+        root = p.root
+
+        # D1 and D2 depend on each other
+        root.add('D1', ExecComp('y = x1 + x2'))
+        root.add('D2', ExecComp('y = 0.5*x'))
+        root.connect('C3.y', 'D1.x1')
+        root.connect('D2.y', 'D1.x2')
+        root.connect('D1.y', 'D2.x')
+
+        p.driver.add_desvar('P1.x')
+        p.driver.add_desvar('P2.x')
+        p.driver.add_constraint('D2.y', upper=0.)
+        p.driver.add_constraint('C7.y', upper=0.)
+
+        p.setup(check=False)
+        rel = root._relevance
+
+        cycle = set(['P1.x', 'C3.x', 'C3.y', 'D1.x1', 'D1.x2', 'D1.y',
+                     'D2.x', 'D2.y'])
+        self.assertEqual(rel.relevant['P1.x'], cycle)
+        self.assertEqual(rel.relevant['D2.y'], cycle)
+        self.assertEqual(rel['C7.y'],
+                         set(['P2.x', 'C5.x', 'C5.y', 'C7.x', 'C7.y']))
+
+        for voi, var in (('P1.x', 'C7.y'), ('P2.x', 'D1.y'), ('D2.y', 'C6.y'),
+                         ('P1.x', 'C2.y')):
+            self.assertFalse(rel.is_relevant(voi, var),
+                             msg="%s should be irrelevant to %s" % (var, voi))
+
+        for voi, names in (('P1.x', ['P1', 'C3', 'D1', 'D2']),
+                           ('C7.y', ['P2', 'C5', 'C7'])):
+            for s in itervalues(root._subsystems):
+                self.assertEqual(rel.is_relevant_system(voi, s),
+                                 s.pathname in names)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -810,6 +810,18 @@ class TgtVecWrapper(VecWrapper):
         self.setup_flat()
         self._setup_access_functs()
 
+        # values of params we don't own live in the parent's vector
+        self._unowned_vals = [val for name, val in iteritems(self.flat)
+                              if name not in self._slices and
+                              isinstance(val, numpy.ndarray) and val.size]
+
+    def _zero(self):
+        """ Sets all vector variables to zero, including the params this
+        `VecWrapper` doesn't own, which live in the parent's vector."""
+        self.vec[:] = 0.0
+        for val in self._unowned_vals:
+            val[:] = 0.0
+
     def _setup_var_meta(self, pathname, meta, index, src_meta, store_byobjs):
         """
         Populate the metadata dict for the named variable.
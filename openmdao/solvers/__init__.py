@@ -1,6 +1,8 @@
+from openmdao.solvers.broyden import Broyden
 from openmdao.solvers.ln_direct import DirectSolver
 from openmdao.solvers.ln_gauss_seidel import LinearGaussSeidel
 from openmdao.solvers.newton import Newton
+from openmdao.solvers.nl_block_jacobi import NLBlockJacobi
 from openmdao.solvers.nl_gauss_seidel import NLGaussSeidel
 from openmdao.solvers.run_once import RunOnce
 from openmdao.solvers.scipy_gmres import ScipyGMRES
@@ -0,0 +1,210 @@
+""" Non-linear solver that implements Broyden's quasi-Newton method."""
+
+from collections import deque
+from math import isnan
+
+from openmdao.solvers.solver_base import NonLinearSolver
+from openmdao.solvers.nl_gauss_seidel import _dots
+from openmdao.util.record_util import update_local_meta, create_local_meta
+
+
+class Broyden(NonLinearSolver):
+    """A quasi-Newton solver that only linearizes the model once, at the
+    start of the solve. Each iteration then corrects the inverse of that
+    Jacobian with a rank-1 update, so no further linearizations are needed.
+    This pays off when the group contains components whose derivatives are
+    computed by finite difference.
+
+    The inverse of the initial Jacobian is applied with the group's linear
+    solver, and the updates are stored as pairs of vectors the size of the
+    group's unknowns vector. Either Broyden's 'good' update, which corrects
+    the Jacobian, or the 'bad' update, which corrects its inverse directly,
+    can be used. By default all of the updates are kept, and setting
+    'memory' keeps only the most recent ones.
+    """
+
+    def __init__(self):
+        super(Broyden, self).__init__()
+
+        opt = self.options
+        opt.add_option('atol', 1e-12,
+                       desc='Absolute convergence tolerance.')
+        opt.add_option('rtol', 1e-10,
+                       desc='Relative convergence tolerance.')
+        opt.add_option('maxiter', 50,
+                       desc='Maximum number of iterations.')
+        opt.add_option('alpha', 1.0,
+                       desc='Relaxation factor applied to each step.')
+        opt.add_option('update', 'good', values=['good', 'bad'],
+                       desc="Set to 'good' to update the Jacobian, or to 'bad' "
+                            "to update its inverse.")
+        opt.add_option('memory', 0, low=0,
+                       desc='Number of the most recent updates to keep. Set to '
+                            '0 to keep all of them.')
+        opt.add_option('solve_subsystems', True,
+                       desc='Set to True to solve subsystems. You may need this for solvers nested under Broyden.')
+
+        self.jac_count = 0
+
+    def solve(self, params, unknowns, resids, system, metadata=None):
+        """ Solves the system using Broyden's method.
+
+        Args
+        ----
+        params : `VecWrapper`
+            `VecWrapper` containing parameters. (p)
+
+        unknowns : `VecWrapper`
+            `VecWrapper` containing outputs and states. (u)
+
+        resids : `VecWrapper`
+            `VecWrapper` containing residuals. (r)
+
+        system : `System`
+            Parent `System` object.
+
+        metadata : dict, optional
+            Dictionary containing execution metadata (e.g. iteration coordinate).
+        """
+
+        atol = self.options['atol']
+        rtol = self.options['rtol']
+        maxiter = self.options['maxiter']
+        alpha = self.options['alpha']
+        good = self.options['update'] == 'good'
+        comm = system.comm
+
+        # Metadata setup
+        self.iter_count = 0
+        self.jac_count = 0
+        local_meta = create_local_meta(metadata, system.pathname)
+        system.ln_solver.local_meta = local_meta
+        update_local_meta(local_meta, (self.iter_count, 0))
+
+        # Perform an initial run to propagate srcs to targets.
+        system.children_solve_nonlinear(local_meta)
+        system.apply_nonlinear(params, unknowns, resids)
+
+        f_norm = resids.norm()
+        f_norm0 = f_norm
+
+        if self.options['iprint'] > 0:
+            self.print_norm('BROYDEN', system.pathname, 0, f_norm, f_norm0)
+
+        # Pairs of vectors (a, v). The inverse Jacobian estimate G (which
+        # includes the sign of the step) is G0 followed by the updates
+        # G <- (I + a v^T) G for the good update, or G0 plus the sum of the
+        # a v^T for the bad update.
+        updates = deque(maxlen=self.options['memory'] or None)
+
+        if self.iter_count < maxiter and f_norm > atol and f_norm/f_norm0 > rtol:
+            system.jacobian(params, unknowns, resids)
+            self.jac_count += 1
+
+            f_prev = resids.vec.copy()
+            step = self._apply_inverse(system, f_prev, updates, good)
+
+        while self.iter_count < maxiter and f_norm > atol and \
+                f_norm/f_norm0 > rtol:
+
+            u_prev = unknowns.vec.copy()
+            unknowns.vec[:] += alpha * step
+
+            # Metadata update
+            self.iter_count += 1
+            update_local_meta(local_meta, (self.iter_count, 0))
+
+            # Just evaluate the model with the new points
+            if self.options['solve_subsystems'] is True:
+                system.children_solve_nonlinear(local_meta)
+            system.apply_nonlinear(params, unknowns, resids, local_meta)
+
+            self.recorders.record(system, local_meta)
+
+            f_norm = resids.norm()
+            if self.options['iprint'] > 0:
+                self.print_norm('BROYDEN', system.pathname, self.iter_count, f_norm, f_norm0)
+
+            if f_norm <= atol or f_norm/f_norm0 <= rtol or isnan(f_norm):
+                break
+
+            f = resids.vec.copy()
+
+            # the change in the unknowns, which differs from the step when
+            # solving the subsystems overwrites the explicit outputs
+            s = unknowns.vec - u_prev
+
+            # G applied to the new residual, and to the change in residual,
+            # using G f_prev = step
+            p = self._apply_inverse(system, f, updates, good)
+            gy = p - step
+
+            # secant condition: G y = -s
+            a = s + gy
+            if good:
+                den = _dots(comm, (s, gy))[0]
+                v = s
+            else:
+                y = f - f_prev
+                den = _dots(comm, (y, y))[0]
+                v = y
+
+            if den != 0.0:
+                a *= -1.0 / den
+                updates.append((a, v))
+
+                # include the new update in the next step
+                if good:
+                    p += a * _dots(comm, (v, p))[0]
+                else:
+                    p += a * _dots(comm, (v, f))[0]
+
+            step = p
+            f_prev = f
+
+        if self.options['iprint'] > 0:
+
+            if self.iter_count == maxiter or isnan(f_norm):
+                msg = 'FAILED to converge after max iterations'
+            else:
+                msg = 'converged'
+
+            self.print_norm('BROYDEN', system.pathname, self.iter_count, f_norm,
+                            f_norm0, msg=msg)
+
+    def _apply_inverse(self, system, rhs, updates, good):
+        """ Applies the current estimate of the inverse Jacobian to a
+        residual vector.
+
+        Args
+        ----
+        system : `System`
+            Parent `System` object.
+
+        rhs : ndarray
+            Residual vector.
+
+        updates : deque
+            Pairs of vectors that make up the rank-1 updates.
+
+        good : bool
+            True if the updates are Broyden's good updates.
+
+        Returns
+        -------
+        ndarray
+            The resulting step in the unknowns.
+        """
+        system.drmat[None].vec[:] = rhs
+        system.solve_linear(system.dumat, system.drmat, [None], mode='fwd')
+        z = system.dumat[None].vec.copy()
+
+        if good:
+            for a, v in updates:
+                z += a * _dots(system.comm, (v, z))[0]
+        elif updates:
+            dots = _dots(system.comm, *[(v, rhs) for a, v in updates])
+            for (a, v), dot in zip(updates, dots):
+                z += a * dot
+
+        return z
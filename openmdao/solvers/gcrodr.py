@@ -0,0 +1,246 @@
+""" GMRES with a recycled Krylov subspace (GCRO-DR), for sequences of
+linear systems with the same or slowly changing operators."""
+
+import numpy as np
+from scipy.linalg import eig, qr, solve_triangular
+
+
+def gcrodr(matvec, b, x0=None, tol=1e-5, restart=20, maxiter=1000,
+           psolve=None, recycle=None, k=0, callback=None):
+    """ Solves A*x = b with restarted, right-preconditioned GMRES, in which
+    every Krylov vector is also kept orthogonal to a recycled subspace.
+
+    The recycled subspace is a pair of arrays (U, C) with C = A*U and
+    orthonormal columns. The part of the solution that lies in U is found
+    at the start by projection, so eigenvalues that GMRES would otherwise
+    have to find again in every solve are deflated. At the end of each
+    restart cycle, U is replaced by the `k` harmonic Ritz vectors of the
+    cycle with the smallest harmonic Ritz values.
+
+    Args
+    ----
+    matvec : callable
+        Returns A*v.
+
+    b : ndarray
+        Right-hand side.
+
+    x0 : ndarray, optional
+        Initial guess. Defaults to zero.
+
+    tol : float
+        The solve stops when either the absolute or the relative residual
+        norm is below `tol`, as in scipy's gmres.
+
+    restart : int
+        Number of iterations between restarts.
+
+    maxiter : int
+        Maximum number of restart cycles.
+
+    psolve : callable, optional
+        Returns M*v, where M approximates the inverse of A.
+
+    recycle : tuple of ndarray, optional
+        The recycled subspace (U, C) from a previous solve with the same
+        operator.
+
+    k : int
+        Number of vectors in the recycled subspace. If 0, no subspace is kept.
+
+    callback : callable, optional
+        Called with the relative residual norm after each iteration.
+
+    Returns
+    -------
+    ndarray
+        The solution.
+
+    int
+        0 if the solve converged, otherwise the number of cycles.
+
+    tuple of ndarray or None
+        The recycled subspace (U, C) for the next solve.
+    """
+    n = b.size
+    bnorm = np.linalg.norm(b)
+    if bnorm == 0.0:
+        return np.zeros(n), 0, recycle
+
+    target = tol * max(1.0, bnorm)
+
+    if x0 is None:
+        x = np.zeros(n)
+        r = b.copy()
+    else:
+        x = x0.copy()
+        r = b - matvec(x)
+
+    if recycle is not None:
+        U, C = recycle
+        Cr = C.T.dot(r)
+        x += U.dot(Cr)
+        r -= C.dot(Cr)
+    else:
+        U = C = np.zeros((n, 0))
+
+    for cycle in range(maxiter):
+        beta = np.linalg.norm(r)
+        if beta <= target:
+            return x, 0, _pair(U, C)
+
+        V = np.zeros((n, restart + 1))
+        Z = np.zeros((n, restart))
+        H = np.zeros((restart + 1, restart))
+        B = np.zeros((C.shape[1], restart))
+        V[:, 0] = r / beta
+
+        # QR factorization of H by Givens rotations, which gives the
+        # residual norm in each iteration
+        R = np.zeros((restart, restart))
+        cs = np.zeros(restart)
+        sn = np.zeros(restart)
+        g = np.zeros(restart + 1)
+        g[0] = beta
+
+        for j in range(restart):
+            Z[:, j] = V[:, j] if psolve is None else psolve(V[:, j])
+            w = matvec(Z[:, j]).copy()
+
+            B[:, j] = C.T.dot(w)
+            w -= C.dot(B[:, j])
+
+            # modified Gram-Schmidt
+            for i in range(j + 1):
+                H[i, j] = V[:, i].dot(w)
+                w -= H[i, j] * V[:, i]
+            H[j + 1, j] = np.linalg.norm(w)
+            if H[j + 1, j] != 0.0:
+                V[:, j + 1] = w / H[j + 1, j]
+
+            h = H[:j + 2, j].copy()
+            for i in range(j):
+                h[i], h[i + 1] = cs[i] * h[i] + sn[i] * h[i + 1], \
+                                 cs[i] * h[i + 1] - sn[i] * h[i]
+            denom = np.hypot(h[j], h[j + 1])
+            if denom == 0.0:
+                cs[j], sn[j] = 1.0, 0.0
+            else:
+                cs[j], sn[j] = h[j] / denom, h[j + 1] / denom
+            R[:j, j] = h[:j]
+            R[j, j] = denom
+            g[j + 1] = -sn[j] * g[j]
+            g[j] *= cs[j]
+            rnorm = abs(g[j + 1])
+
+            if callback is not None:
+                callback(rnorm / bnorm)
+
+            if H[j + 1, j] == 0.0 or rnorm <= target:
+                break
+
+        m = j + 1
+        H = H[:m + 1, :m]
+        B = B[:, :m]
+        Z = Z[:, :m]
+
+        y = solve_triangular(R[:m, :m], g[:m])
+        x += Z.dot(y) - U.dot(B.dot(y))
+
+        # the new residual is orthogonal to C
+        r = -V[:, :m + 1].dot(H.dot(y))
+        r[:] += beta * V[:, 0]
+
+        if k > 0:
+            U, C = _harmonic_ritz(U, C, Z, V[:, :m + 1], B, H, k)
+
+        if rnorm <= target:
+            return x, 0, _pair(U, C)
+
+    return x, maxiter, _pair(U, C)
+
+
+def reproject(matvec, U):
+    """ Returns the recycled subspace (U, C) spanned by `U` for a new
+    operator, with C = A*U orthonormal.
+
+    Args
+    ----
+    matvec : callable
+        Returns A*v.
+
+    U : ndarray
+        Basis of the recycled subspace from a previous operator.
+
+    Returns
+    -------
+    tuple of ndarray or None
+        The recycled subspace (U, C).
+    """
+    AU = np.array([matvec(u).copy() for u in U.T]).T
+
+    keep = _independent(AU)
+    U = U[:, keep]
+    Q, R = qr(AU[:, keep], mode='economic')
+
+    return _pair(solve_triangular(R, U.T, trans='T').T, Q)
+
+
+def _independent(A):
+    """ Returns a mask of the columns of `A` that are not linearly dependent
+    on the columns before them."""
+    R = qr(A, mode='r')[0]
+    diag = np.abs(np.diag(R))
+    keep = np.zeros(A.shape[1], dtype=bool)
+    if diag.size:
+        keep[:diag.size] = diag > 1e-12 * diag.max()
+    return keep
+
+
+def _pair(U, C):
+    """ Returns the recycled subspace, or None if it is empty."""
+    if U.shape[1] == 0:
+        return None
+    return U, C
+
+
+def _harmonic_ritz(U, C, Z, V, B, H, k):
+    """ Returns the new recycled subspace (U, C), spanned by the harmonic
+    Ritz vectors with the smallest harmonic Ritz values in the space
+    W = [U, Z], for which A*W = [C, V]*G."""
+    nc = U.shape[1]
+    m = Z.shape[1]
+
+    G = np.zeros((nc + m + 1, nc + m))
+    G[:nc, :nc] = np.eye(nc)
+    G[:nc, nc:] = B
+    G[nc:, nc:] = H
+
+    W = np.hstack((U, Z))
+    What = np.hstack((C, V))
+
+    GtG = G.T.dot(G)
+    theta, P = eig(GtG, G.T.dot(What.T.dot(W)))
+
+    order = [i for i in np.argsort(np.abs(theta)) if np.isfinite(theta[i])]
+    cols = []
+    for i in order:
+        if len(cols) >= k:
+            break
+        cols.append(P[:, i].real)
+        if theta[i].imag != 0.0 and len(cols) < k:
+            cols.append(P[:, i].imag)
+
+    if not cols:
+        return U, C
+
+    P = np.array(cols).T
+
+    # orthonormalize A*U, dropping directions that are linearly dependent
+    P = P[:, _independent(G.dot(P))]
+    Q, R = qr(G.dot(P), mode='economic')
+
+    C = What.dot(Q)
+    U = solve_triangular(R, W.dot(P).T, trans='T').T
+
+    return U, C
@@ -5,10 +5,24 @@ from math import isnan
 from openmdao.solvers.solver_base import NonLinearSolver
 from openmdao.util.record_util import update_local_meta, create_local_meta
 
+# constants for the Eisenstat-Walker forcing terms (their choice 2)
+_EW_GAMMA = 0.9
+_EW_ALPHA = 2.0
+
+# sufficient decrease factor for the Armijo line search
+_ARMIJO_C = 1e-4
+
 
 class Newton(NonLinearSolver):
     """A python Newton solver with line-search adapation of the relaxation
     parameter.
+
+    For large models, where each linearization costs much more than a
+    residual evaluation, the Newton iterations can be made cheaper by
+    reusing the Jacobian for several iterations ('jac_reuse' and
+    'jac_stall'), by solving each linear system only as accurately as the
+    current residual warrants ('forcing'), and by a line search that only
+    evaluates residuals ('line_search').
     """
 
     def __init__(self):
@@ -31,6 +45,29 @@ class Newton(NonLinearSolver):
                        desc='Initial over-relaxation factor.')
         opt.add_option('solve_subsystems', True,
                        desc='Set to True to solve subsystems. You may need this for solvers nested under Newton.')
+        opt.add_option('jac_reuse', 1, low=1,
+                       desc='Number of iterations that use the same linearization.')
+        opt.add_option('jac_stall', 1.0, low=0.0,
+                       desc='Re-linearize before the scheduled iteration if an '
+                            'iteration reduces the residual norm by less than '
+                            'this factor.')
+        opt.add_option('forcing', 'fixed', values=['fixed', 'eisenstat_walker'],
+                       desc="Set to 'eisenstat_walker' to solve each linear "
+                            "system to a relative tolerance that adapts to the "
+                            "convergence of the Newton iterations. Only "
+                            "iterative linear solvers are affected.")
+        opt.add_option('eta_max', 0.9, low=0.0, high=1.0,
+                       desc='Largest relative tolerance of the linear solves '
+                            'with Eisenstat-Walker forcing.')
+        opt.add_option('line_search', 'backtrack', values=['backtrack', 'armijo'],
+                       desc="Line search. 'backtrack' halves the step until the "
+                            "residual norm falls by ls_rtol. 'armijo' requires "
+                            "a sufficient decrease of the residual norm, "
+                            "shrinks the step by quadratic interpolation, and "
+                            "only evaluates residuals at trial points, without "
+                            "solving subsystems.")
+
+        self.jac_count = 0
 
     def solve(self, params, unknowns, resids, system, metadata=None):
         """ Solves the system using a Netwon's Method.
@@ -81,45 +118,60 @@ class Newton(NonLinearSolver):
         arg = system.drmat[None]
         result = system.dumat[None]
 
-        alpha_base = alpha
-        while self.iter_count < maxiter and f_norm > atol and \
-                f_norm/f_norm0 > rtol:
-
-            # Linearize Model
-            system.jacobian(params, unknowns, resids)
+        jac_reuse = self.options['jac_reuse']
+        jac_stall = self.options['jac_stall']
+        armijo = self.options['line_search'] == 'armijo'
 
-            # Calculate direction to take step
-            arg.vec[:] = resids.vec
-            system.solve_linear(system.dumat, system.drmat, [None], mode='fwd')
+        # With Eisenstat-Walker forcing, iterative linear solvers get a
+        # relative tolerance that changes with each iteration.
+        ln_solver = system.ln_solver
+        ew = self.options['forcing'] == 'eisenstat_walker'
+        eta = min(0.1, self.options['eta_max'])
 
-            unknowns.vec[:] += alpha*result.vec
+        self.jac_count = 0
+        since_jac = jac_reuse
+        f_norm_prev = None
 
-            # Metadata update
-            self.iter_count += 1
-            ls_itercount = 0
-            update_local_meta(local_meta, (self.iter_count, ls_itercount))
-
-            # Just evaluate the model with the new points
-            if self.options['solve_subsystems'] is True:
-                system.children_solve_nonlinear(local_meta)
-            system.apply_nonlinear(params, unknowns, resids, local_meta)
-
-            self.recorders.record(system, local_meta)
-
-            f_norm = resids.norm()
-            if self.options['iprint'] > 0:
-                self.print_norm('NEWTON', system.pathname, self.iter_count, f_norm, f_norm0)
-
-            # Backtracking Line Search
-            while ls_itercount < ls_maxiter and \
-                    f_norm > ls_atol and \
-                    f_norm/f_norm0 > ls_rtol:
-
-                alpha *= 0.5
-                unknowns.vec[:] -= alpha*result.vec
-                ls_itercount += 1
+        alpha_base = alpha
+        try:
+            while self.iter_count < maxiter and f_norm > atol and \
+                    f_norm/f_norm0 > rtol:
+
+                # Linearize Model, unless the previous linearization is
+                # still in use and the residual is still falling fast enough
+                if since_jac >= jac_reuse or \
+                        (f_norm_prev is not None and f_norm > jac_stall*f_norm_prev):
+                    system.jacobian(params, unknowns, resids)
+                    self.jac_count += 1
+                    since_jac = 0
+                since_jac += 1
+
+                if ew:
+                    if f_norm_prev is not None:
+                        eta = self._forcing_term(eta, f_norm, f_norm_prev, atol)
+                    ln_solver.rel_tol = eta
+
+                # Calculate direction to take step
+                arg.vec[:] = resids.vec
+                system.solve_linear(system.dumat, system.drmat, [None], mode='fwd')
+
+                f_norm_prev = f_norm
+
+                if armijo:
+                    f_norm, ok = self._armijo(params, unknowns, resids, system,
+                                              result.vec, alpha, f_norm, f_norm0,
+                                              local_meta)
+
+                    # a reused Jacobian may not give a descent direction
+                    if not ok:
+                        since_jac = jac_reuse
+                    continue
+
+                unknowns.vec[:] += alpha*result.vec
 
                 # Metadata update
+                self.iter_count += 1
+                ls_itercount = 0
                 update_local_meta(local_meta, (self.iter_count, ls_itercount))
 
                 # Just evaluate the model with the new points
@@ -130,12 +182,37 @@ class Newton(NonLinearSolver):
                 self.recorders.record(system, local_meta)
 
                 f_norm = resids.norm()
-                if self.options['iprint'] > 1:
-                    self.print_norm('BK_TKG', system.pathname, ls_itercount, f_norm,
-                                    f_norm0, indent=1, solver='LS')
+                if self.options['iprint'] > 0:
+                    self.print_norm('NEWTON', system.pathname, self.iter_count, f_norm, f_norm0)
+
+                # Backtracking Line Search
+                while ls_itercount < ls_maxiter and \
+                        f_norm > ls_atol and \
+                        f_norm/f_norm0 > ls_rtol:
+
+                    alpha *= 0.5
+                    unknowns.vec[:] -= alpha*result.vec
+                    ls_itercount += 1
+
+                    # Metadata update
+                    update_local_meta(local_meta, (self.iter_count, ls_itercount))
+
+                    # Just evaluate the model with the new points
+                    if self.options['solve_subsystems'] is True:
+                        system.children_solve_nonlinear(local_meta)
+                    system.apply_nonlinear(params, unknowns, resids, local_meta)
+
+                    self.recorders.record(system, local_meta)
 
-            # Reset backtracking
-            alpha = alpha_base
+                    f_norm = resids.norm()
+                    if self.options['iprint'] > 1:
+                        self.print_norm('BK_TKG', system.pathname, ls_itercount, f_norm,
+                                        f_norm0, indent=1, solver='LS')
+
+                # Reset backtracking
+                alpha = alpha_base
+        finally:
+            ln_solver.rel_tol = None
 
         # Need to make sure the whole workflow is executed at the final
         # point, not just evaluated.
@@ -152,3 +229,141 @@ class Newton(NonLinearSolver):
 
             self.print_norm('NEWTON', system.pathname, self.iter_count, f_norm,
                             f_norm0, msg=msg)
+
+    def _forcing_term(self, eta, f_norm, f_norm_prev, atol):
+        """ Returns the Eisenstat-Walker forcing term, i.e. the relative
+        tolerance for the next linear solve.
+
+        Args
+        ----
+        eta : float
+            Forcing term of the previous iteration.
+
+        f_norm : float
+            Current residual norm.
+
+        f_norm_prev : float
+            Residual norm at the start of the previous iteration.
+
+        atol : float
+            Absolute convergence tolerance of the Newton iterations.
+
+        Returns
+        -------
+        float
+            The new forcing term.
+        """
+        eta_new = _EW_GAMMA * (f_norm / f_norm_prev)**_EW_ALPHA
+
+        # don't let the forcing term fall too fast while the convergence
+        # isn't yet quadratic
+        floor = _EW_GAMMA * eta**_EW_ALPHA
+        if floor > 0.1:
+            eta_new = max(eta_new, floor)
+
+        eta_new = min(eta_new, self.options['eta_max'])
+
+        # no point solving more accurately than needed to reach atol
+        if f_norm > 0.0:
+            eta_new = max(eta_new, 0.5 * atol / f_norm)
+
+        return eta_new
+
+    def _armijo(self, params, unknowns, resids, system, step, alpha, f_norm,
+                f_norm0, local_meta):
+        """ Takes a step of at most `alpha` along `step`, shrinking it until
+        the residual norm decreases sufficiently. Only residuals are evaluated
+        at the trial points. If subsystems are solved, that happens once, at
+        the accepted point.
+
+        Args
+        ----
+        params : `VecWrapper`
+            `VecWrapper` containing parameters. (p)
+
+        unknowns : `VecWrapper`
+            `VecWrapper` containing outputs and states. (u)
+
+        resids : `VecWrapper`
+            `VecWrapper` containing residuals. (r)
+
+        system : `System`
+            Parent `System` object.
+
+        step : ndarray
+            The Newton step.
+
+        alpha : float
+            Initial step length.
+
+        f_norm : float
+            Residual norm at the current point.
+
+        f_norm0 : float
+            Residual norm at the start of the solve.
+
+        local_meta : dict
+            Dictionary containing execution metadata (e.g. iteration coordinate).
+
+        Returns
+        -------
+        float
+            Residual norm at the new point.
+
+        bool
+            True if the residual norm decreased sufficiently.
+        """
+        ls_maxiter = self.options['ls_maxiter']
+
+        unknowns.vec[:] += alpha*step
+
+        self.iter_count += 1
+        ls_itercount = 0
+        update_local_meta(local_meta, (self.iter_count, ls_itercount))
+
+        system.apply_nonlinear(params, unknowns, resids, local_meta)
+        self.recorders.record(system, local_meta)
+        f_trial = resids.norm()
+
+        # phi(a) = ||F(u + a*step)||**2 / 2 has the slope -||F(u)||**2 at
+        # a = 0 for a Newton step.
+        phi0 = 0.5 * f_norm**2
+        dphi0 = -f_norm**2
+
+        while True:
+            ok = f_trial <= (1.0 - _ARMIJO_C * alpha) * f_norm
+            if ok or ls_itercount >= ls_maxiter:
+                break
+
+            # minimize the quadratic that interpolates phi(0), phi'(0) and
+            # phi(alpha), within safeguards
+            denom = 2.0 * (0.5 * f_trial**2 - phi0 - dphi0 * alpha)
+            if denom > 0.0 and not isnan(denom):
+                new_alpha = -dphi0 * alpha**2 / denom
+                new_alpha = min(max(new_alpha, 0.1 * alpha), 0.5 * alpha)
+            else:
+                new_alpha = 0.5 * alpha
+
+            unknowns.vec[:] += (new_alpha - alpha)*step
+            alpha = new_alpha
+            ls_itercount += 1
+
+            update_local_meta(local_meta, (self.iter_count, ls_itercount))
+            system.apply_nonlinear(params, unknowns, resids, local_meta)
+            self.recorders.record(system, local_meta)
+            f_trial = resids.norm()
+
+            if self.options['iprint'] > 1:
+                self.print_norm('ARMIJO', system.pathname, ls_itercount, f_trial,
+                                f_norm0, indent=1, solver='LS')
+
+        if self.options['solve_subsystems'] is True:
+            system.children_solve_nonlinear(local_meta)
+            system.apply_nonlinear(params, unknowns, resids, local_meta)
+            self.recorders.record(system, local_meta)
+            f_trial = resids.norm()
+
+        if self.options['iprint'] > 0:
+            self.print_norm('NEWTON', system.pathname, self.iter_count, f_trial, f_norm0)
+
+        return f_trial, ok
@@ -0,0 +1,83 @@
+""" Block Jacobi non-linear solver."""
+
+from openmdao.core.component import Component
+from openmdao.core.mpi_wrap import MPI
+from openmdao.solvers.nl_gauss_seidel import NLGaussSeidel
+from openmdao.util.thread_util import WorkerThreads
+
+
+class NLBlockJacobi(NLGaussSeidel):
+    """ Nonlinear block Jacobi solver. Each iteration does a single full
+    transfer of data to the children of the group, then solves all of them,
+    so unlike Gauss Seidel the children don't depend on each other within an
+    iteration and can run concurrently.
+
+    Under MPI, the children of a `ParallelGroup` already run at the same time
+    on their own sub-communicators. Otherwise, up to 'num_threads' children
+    are solved at once in separate threads, which helps when they spend
+    their time in code that releases the GIL, such as numpy, compiled
+    extensions or external processes. Children whose `is_concurrent` method
+    returns True, such as `ExternalCode` components with
+    options['concurrent'] set, are always solved in threads of their own,
+    as they are by `ParallelGroup`.
+
+    It supports the same options as `NLGaussSeidel`, including Aitken and
+    Anderson acceleration.
+    """
+
+    print_name = 'NLN_JAC'
+
+    def __init__(self):
+        super(NLBlockJacobi, self).__init__()
+
+        self.options.add_option('num_threads', 1, low=1,
+                                desc='Number of children solved at the same '
+                                     'time when not running under MPI.')
+
+    def _iterate(self, system, metadata):
+        """ Runs one iteration, transferring data to all of the children of
+        `system` and then solving them.
+
+        Args
+        ----
+        system : `System`
+            Parent `System` object.
+
+        metadata : dict
+            Dictionary containing execution metadata (e.g. iteration coordinate).
+        """
+
+        # full scatter
+        system._transfer_data()
+
+        subs = [sub for sub in system._local_subsystems if sub.is_active()]
+        others = [sub for sub in subs if not sub.is_concurrent()]
+        num_threads = min(self.options['num_threads'], len(others))
+
+        batches = [[sub] for sub in subs if sub.is_concurrent()]
+        if MPI or num_threads < 2:
+            serial = others
+        else:
+            batches.extend(others[i::num_threads] for i in range(num_threads))
+            serial = []
+
+        threads = WorkerThreads(lambda sub: _solve(sub, metadata), batches)
+        threads.start()
+
+        try:
+            for sub in serial:
+                _solve(sub, metadata)
+        finally:
+            threads.join()
+
+        # report the first failure in execution order
+        threads.reraise(subs)
+
+
+def _solve(sub, metadata):
+    """ Runs solve_nonlinear on a subsystem."""
+    if isinstance(sub, Component):
+        sub.solve_nonlinear(sub.params, sub.unknowns, sub.resids)
+    else:
+        sub.solve_nonlinear(sub.params, sub.unknowns, sub.resids, metadata)
+
@@ -2,6 +2,9 @@
 
 from math import isnan
 
+import numpy as np
+
+from openmdao.core.mpi_wrap import MPI
 from openmdao.solvers.solver_base import NonLinearSolver
 from openmdao.util.record_util import update_local_meta, create_local_meta
 
@@ -11,8 +14,17 @@ class NLGaussSeidel(NonLinearSolver):
     `Group`. If there are no cycles, then the system will solve its
     subsystems once and terminate. Equivalent to fixed point iteration in
     cases with cycles.
+
+    The fixed point iteration can optionally be accelerated with Aitken
+    relaxation or Anderson mixing by setting the 'accel' option. Both act
+    on the full unknowns vector of the group. After a solve,
+    `relax_factor` holds the latest Aitken relaxation factor and
+    `accel_history` the number of previous iterations used by the latest
+    Anderson step.
     """
 
+    print_name = 'NLN_GS'
+
     def __init__(self):
         super(NLGaussSeidel, self).__init__()
 
@@ -23,6 +35,70 @@ class NLGaussSeidel(NonLinearSolver):
                        desc='Relative convergence tolerance.')
         opt.add_option('maxiter', 100,
                        desc='Maximum number of iterations.')
+        opt.add_option('use_apply_nonlinear', True,
+                       desc='Set to False to measure convergence by the change '
+                            'in the unknowns over an iteration, rather than '
+                            'the norm of the residuals, which saves an extra '
+                            'evaluation of the model. The residuals are still '
+                            'used if there are any implicit states.')
+        opt.add_option('accel', 'none', values=['none', 'aitken', 'anderson'],
+                       desc='Acceleration of the fixed point iteration.')
+        opt.add_option('relax', 1.0, low=0.0,
+                       desc='Initial relaxation factor for Aitken acceleration.')
+        opt.add_option('relax_min', 0.1, low=0.0,
+                       desc='Lower bound on the Aitken relaxation factor.')
+        opt.add_option('relax_max', 1.5, low=0.0,
+                       desc='Upper bound on the Aitken relaxation factor.')
+        opt.add_option('depth', 5, low=1,
+                       desc='Number of previous iterations used by Anderson '
+                            'acceleration.')
+
+        self.relax_factor = 1.0
+        self.accel_history = 0
+        self._naccel = 0
+        self._bufs = None
+
+    def setup(self, sub):
+        """ Allocates the vectors needed for acceleration.
+
+        Args
+        ----
+        sub: `System`
+            System that owns this solver.
+        """
+        self._setup_bufs(sub.unknowns.vec.size, self._use_apply(sub))
+
+    def _use_apply(self, system):
+        """ Returns True if convergence is measured by the residuals."""
+        return self.options['use_apply_nonlinear'] or bool(system.states)
+
+    def _setup_bufs(self, size, use_apply):
+        """ Allocates the vectors for the selected acceleration and
+        convergence measure once, so the iterations don't create any arrays
+        the size of the unknowns."""
+        accel = self.options['accel']
+        depth = self.options['depth']
+        bufs = self._bufs
+        if bufs is not None and bufs['accel'] == accel and \
+                bufs['size'] == size and bufs['depth'] == depth and \
+                bufs['use_apply'] == use_apply:
+            return
+
+        self._bufs = bufs = {'accel': accel, 'size': size, 'depth': depth,
+                             'use_apply': use_apply}
+        names = []
+        if accel == 'aitken':
+            names = ['u_in', 'delta', 'delta_prev', 'tmp']
+        elif accel == 'anderson':
+            names = ['u_in', 'f', 'f_prev', 'g_prev']
+            bufs['dF'] = np.zeros((depth, size))
+            bufs['dG'] = np.zeros((depth, size))
+        if not use_apply:
+            names.extend(('u_in', 'diff'))
+
+        for name in names:
+            if name not in bufs:
+                bufs[name] = np.zeros(size)
 
     def solve(self, params, unknowns, resids, system, metadata=None):
         """ Solves the system using Gauss Seidel.
@@ -49,6 +125,15 @@ class NLGaussSeidel(NonLinearSolver):
         rtol = self.options['rtol']
         maxiter = self.options['maxiter']
         iprint = self.options['iprint']
+        accel = self.options['accel']
+        use_apply = self._use_apply(system)
+
+        if accel != 'none' or not use_apply:
+            self._setup_bufs(unknowns.vec.size, use_apply)
+            self._bufs['u_in'][:] = unknowns.vec
+            self._naccel = 0
+            self.accel_history = 0
+            self.relax_factor = self.options['relax']
 
         # Initial run
         self.iter_count = 1
@@ -59,7 +144,7 @@ class NLGaussSeidel(NonLinearSolver):
         update_local_meta(local_meta, (self.iter_count,))
 
         # Initial Solve
-        system.children_solve_nonlinear(local_meta)
+        self._iterate(system, local_meta)
 
         self.recorders.record(system, local_meta)
 
@@ -70,12 +155,11 @@ class NLGaussSeidel(NonLinearSolver):
         resids = system.resids
 
         # Evaluate Norm
-        system.apply_nonlinear(params, unknowns, resids)
-        normval = resids.norm()
+        normval = self._iter_norm(params, unknowns, resids, system, use_apply)
         basenorm = normval if normval > atol else 1.0
 
         if self.options['iprint'] > 0:
-            self.print_norm('NLN_GS', system.pathname, 0, normval, basenorm)
+            self.print_norm(self.print_name, system.pathname, 0, normval, basenorm)
 
         while self.iter_count < maxiter and \
                 normval > atol and \
@@ -85,17 +169,21 @@ class NLGaussSeidel(NonLinearSolver):
             self.iter_count += 1
             update_local_meta(local_meta, (self.iter_count,))
 
+            if accel != 'none':
+                self._accelerate(unknowns.vec, system)
+            if accel != 'none' or not use_apply:
+                self._bufs['u_in'][:] = unknowns.vec
+
             # Runs an iteration
-            system.children_solve_nonlinear(local_meta)
+            self._iterate(system, local_meta)
             self.recorders.record(system, local_meta)
 
             # Evaluate Norm
-            system.apply_nonlinear(params, unknowns, resids)
-            normval = resids.norm()
+            normval = self._iter_norm(params, unknowns, resids, system, use_apply)
 
             if self.options['iprint'] > 0:
-                self.print_norm('NLN_GS', system.pathname, self.iter_count, normval,
-                                basenorm)
+                self.print_norm(self.print_name, system.pathname, self.iter_count,
+                                normval, basenorm)
 
         if self.options['iprint'] > 0:
             if self.iter_count == maxiter or isnan(normval):
@@ -103,5 +191,137 @@ class NLGaussSeidel(NonLinearSolver):
             else:
                 msg = 'converged'
 
-            self.print_norm('NLN_GS', system.pathname, self.iter_count, normval,
-                            basenorm, msg=msg)
+            self.print_norm(self.print_name, system.pathname, self.iter_count,
+                            normval, basenorm, msg=msg)
+
+    def _iterate(self, system, metadata):
+        """ Runs one iteration, solving each of the children of `system`
+        in order.
+
+        Args
+        ----
+        system : `System`
+            Parent `System` object.
+
+        metadata : dict
+            Dictionary containing execution metadata (e.g. iteration coordinate).
+        """
+        system.children_solve_nonlinear(metadata)
+
+    def _iter_norm(self, params, unknowns, resids, system, use_apply):
+        """ Returns the norm used to check convergence of the latest
+        iteration.
+
+        Args
+        ----
+        params : `VecWrapper`
+            `VecWrapper` containing parameters. (p)
+
+        unknowns : `VecWrapper`
+            `VecWrapper` containing outputs and states. (u)
+
+        resids : `VecWrapper`
+            `VecWrapper` containing residuals. (r)
+
+        system : `System`
+            Parent `System` object.
+
+        use_apply : bool
+            If True, the norm of the residuals. Otherwise the norm of the
+            change in the unknowns since the start of the iteration, which
+            doesn't need another evaluation of the model.
+
+        Returns
+        -------
+        float
+            The norm.
+        """
+        if use_apply:
+            system.apply_nonlinear(params, unknowns, resids)
+            return resids.norm()
+
+        diff = self._bufs['diff']
+        np.subtract(unknowns.vec, self._bufs['u_in'], out=diff)
+        return np.sqrt(_dots(system.comm, (diff, diff))[0])
+
+    def _accelerate(self, u, system):
+        """ Replaces the result of the latest Gauss-Seidel iteration, `u`,
+        with the accelerated starting point for the next one.
+
+        Args
+        ----
+        u : ndarray
+            Flat unknowns vector of the group.
+
+        system : `System`
+            Parent `System` object.
+        """
+        bufs = self._bufs
+        comm = system.comm
+        u_in = bufs['u_in']
+        k = self._naccel
+        self._naccel += 1
+
+        if bufs['accel'] == 'aitken':
+            delta, delta_prev, tmp = bufs['delta'], bufs['delta_prev'], bufs['tmp']
+            np.subtract(u, u_in, out=delta)
+
+            if k > 0:
+                np.subtract(delta, delta_prev, out=tmp)
+                den, num = _dots(comm, (tmp, tmp), (tmp, delta))
+                if den > 0.0:
+                    theta = self.relax_factor * (1.0 - num / den)
+                    self.relax_factor = min(max(theta, self.options['relax_min']),
+                                            self.options['relax_max'])
+
+            u[:] = u_in
+            u += self.relax_factor * delta
+            bufs['delta'], bufs['delta_prev'] = delta_prev, delta
+
+            if self.options['iprint'] > 1:
+                self.print_norm('AITKEN', system.pathname, self.iter_count, 0., 1.,
+                                msg='relaxation factor %.6g' % self.relax_factor,
+                                indent=1)
+
+        else:
+            f, f_prev, g_prev = bufs['f'], bufs['f_prev'], bufs['g_prev']
+            dF, dG = bufs['dF'], bufs['dG']
+            depth = bufs['depth']
+            np.subtract(u, u_in, out=f)
+
+            if k > 0:
+                row = (k - 1) % depth
+                np.subtract(f, f_prev, out=dF[row])
+                np.subtract(u, g_prev, out=dG[row])
+
+            f_prev[:] = f
+            g_prev[:] = u
+
+            # Mix the latest iterates with the combination of the previous
+            # ones that minimizes the fixed point residual. The normal
+            # equations keep the least squares problem tiny, and the matrix
+            # and right hand side share one buffer so that they need only a
+            # single reduction under MPI.
+            nhist = min(k, depth)
+            self.accel_history = nhist
+            if nhist > 0:
+                dFk = dF[:nhist]
+                normal = np.empty((nhist, nhist + 1))
+                normal[:, :nhist] = dFk.dot(dFk.T)
+                normal[:, nhist] = dFk.dot(f)
+                if MPI:
+                    normal = comm.allreduce(normal)
+                gamma = np.linalg.lstsq(normal[:, :nhist], normal[:, nhist])[0]
+                u -= gamma.dot(dG[:nhist])
+
+            if self.options['iprint'] > 1:
+                self.print_norm('ANDERSON', system.pathname, self.iter_count, 0., 1.,
+                                msg='%d previous iterations' % nhist, indent=1)
+
+
+def _dots(comm, *pairs):
+    """ Returns the dot product of each pair of distributed vectors."""
+    dots = np.array([a.dot(b) for a, b in pairs])
+    if MPI:
+        dots = comm.allreduce(dots)
+    return dots
@@ -12,6 +12,7 @@ from petsc4py import PETSc
 import numpy as np
 
 from openmdao.solvers.solver_base import LinearSolver
+from openmdao.solvers.precon import add_pc_options, get_preconditioner
 
 trace = os.environ.get("TRACE_PETSC")
 if trace:
@@ -82,6 +83,9 @@ class PetscKSP(LinearSolver):
                        desc="Derivative calculation mode, set to 'fwd' for " + \
                        "forward mode, 'rev' for reverse mode, or 'auto' to " + \
                        "let OpenMDAO determine the best mode.")
+        opt.add_option('precondition', False,
+                       desc='Set to True to turn on preconditioning.')
+        add_pc_options(opt)
 
         # These are defined whenever we call solve to provide info we need in
         # the callback.
@@ -90,6 +94,7 @@ class PetscKSP(LinearSolver):
         self.mode = None
 
         self.ksp = None
+        self._pc = None
 
     def setup(self, system):
         """ Setup petsc problem just once."""
@@ -146,9 +151,16 @@ class PetscKSP(LinearSolver):
         options = self.options
         self.mode = mode
 
+        rtol = options['rtol']
+        if self.rel_tol is not None:
+            rtol = max(rtol, self.rel_tol)
+
         self.ksp.setTolerances(max_it=options['maxiter'],
                                atol=options['atol'],
-                               rtol=options['rtol'])
+                               rtol=rtol)
+
+        if options['precondition'] == True:
+            self._pc = get_preconditioner(options, self._pc)
 
         unknowns_mat = {}
         for voi, rhs in iteritems(rhs_mat):
@@ -235,11 +247,30 @@ class PetscKSP(LinearSolver):
             Empty vector into which we return the preconditioned sol_vec
         """
 
-        # TODO - Preconditioning is not supported yet, so mimic an Identity
-        # matrix.
-        # if int((petsc4py.__version__).split('.')[1]) >= 6:
-        #     vec = sol_vec.getArray(readonly=True)
-        # else:
-        #     vec = sol_vec.getArray()
+        arg = _get_petsc_vec_array(sol_vec)
+
+        # Without preconditioning, mimic an Identity matrix.
+        if self.options['precondition'] != True:
+            rhs_vec.array[:] = arg
 
-        rhs_vec.array[:] = _get_petsc_vec_array(sol_vec)
+        # Preconditioners built from the Jacobian only cover the couplings
+        # within this process.
+        elif self._pc is not None:
+            rhs_vec.array[:] = self._pc.apply(self.system, self.voi, arg,
+                                              self.mode)
+
+        else:
+            system = self.system
+            mode = self.mode
+            voi = self.voi
+            if mode == 'fwd':
+                sol, rhs = system.dumat[voi], system.drmat[voi]
+            else:
+                sol, rhs = system.drmat[voi], system.dumat[voi]
+
+            rhs.vec[:] = arg
+            system.clear_dparams()
+            system.solve_linear({voi: system.dumat[voi]}, {voi: system.drmat[voi]},
+                                (voi, ), mode=mode, precon=True)
+
+            rhs_vec.array[:] = sol.vec
@@ -0,0 +1,328 @@
+""" Preconditioners for the Krylov linear solvers that are built from the
+Jacobians each component cached at the last linearization."""
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.linalg import splu, spilu
+
+from openmdao.components.indep_var_comp import IndepVarComp
+from openmdao.core.component import Component
+
+
+def add_pc_options(opt):
+    """ Adds the options that select and configure a preconditioner.
+
+    Args
+    ----
+    opt : `OptionsDictionary`
+        Options of a linear solver.
+    """
+    opt.add_option('pc_type', 'system',
+                   values=['system', 'block_jacobi', 'block_gauss_seidel', 'ilu'],
+                   desc="Preconditioner used when 'precondition' is True. "
+                        "'system' solves with the solver in the system's "
+                        "precon slot. 'block_jacobi' and 'block_gauss_seidel' "
+                        "factor the diagonal block of each subsystem, and "
+                        "'ilu' uses an incomplete LU factorization of the whole "
+                        "Jacobian. These are built from the cached component "
+                        "Jacobians, once per linearization.")
+    opt.add_option('ilu_drop_tol', 1e-4, low=0.0,
+                   desc='Drop tolerance of the ILU preconditioner.')
+    opt.add_option('ilu_fill_factor', 10.0, low=1.0,
+                   desc='Upper bound on the fill of the ILU preconditioner.')
+
+
+def get_preconditioner(options, pc=None):
+    """ Returns the preconditioner selected in the options of a linear
+    solver.
+
+    Args
+    ----
+    options : `OptionsDictionary`
+        Options of a linear solver, including those added by `add_pc_options`.
+
+    pc : `Preconditioner`, optional
+        The preconditioner used so far, which is returned if it still matches
+        the options so that its factorization can be reused.
+
+    Returns
+    -------
+    `Preconditioner` or None
+        The preconditioner, or None if the 'system' preconditioner is selected.
+    """
+    pc_type = options['pc_type']
+    if pc_type == 'system':
+        return None
+
+    if pc_type == 'ilu':
+        args = (options['ilu_drop_tol'], options['ilu_fill_factor'])
+    else:
+        args = ()
+
+    if type(pc) is not _PC_TYPES[pc_type] or pc.args != args:
+        pc = _PC_TYPES[pc_type](*args)
+
+    return pc
+
+
+def assemble_jacobian(system, voi=None):
+    """ Assembles the Jacobian of the linear system that `system` solves,
+    d(resids)/d(unknowns) over its local derivative vector, from the
+    Jacobians cached by its components at the last linearization.
+
+    Components that don't cache a Jacobian, because they only define
+    `apply_linear`, contribute an identity block.
+
+    Args
+    ----
+    system : `Group`
+        The system whose Jacobian is assembled.
+
+    voi : str, optional
+        Variable of interest that selects the derivative vector.
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix
+        The Jacobian, as used in forward mode.
+    """
+    dumat = system.dumat[voi]
+    n = dumat.vec.size
+
+    offsets = {}
+    for name, (start, end) in dumat._slices.items():
+        offsets[dumat._vardict[name]['pathname']] = (start, end)
+
+    rows, cols, data = [], [], []
+
+    def add(irows, icols, J):
+        r, c = np.meshgrid(irows, icols, indexing='ij')
+        rows.append(r.ravel())
+        cols.append(c.ravel())
+        data.append(J.ravel())
+
+    for leaf in _leaves(system):
+        cache = leaf._jacobian_cache if not isinstance(leaf, IndepVarComp) else None
+        states = getattr(leaf, 'states', ())
+
+        for uname, meta in leaf.unknowns.items():
+            rng = offsets.get(meta['pathname'])
+            if rng is None:
+                continue
+
+            # explicit outputs have du on the diagonal
+            if not cache or uname not in states:
+                idxs = np.arange(*rng)
+                rows.append(idxs)
+                cols.append(idxs)
+                data.append(np.ones(idxs.size))
+
+        if not cache:
+            continue
+
+        for (uname, pname), J in cache.items():
+            if uname not in leaf.unknowns:
+                continue
+            rng = offsets.get(leaf.unknowns.metadata(uname)['pathname'])
+            if rng is None:
+                continue
+            irows = np.arange(*rng)
+
+            if pname in leaf.unknowns:
+                meta = leaf.unknowns.metadata(pname)
+                src_rng = offsets.get(meta['pathname'])
+                scale = 1.0
+                src_idxs = None
+            elif pname in leaf.params:
+                meta = leaf.params.metadata(pname)
+                src = system.connections.get(meta['pathname'])
+                src_rng = offsets.get(src)
+                scale = meta.get('unit_conv', (1.0, 0.0))[0]
+                src_idxs = meta.get('src_indices')
+            else:
+                continue
+
+            if src_rng is None:
+                continue
+
+            if src_idxs is None:
+                icols = np.arange(*src_rng)
+            else:
+                icols = src_rng[0] + np.asarray(src_idxs).ravel()
+
+            add(irows, icols, -scale * np.asarray(J))
+
+    if rows:
+        rows, cols, data = np.hstack(rows), np.hstack(cols), np.hstack(data)
+
+    return coo_matrix((data, (rows, cols)), shape=(n, n)).tocsr()
+
+
+def _leaves(system):
+    """ Yields the local Components, and the Groups that are finite
+    differenced, under `system`."""
+    for sub in system._local_subsystems:
+        if isinstance(sub, Component) or sub.fd_options['force_fd']:
+            yield sub
+        else:
+            for leaf in _leaves(sub):
+                yield leaf
+
+
+def _sub_blocks(system, voi):
+    """ Returns the (start, end) range of each local subsystem in the
+    derivative vector of `system`, in order."""
+    dumat = system.dumat[voi]
+    blocks = []
+    for sub in system._local_subsystems:
+        prefix = sub.pathname + '.'
+        rngs = [rng for name, rng in dumat._slices.items()
+                if dumat._vardict[name]['pathname'].startswith(prefix)]
+        if rngs:
+            blocks.append((min(r[0] for r in rngs), max(r[1] for r in rngs)))
+
+    return sorted(blocks)
+
+
+class Preconditioner(object):
+    """ Base class for the preconditioners that are built from the
+    assembled Jacobian. The factorization is computed the first time the
+    preconditioner is applied after a linearization of the system, and is
+    then reused for every right-hand side until the next one."""
+
+    def __init__(self, *args):
+        self.args = args
+        self._factors = {}
+        self._linearize_count = None
+
+    def apply(self, system, voi, arg, mode):
+        """ Applies the preconditioner.
+
+        Args
+        ----
+        system : `Group`
+            The system whose linear system is solved.
+
+        voi : str
+            Variable of interest.
+
+        arg : ndarray
+            Incoming vector.
+
+        mode : string
+            Derivative mode, can be 'fwd' or 'rev'.
+
+        Returns
+        -------
+        ndarray : Preconditioned vector
+        """
+        if system._linearize_count != self._linearize_count:
+            self._factors = {}
+            self._linearize_count = system._linearize_count
+
+        try:
+            factors = self._factors[voi]
+        except KeyError:
+            factors = self._factors[voi] = self._factor(system, voi)
+
+        return self._solve(factors, arg, mode == 'rev')
+
+    def _factor(self, system, voi):
+        """ Returns the factorization for the current linearization.
+        Override this to define a preconditioner."""
+        raise NotImplementedError()
+
+    def _solve(self, factors, arg, trans):
+        """ Applies the factorization, or its transpose if `trans` is True.
+        Override this to define a preconditioner."""
+        raise NotImplementedError()
+
+
+def _factor_blocks(system, voi, A):
+    """ Returns the sparse LU factorization of each diagonal block."""
+    lus = []
+    for start, end in _sub_blocks(system, voi):
+        try:
+            lus.append(splu(A[start:end, start:end].tocsc()))
+        except RuntimeError:
+            msg = "Preconditioner in '{}': the diagonal block of rows {} to {} " \
+                  "is singular."
+            raise RuntimeError(msg.format(system.pathname, start, end))
+    return lus
+
+
+class BlockJacobiPC(Preconditioner):
+    """ Solves with the diagonal block of each subsystem, ignoring the
+    coupling between subsystems."""
+
+    def _factor(self, system, voi):
+        A = assemble_jacobian(system, voi)
+        return _sub_blocks(system, voi), _factor_blocks(system, voi, A)
+
+    def _solve(self, factors, arg, trans):
+        blocks, lus = factors
+        trans = 'T' if trans else 'N'
+        result = np.empty(arg.size)
+        for (start, end), lu in zip(blocks, lus):
+            result[start:end] = lu.solve(arg[start:end], trans=trans)
+        return result
+
+
+class BlockGaussSeidelPC(Preconditioner):
+    """ One block Gauss-Seidel sweep over the subsystems, in order in
+    forward mode and in reverse order in reverse mode."""
+
+    def _factor(self, system, voi):
+        A = assemble_jacobian(system, voi)
+        blocks = _sub_blocks(system, voi)
+
+        # coupling to the blocks solved earlier in each sweep
+        fwd = [A[start:end, :start] for start, end in blocks]
+        rev = [A[end:, start:end].T.tocsr() for start, end in blocks]
+
+        return blocks, _factor_blocks(system, voi, A), fwd, rev
+
+    def _solve(self, factors, arg, trans):
+        blocks, lus, fwd, rev = factors
+        result = np.zeros(arg.size)
+
+        if trans:
+            for i in reversed(range(len(blocks))):
+                start, end = blocks[i]
+                rhs = arg[start:end] - rev[i].dot(result[end:])
+                result[start:end] = lus[i].solve(rhs, trans='T')
+        else:
+            for i, (start, end) in enumerate(blocks):
+                rhs = arg[start:end] - fwd[i].dot(result[:start])
+                result[start:end] = lus[i].solve(rhs)
+
+        return result
+
+
+class ILUPC(Preconditioner):
+    """ Incomplete LU factorization of the whole Jacobian.
+
+    Args
+    ----
+    drop_tol : float
+        Drop tolerance of the factorization.
+
+    fill_factor : float
+        Upper bound on the ratio of nonzeros in the factors to nonzeros in
+        the Jacobian.
+    """
+
+    def _factor(self, system, voi):
+        drop_tol, fill_factor = self.args
+        A = assemble_jacobian(system, voi)
+        return spilu(A.tocsc(), drop_tol=drop_tol, fill_factor=fill_factor)
+
+    def _solve(self, ilu, arg, trans):
+        return ilu.solve(arg, trans='T' if trans else 'N')
+
+
+_PC_TYPES = {
+    'block_jacobi': BlockJacobiPC,
+    'block_gauss_seidel': BlockGaussSeidelPC,
+    'ilu': ILUPC,
+}
@@ -7,7 +7,9 @@ from six import iteritems
 import numpy as np
 from scipy.sparse.linalg import gmres, LinearOperator
 
+from openmdao.solvers.gcrodr import gcrodr, reproject
 from openmdao.solvers.solver_base import LinearSolver
+from openmdao.solvers.precon import add_pc_options, get_preconditioner
 
 
 class ScipyGMRES(LinearSolver):
@@ -23,12 +25,23 @@ class ScipyGMRES(LinearSolver):
                        desc='Absolute convergence tolerance.')
         opt.add_option('maxiter', 1000,
                        desc='Maximum number of iterations.')
+        opt.add_option('restart', 20, low=1,
+                       desc='Number of iterations between restarts.')
+        opt.add_option('warm_start', False,
+                       desc='Set to True to start each solve from the solution '
+                            'of the previous one for the same variable of '
+                            'interest and mode.')
+        opt.add_option('recycle', 0, low=0,
+                       desc='Number of vectors in a deflation subspace that is '
+                            'kept from one solve to the next (GCRO-DR). Set to '
+                            '0 to use plain GMRES.')
         opt.add_option('mode', 'auto', values=['fwd', 'rev', 'auto'],
                        desc="Derivative calculation mode, set to 'fwd' for " +
                        "forward mode, 'rev' for reverse mode, or 'auto' to " +
                        "let OpenMDAO determine the best mode.")
         opt.add_option('precondition', False,
                        desc='Set to True to turn on preconditioning.')
+        add_pc_options(opt)
 
         # These are defined whenever we call solve to provide info we need in
         # the callback.
@@ -36,6 +49,11 @@ class ScipyGMRES(LinearSolver):
         self.voi = None
         self.mode = None
         self._norm0 = 0.0
+        self._pc = None
+
+        # Previous solutions and recycled subspaces, keyed on (voi, mode)
+        self._prev_sol = {}
+        self._recycle = {}
 
     def solve(self, rhs_mat, system, mode):
         """ Solves the linear system for the problem in self.system. The
@@ -62,6 +80,10 @@ class ScipyGMRES(LinearSolver):
         options = self.options
         self.mode = mode
 
+        if options['precondition'] == True:
+            self._pc = get_preconditioner(options, self._pc)
+            precon = self.precon if self._pc is None else self._apply_pc
+
         unknowns_mat = {}
         for voi, rhs in iteritems(rhs_mat):
 
@@ -76,20 +98,49 @@ class ScipyGMRES(LinearSolver):
             # Support a preconditioner
             if self.options['precondition'] == True:
                 M = LinearOperator((n_edge, n_edge),
-                                   matvec=self.precon,
+                                   matvec=precon,
                                    dtype=float)
             else:
                 M = None
 
+            # scipy's gmres stops when either the absolute or the relative
+            # residual is below tol.
+            tol = options['atol']
+            if self.rel_tol is not None:
+                tol = max(tol, self.rel_tol * min(1.0, np.linalg.norm(rhs)))
+
+            key = (voi, mode)
+            x0 = None
+            if options['warm_start']:
+                x0 = self._prev_sol.get(key)
+                if x0 is not None and x0.size != n_edge:
+                    x0 = None
+
             # Call GMRES to solve the linear system
             self.system = system
             self.iter_count = 0
-            d_unknowns, info = gmres(A, rhs, M=M,
-                                     tol=options['atol'],
-                                     maxiter=options['maxiter'],
-                                     callback=self.monitor)
+            if options['recycle'] > 0:
+                recycle = self._get_recycle(key, system, n_edge)
+                d_unknowns, info, recycle = gcrodr(self.mult, rhs, x0=x0,
+                                                   tol=tol,
+                                                   restart=options['restart'],
+                                                   maxiter=options['maxiter'],
+                                                   psolve=None if M is None else M.matvec,
+                                                   recycle=recycle,
+                                                   k=options['recycle'],
+                                                   callback=self.monitor)
+                self._recycle[key] = (recycle, system._linearize_count)
+            else:
+                d_unknowns, info = gmres(A, rhs, x0=x0, M=M,
+                                         tol=tol,
+                                         restart=options['restart'],
+                                         maxiter=options['maxiter'],
+                                         callback=self.monitor)
             self.system = None
 
+            if options['warm_start']:
+                self._prev_sol[key] = d_unknowns.copy()
+
             if info > 0:
                 msg = "Solve in '{}': gmres failed to converge " \
                                       "after {} iterations"
@@ -115,6 +166,35 @@ class ScipyGMRES(LinearSolver):
 
         return unknowns_mat
 
+    def _get_recycle(self, key, system, n_edge):
+        """ Returns the recycled subspace kept from the last solve for `key`,
+        updated for the current linearization of `system`.
+
+        Args
+        ----
+        key : tuple
+            The variable of interest and the mode.
+
+        system : `System`
+            Parent `System` object.
+
+        n_edge : int
+            Size of the linear system.
+
+        Returns
+        -------
+        tuple of ndarray or None
+            The recycled subspace (U, C).
+        """
+        recycle, linearize_count = self._recycle.get(key, (None, None))
+        if recycle is None or recycle[0].shape[0] != n_edge:
+            return None
+
+        if linearize_count != system._linearize_count:
+            recycle = reproject(self.mult, recycle[0])
+
+        return recycle
+
     def mult(self, arg):
         """ GMRES Callback: applies Jacobian matrix. Mode is determined by the
         system.
@@ -191,6 +271,20 @@ class ScipyGMRES(LinearSolver):
         #print("preconditioned arg", precon_rhs)
         return sol_vec.vec
 
+    def _apply_pc(self, arg):
+        """ GMRES Callback: applies the preconditioner selected by 'pc_type'.
+
+        Args
+        ----
+        arg : ndarray
+            Incoming vector
+
+        Returns
+        -------
+        ndarray : Preconditioned vector
+        """
+        return self._pc.apply(self.system, self.voi, arg, self.mode)
+
     def monitor(self, res):
         """ GMRES Callback: Prints the current residual norm.
 
@@ -209,5 +303,5 @@ class ScipyGMRES(LinearSolver):
                     self._norm0 = 1.0
             self.print_norm('GMRES', self.system.pathname, self.iter_count,
                             f_norm, self._norm0, indent=1, solver='LN')
-            self.iter_count += 1
+        self.iter_count += 1
 
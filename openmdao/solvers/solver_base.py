@@ -84,6 +84,14 @@ class LinearSolver(SolverBase):
     """ Base class for all linear solvers. Inherit from this class to create a
     new custom linear solver."""
 
+    def __init__(self):
+        super(LinearSolver, self).__init__()
+
+        # Tolerance relative to the norm of the right-hand side, which a
+        # nonlinear solver may set for inexact solves. If it is looser than
+        # the solver's own tolerance, iterative solvers use it instead.
+        self.rel_tol = None
+
     def add_recorder(self, recorder):
         """Appends the given recorder to this solver's list of recorders.
 
@@ -0,0 +1,125 @@
+""" Unit test for the Broyden nonlinear solver. """
+
+import unittest
+
+import numpy as np
+
+from openmdao.components.indep_var_comp import IndepVarComp
+from openmdao.core.component import Component
+from openmdao.core.group import Group
+from openmdao.core.problem import Problem
+from openmdao.solvers import Broyden, ScipyGMRES
+from openmdao.test.sellar import SellarNoDerivatives, SellarDerivatives, \
+                                 SellarStateConnection
+from openmdao.test.util import assert_rel_error
+
+
+class CubicState(Component):
+    """ R(x) = A*x + x**3 - b, with derivatives by finite difference."""
+
+    def __init__(self, size):
+        super(CubicState, self).__init__()
+        rand = np.random.RandomState(0)
+        M = rand.random_sample((size, size)) - 0.5
+        self.A = M.dot(M.T) + np.eye(size)
+
+        self.add_param('b', np.zeros(size))
+        self.add_state('x', np.ones(size))
+
+        self.fd_options['force_fd'] = True
+        self.num_apply = 0
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        pass
+
+    def apply_nonlinear(self, params, unknowns, resids):
+        x = unknowns['x']
+        resids['x'] = self.A.dot(x) + x**3 - params['b']
+        self.num_apply += 1
+
+
+class TestBroyden(unittest.TestCase):
+
+    def test_sellar(self):
+
+        for model in (SellarNoDerivatives, SellarDerivatives):
+            for update in ('good', 'bad'):
+                prob = Problem()
+                prob.root = model()
+                prob.root.nl_solver = Broyden()
+                prob.root.nl_solver.options['update'] = update
+                prob.root.nl_solver.options['iprint'] = 1 # so that print_norm is in coverage
+                prob.root.ln_solver = ScipyGMRES()
+                prob.setup(check=False)
+                prob.run()
+
+                assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+                assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+                self.assertEqual(prob.root.nl_solver.jac_count, 1)
+
+    def test_solve_subsystems(self):
+        # solving the subsystems changes the explicit outputs after each
+        # step, which the updates must account for to converge as quickly
+        for update in ('good', 'bad'):
+            iters = {}
+            for solve_subsystems in (True, False):
+                prob = Problem()
+                prob.root = SellarDerivatives()
+                prob.root.nl_solver = Broyden()
+                prob.root.nl_solver.options['update'] = update
+                prob.root.nl_solver.options['solve_subsystems'] = solve_subsystems
+                prob.root.ln_solver = ScipyGMRES()
+                prob.setup(check=False)
+                prob.run()
+
+                assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+                assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+                iters[solve_subsystems] = prob.root.nl_solver.iter_count
+
+            self.assertLessEqual(iters[True], iters[False])
+
+    def test_sellar_state_connection(self):
+
+        prob = Problem()
+        prob.root = SellarStateConnection()
+        prob.root.nl_solver = Broyden()
+        prob.root.nl_solver.options['solve_subsystems'] = False
+        prob.root.ln_solver = ScipyGMRES()
+        prob.setup(check=False)
+        prob.run()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['state_eq.y2_command'], 12.05848819, .00001)
+
+    def test_fd_updates(self):
+
+        size = 10
+        b = np.linspace(1.0, 5.0, size)
+
+        for update in ('good', 'bad'):
+            for memory in (0, 3):
+                prob = Problem(Group())
+                prob.root.add('p', IndepVarComp('b', b))
+                comp = prob.root.add('comp', CubicState(size))
+                prob.root.connect('p.b', 'comp.b')
+                prob.root.nl_solver = Broyden()
+                prob.root.nl_solver.options['update'] = update
+                prob.root.nl_solver.options['memory'] = memory
+                prob.root.ln_solver = ScipyGMRES()
+                prob.setup(check=False)
+                prob.run()
+
+                x = prob['comp.x']
+                assert_rel_error(self, comp.A.dot(x) + x**3, b, 1e-8)
+
+                solver = prob.root.nl_solver
+                self.assertEqual(solver.jac_count, 1)
+                self.assertGreater(solver.iter_count, memory)
+
+                # one finite difference Jacobian with respect to x and b,
+                # plus one residual evaluation per iteration and the first
+                self.assertEqual(comp.num_apply, 2*size + solver.iter_count + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,16 +6,37 @@ import numpy as np
 
 from openmdao.components.exec_comp import ExecComp
 from openmdao.components.indep_var_comp import IndepVarComp
+from openmdao.core.component import Component
 from openmdao.core.group import Group
 from openmdao.core.problem import Problem
 from openmdao.solvers.ln_gauss_seidel import LinearGaussSeidel
-from openmdao.solvers import Newton
+from openmdao.solvers import Newton, ScipyGMRES
 from openmdao.test.sellar import SellarDerivativesGrouped, \
                                  SellarNoDerivatives, SellarDerivatives, \
                                  SellarStateConnection
 from openmdao.test.util import assert_rel_error
 
 
+class ArctanState(Component):
+    """ R(x) = arctan(x - c), for which full Newton steps diverge far from
+    the solution."""
+
+    def __init__(self):
+        super(ArctanState, self).__init__()
+        self.add_param('c', 0.0)
+        self.add_state('x', 10.0)
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        pass
+
+    def apply_nonlinear(self, params, unknowns, resids):
+        resids['x'] = np.arctan(unknowns['x'] - params['c'])
+
+    def jacobian(self, params, unknowns, resids):
+        d = 1.0 / (1.0 + (unknowns['x'] - params['c'])**2)
+        return {('x', 'x'): np.array([[d]]), ('x', 'c'): np.array([[-d]])}
+
+
 class TestNewton(unittest.TestCase):
 
     def test_sellar_grouped(self):
@@ -94,6 +115,71 @@ class TestNewton(unittest.TestCase):
         # Make sure we aren't iterating like crazy
         self.assertLess(prob.root.nl_solver.iter_count, 8)
 
+    def test_jac_reuse(self):
+
+        for jac_reuse, jac_stall in ((3, 1.0), (100, 0.5)):
+            prob = Problem()
+            prob.root = SellarStateConnection()
+            prob.root.nl_solver = Newton()
+            prob.root.nl_solver.options['jac_reuse'] = jac_reuse
+            prob.root.nl_solver.options['jac_stall'] = jac_stall
+
+            prob.setup(check=False)
+            prob.run()
+
+            assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+            assert_rel_error(self, prob['state_eq.y2_command'], 12.05848819, .00001)
+
+            solver = prob.root.nl_solver
+            self.assertLess(solver.jac_count, solver.iter_count)
+
+    def test_eisenstat_walker(self):
+
+        prob = Problem()
+        prob.root = SellarStateConnection()
+        prob.root.nl_solver = Newton()
+        prob.root.nl_solver.options['forcing'] = 'eisenstat_walker'
+        prob.root.ln_solver = ScipyGMRES()
+
+        # keep track of the tolerances the linear solves were given
+        ln_solver = prob.root.ln_solver
+        tols = []
+        solve = ln_solver.solve
+        def tracked(rhs_mat, system, mode):
+            tols.append(ln_solver.rel_tol)
+            return solve(rhs_mat, system, mode)
+        ln_solver.solve = tracked
+
+        prob.setup(check=False)
+        prob.run()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['state_eq.y2_command'], 12.05848819, .00001)
+
+        self.assertEqual(tols[0], 0.1)
+        self.assertIsNone(ln_solver.rel_tol)
+
+    def test_armijo(self):
+
+        iters = {}
+        for line_search in ('backtrack', 'armijo'):
+            prob = Problem(Group())
+            prob.root.add('p', IndepVarComp('c', 2.0))
+            prob.root.add('comp', ArctanState())
+            prob.root.connect('p.c', 'comp.c')
+            prob.root.nl_solver = Newton()
+            prob.root.nl_solver.options['line_search'] = line_search
+            prob.root.nl_solver.options['iprint'] = 2 # so that print_norm is in coverage
+            prob.root.ln_solver = ScipyGMRES()
+
+            prob.setup(check=False)
+            prob.run()
+
+            assert_rel_error(self, prob['comp.x'], 2.0, 1e-8)
+            iters[line_search] = prob.root.nl_solver.iter_count
+
+        self.assertLess(iters['armijo'], iters['backtrack'])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,153 @@
+""" Unit test for the Nonlinear Block Jacobi nonlinear solver. """
+
+import threading
+import unittest
+
+import numpy as np
+
+from openmdao.core.problem import Problem
+from openmdao.core.group import Group
+from openmdao.core.component import Component
+from openmdao.components.indep_var_comp import IndepVarComp
+from openmdao.core.parallel_group import ParallelGroup
+from openmdao.solvers import NLBlockJacobi
+from openmdao.test.sellar import SellarNoDerivatives, SellarDis1, SellarDis2
+from openmdao.test.util import assert_rel_error
+
+
+class SellarParallel(Group):
+    """ Sellar MDA with the disciplines in a `ParallelGroup`, which is
+    converged by block Jacobi."""
+
+    def __init__(self):
+        super(SellarParallel, self).__init__()
+
+        self.add('px', IndepVarComp('x', 1.0), promotes=['*'])
+        self.add('pz', IndepVarComp('z', np.array([5.0, 2.0])), promotes=['*'])
+
+        mda = self.add('mda', ParallelGroup(), promotes=['*'])
+        mda.add('d1', SellarDis1(), promotes=['*'])
+        mda.add('d2', SellarDis2(), promotes=['*'])
+        mda.nl_solver = NLBlockJacobi()
+
+
+class Failing(Component):
+
+    def __init__(self):
+        super(Failing, self).__init__()
+        self.add_param('x', 0.0)
+        self.add_output('y', 0.0)
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        raise RuntimeError("%s failed" % self.pathname)
+
+
+class Handshake(Component):
+    """ Signals that it has started and waits for the other component to
+    start, which only works if they are solved at the same time."""
+
+    def __init__(self, started, other):
+        super(Handshake, self).__init__()
+        self.add_param('x', 0.0)
+        self.add_output('y', 0.0)
+        self.started = started
+        self.other = other
+
+    def is_concurrent(self):
+        return True
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        self.started.set()
+        if not self.other.wait(10.):
+            raise RuntimeError("%s timed out" % self.pathname)
+        unknowns['y'] = params['x'] + 1.0
+
+
+class TestNLBlockJacobi(unittest.TestCase):
+
+    def test_sellar(self):
+
+        for num_threads in (1, 2):
+            prob = Problem()
+            prob.root = SellarNoDerivatives()
+            prob.root.nl_solver = NLBlockJacobi()
+            prob.root.nl_solver.options['num_threads'] = num_threads
+            prob.root.nl_solver.options['atol'] = 1e-9
+            prob.root.nl_solver.options['iprint'] = 1 # so that print_norm is in coverage
+
+            prob.setup(check=False)
+            prob.run()
+
+            assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+            assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+
+    def test_sellar_parallel_group(self):
+
+        prob = Problem()
+        prob.root = SellarParallel()
+        prob.root.mda.nl_solver.options['num_threads'] = 2
+        prob.root.mda.nl_solver.options['atol'] = 1e-9
+
+        prob.setup(check=False)
+        prob.run()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+
+    def test_accel(self):
+
+        iters = {}
+        for accel in ('none', 'aitken', 'anderson'):
+            prob = Problem()
+            prob.root = SellarNoDerivatives()
+            prob.root.nl_solver = NLBlockJacobi()
+            prob.root.nl_solver.options['accel'] = accel
+            prob.root.nl_solver.options['atol'] = 1e-10
+            prob.root.nl_solver.options['rtol'] = 1e-10
+
+            prob.setup(check=False)
+            prob.run()
+
+            assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+            assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+            iters[accel] = prob.root.nl_solver.iter_count
+
+        self.assertLess(iters['anderson'], iters['none'])
+
+    def test_concurrent(self):
+
+        # concurrent children get their own threads, even with one thread
+        prob = Problem()
+        prob.root = SellarNoDerivatives()
+        events = [threading.Event(), threading.Event()]
+        prob.root.add('c1', Handshake(events[0], events[1]))
+        prob.root.add('c2', Handshake(events[1], events[0]))
+        prob.root.connect('c1.y', 'c2.x')
+        prob.root.nl_solver = NLBlockJacobi()
+        prob.root.nl_solver.options['atol'] = 1e-9
+
+        prob.setup(check=False)
+        prob.run()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        self.assertEqual(prob['c2.y'], 2.0)
+
+    def test_thread_error(self):
+
+        prob = Problem()
+        prob.root = SellarNoDerivatives()
+        prob.root.add('fail1', Failing())
+        prob.root.add('fail2', Failing())
+        prob.root.connect('fail1.y', 'fail2.x')
+        prob.root.nl_solver = NLBlockJacobi()
+        prob.root.nl_solver.options['num_threads'] = 3
+
+        prob.setup(check=False)
+        with self.assertRaises(RuntimeError) as cm:
+            prob.run()
+
+        self.assertEqual(str(cm.exception), "fail1 failed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -40,6 +40,78 @@ class TestNLGaussSeidel(unittest.TestCase):
         assert_rel_error(self, prob['y1'], 25.58830273, .00001)
         assert_rel_error(self, prob['y2'], 12.05848819, .00001)
 
+    def test_sellar_accel(self):
+
+        iters = {}
+        for accel in ('none', 'aitken', 'anderson'):
+            prob = Problem()
+            prob.root = SellarNoDerivatives()
+            prob.root.nl_solver.options['atol'] = 1e-10
+            prob.root.nl_solver.options['rtol'] = 1e-10
+            prob.root.nl_solver.options['accel'] = accel
+            prob.root.nl_solver.options['iprint'] = 2 # so that print_norm is in coverage
+
+            prob.setup(check=False)
+            prob.run()
+
+            assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+            assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+            iters[accel] = prob.root.nl_solver.iter_count
+
+            if accel == 'aitken':
+                self.assertNotEqual(prob.root.nl_solver.relax_factor, 1.0)
+            elif accel == 'anderson':
+                self.assertEqual(prob.root.nl_solver.accel_history,
+                                 min(iters[accel] - 2, 5))
+
+        self.assertLess(iters['aitken'], iters['none'])
+        self.assertLess(iters['anderson'], iters['none'])
+
+    def test_sellar_no_apply(self):
+
+        for accel in ('none', 'anderson'):
+            prob = Problem()
+            prob.root = SellarNoDerivatives()
+            prob.root.nl_solver.options['use_apply_nonlinear'] = False
+            prob.root.nl_solver.options['accel'] = accel
+
+            # count the executions of one of the disciplines
+            d1 = prob.root.d1
+            count = [0]
+            solve_nonlinear = d1.solve_nonlinear
+            def counted(params, unknowns, resids):
+                count[0] += 1
+                solve_nonlinear(params, unknowns, resids)
+            d1.solve_nonlinear = counted
+
+            prob.setup(check=False)
+            prob.run()
+
+            assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+            assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+
+            # one execution per iteration, with no extra evaluations just to
+            # compute the residuals
+            self.assertEqual(count[0], prob.root.nl_solver.iter_count)
+
+    def test_accel_option_after_setup(self):
+
+        prob = Problem()
+        prob.root = SellarNoDerivatives()
+        prob.root.nl_solver.options['accel'] = 'aitken'
+        prob.setup(check=False)
+
+        # switching to a different acceleration after setup allocates new
+        # vectors
+        prob.root.nl_solver.options['accel'] = 'anderson'
+        prob.root.nl_solver.options['depth'] = 2
+        prob.run()
+
+        assert_rel_error(self, prob['y1'], 25.58830273, .00001)
+        assert_rel_error(self, prob['y2'], 12.05848819, .00001)
+        self.assertEqual(prob.root.nl_solver._bufs['dF'].shape,
+                         (2, prob.root.unknowns.vec.size))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,180 @@
+""" Unit test for the preconditioners built from the cached Jacobians. """
+
+import unittest
+
+import numpy as np
+
+from openmdao.components.indep_var_comp import IndepVarComp
+from openmdao.core.component import Component
+from openmdao.core.group import Group
+from openmdao.core.problem import Problem
+from openmdao.solvers import ScipyGMRES
+from openmdao.solvers.precon import assemble_jacobian, BlockJacobiPC
+from openmdao.test.sellar import SellarDerivativesGrouped, SellarStateConnection
+from openmdao.test.util import assert_rel_error
+
+
+class LinearBlock(Component):
+    """ R(x) = D*x + C*x_in - b, where D is badly conditioned and C is a
+    weak coupling to another block."""
+
+    def __init__(self, size, seed):
+        super(LinearBlock, self).__init__()
+        rand = np.random.RandomState(seed)
+        Q = np.linalg.qr(rand.standard_normal((size, size)))[0]
+        self.D = Q.dot(np.diag(np.logspace(0, 3, size))).dot(Q.T)
+        self.C = 0.1 * rand.standard_normal((size, size))
+
+        self.add_param('x_in', np.zeros(size))
+        self.add_param('b', np.zeros(size))
+        self.add_state('x', np.zeros(size))
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        pass
+
+    def apply_nonlinear(self, params, unknowns, resids):
+        resids['x'] = self.D.dot(unknowns['x']) + self.C.dot(params['x_in']) - params['b']
+
+    def jacobian(self, params, unknowns, resids):
+        return {('x', 'x'): self.D, ('x', 'x_in'): self.C,
+                ('x', 'b'): -np.eye(self.D.shape[0])}
+
+
+class Ring(Group):
+    """ Blocks coupled in a ring."""
+
+    def __init__(self, nblocks, size):
+        super(Ring, self).__init__()
+        self.add('p', IndepVarComp('b', np.ones(size)))
+        for i in range(nblocks):
+            self.add('blk%d' % i, LinearBlock(size, i))
+            self.connect('p.b', 'blk%d.b' % i)
+            self.connect('blk%d.x' % i, 'blk%d.x_in' % ((i + 1) % nblocks))
+
+        self.ln_solver = ScipyGMRES()
+        self.ln_solver.options['atol'] = 1e-10
+
+
+class Scaled(Component):
+    """ y = 3*x**2 on the first two entries of a source, with units."""
+
+    def __init__(self):
+        super(Scaled, self).__init__()
+        self.add_param('x', np.ones(2), units='m', src_indices=[2, 0])
+        self.add_output('y', np.ones(2), units='m')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        unknowns['y'] = 3.0 * params['x']**2
+
+    def jacobian(self, params, unknowns, resids):
+        return {('y', 'x'): np.diag(6.0 * params['x'])}
+
+
+def _probe(prob):
+    """ Jacobian of the root's linear system, built one column at a time."""
+    solver = prob.root.ln_solver
+    solver.system, solver.mode, solver.voi = prob.root, 'fwd', None
+    n = prob.root.dumat[None].vec.size
+    cols = [solver.mult(col).copy() for col in np.eye(n)]
+    solver.system = None
+    return np.array(cols).T
+
+
+class TestPrecon(unittest.TestCase):
+
+    def test_assemble_jacobian(self):
+
+        prob = Problem(Group())
+        prob.root.add('p', IndepVarComp('x', np.array([1.0, 2.0, 3.0]), units='cm'))
+        prob.root.add('c', Scaled())
+        prob.root.connect('p.x', 'c.x')
+        prob.setup(check=False)
+        prob.run()
+
+        root = prob.root
+        root.jacobian(root.params, root.unknowns, root.resids)
+        A = assemble_jacobian(root).toarray()
+        np.testing.assert_allclose(A, _probe(prob))
+        self.assertNotEqual(A[3, 2], 0.0)
+
+        prob = Problem(SellarStateConnection())
+        prob.setup(check=False)
+        prob.run()
+
+        root = prob.root
+        root.jacobian(root.params, root.unknowns, root.resids)
+        np.testing.assert_allclose(assemble_jacobian(root).toarray(), _probe(prob))
+
+    def test_sellar(self):
+
+        for mode in ('fwd', 'rev'):
+            for pc_type in ('block_jacobi', 'block_gauss_seidel', 'ilu'):
+                prob = Problem(SellarDerivativesGrouped())
+                prob.root.ln_solver = ScipyGMRES()
+                prob.root.ln_solver.options['precondition'] = True
+                prob.root.ln_solver.options['pc_type'] = pc_type
+                prob.setup(check=False)
+                prob.run()
+
+                J = prob.calc_gradient(['x', 'z'], ['obj', 'con1', 'con2'],
+                                       mode=mode, return_format='dict')
+
+                assert_rel_error(self, J['obj']['z'][0][0], 9.61001056, .00001)
+                assert_rel_error(self, J['obj']['z'][0][1], 1.78448534, .00001)
+                assert_rel_error(self, J['obj']['x'][0][0], 2.98061391, .00001)
+                assert_rel_error(self, J['con1']['z'][0][0], -9.61002186, .00001)
+                assert_rel_error(self, J['con2']['x'][0][0], 0.09692762, .00001)
+
+    def test_ring(self):
+
+        iters = {}
+        for mode in ('fwd', 'rev'):
+            for pc_type in ('none', 'block_jacobi', 'block_gauss_seidel', 'ilu'):
+                prob = Problem(Ring(4, 10))
+                if pc_type != 'none':
+                    prob.root.ln_solver.options['precondition'] = True
+                    prob.root.ln_solver.options['pc_type'] = pc_type
+                prob.setup(check=False)
+                prob.run()
+
+                J = prob.calc_gradient(['p.b'], ['blk0.x'], mode=mode)
+                iters[mode, pc_type] = prob.root.ln_solver.iter_count
+
+                A = assemble_jacobian(prob.root).toarray()
+                dx = np.linalg.solve(A, np.eye(A.shape[0])[:, :10])
+                assert_rel_error(self, J, dx[10:20], 1e-6)
+
+            self.assertLess(iters[mode, 'block_jacobi'], iters[mode, 'none'])
+            self.assertLess(iters[mode, 'block_gauss_seidel'], iters[mode, 'block_jacobi'])
+            self.assertLess(iters[mode, 'ilu'], iters[mode, 'none'])
+
+    def test_factor_once(self):
+
+        count = [0]
+        factor = BlockJacobiPC._factor
+
+        def counting_factor(pc, system, voi):
+            count[0] += 1
+            return factor(pc, system, voi)
+
+        prob = Problem(Ring(3, 5))
+        prob.root.ln_solver.options['precondition'] = True
+        prob.root.ln_solver.options['pc_type'] = 'block_jacobi'
+        prob.setup(check=False)
+        prob.run()
+
+        BlockJacobiPC._factor = counting_factor
+        try:
+            # one factorization shared by all the right-hand sides
+            prob.calc_gradient(['p.b'], ['blk0.x', 'blk1.x'], mode='fwd')
+            self.assertEqual(count[0], 1)
+
+            # and a new one after the next linearization
+            prob.calc_gradient(['p.b'], ['blk0.x', 'blk1.x'], mode='rev')
+            self.assertEqual(count[0], 2)
+        finally:
+            BlockJacobiPC._factor = factor
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,7 @@ from openmdao.core.group import Group
 from openmdao.core.problem import Problem
 from openmdao.components.indep_var_comp import IndepVarComp
 from openmdao.components.exec_comp import ExecComp
+from openmdao.core.component import Component
 from openmdao.solvers import ScipyGMRES, DirectSolver
 from openmdao.test.converge_diverge import ConvergeDiverge, SingleDiamond, \
                                            ConvergeDivergeGroups, SingleDiamondGrouped
@@ -17,6 +18,56 @@ from openmdao.test.simple_comps import SimpleCompDerivMatVec, FanOut, FanIn, \
 from openmdao.test.util import assert_rel_error
 
 
+class LinearState(Component):
+    """ R(x) = b - A*x, where A has a few small eigenvalues that restarted
+    GMRES is slow to resolve."""
+
+    def __init__(self, size):
+        super(LinearState, self).__init__()
+        rand = np.random.RandomState(0)
+        eigs = np.hstack((np.logspace(-2, -1, 5), np.linspace(1, 10, size - 5)))
+        self.A = np.diag(eigs) + 0.1 * rand.standard_normal((size, size)) / np.sqrt(size)
+
+        self.add_param('b', np.zeros(size))
+        self.add_state('x', np.zeros(size))
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        pass
+
+    def apply_nonlinear(self, params, unknowns, resids):
+        resids['x'] = params['b'] - self.A.dot(unknowns['x'])
+
+    def jacobian(self, params, unknowns, resids):
+        return {('x', 'x'): -self.A, ('x', 'b'): np.eye(self.A.shape[0])}
+
+
+def _linear_problem(size, **options):
+    """ Returns a problem with a `LinearState`, and a list that counts the
+    GMRES iterations."""
+    prob = Problem(Group())
+    prob.root.add('p', IndepVarComp('b', np.ones(size)))
+    prob.root.add('c', LinearState(size))
+    prob.root.connect('p.b', 'c.b')
+
+    solver = prob.root.ln_solver = ScipyGMRES()
+    solver.options['atol'] = 1e-10
+    for name, val in options.items():
+        solver.options[name] = val
+
+    count = [0]
+    monitor = solver.monitor
+
+    def counting_monitor(res):
+        monitor(res)
+        count[0] += 1
+
+    solver.monitor = counting_monitor
+
+    prob.setup(check=False)
+    prob.run()
+    return prob, count
+
+
 class TestScipyGMRES(unittest.TestCase):
 
     def test_simple_matvec(self):
@@ -475,6 +526,60 @@ class TestScipyGMRESPreconditioner(unittest.TestCase):
         assert_rel_error(self, J['sub3.comp3.y']['p.x'][0][0], 15.0, 1e-6)
 
 
+class TestScipyGMRESReuse(unittest.TestCase):
+
+    def test_restart(self):
+
+        size = 40
+        prob, count = _linear_problem(size)
+        J = prob.calc_gradient(['p.b'], ['c.x'], mode='fwd')
+
+        prob, restart_count = _linear_problem(size, restart=40)
+        assert_rel_error(self, prob.calc_gradient(['p.b'], ['c.x'], mode='fwd'),
+                         J, 1e-6)
+        self.assertLess(restart_count[0], count[0])
+
+    def test_warm_start(self):
+
+        size = 40
+        for mode in ('fwd', 'rev'):
+            prob, count = _linear_problem(size, warm_start=True)
+            A = prob.root.c.A
+
+            J = prob.calc_gradient(['p.b'], ['c.x'], mode=mode)
+            assert_rel_error(self, J, np.linalg.inv(A), 1e-6)
+
+            # the same right-hand side again starts from its solution
+            rhs = np.zeros(2*size)
+            rhs[size + 3] = 1.0
+            sol = prob.root.ln_solver.solve({None: rhs}, prob.root, mode)[None]
+
+            count[0] = 0
+            sol2 = prob.root.ln_solver.solve({None: rhs}, prob.root, mode)[None]
+            assert_rel_error(self, sol2, sol, 1e-8)
+            self.assertLessEqual(count[0], 1)
+
+    def test_recycle(self):
+
+        size = 40
+        prob, count = _linear_problem(size)
+        prob.calc_gradient(['p.b'], ['c.x'], mode='fwd')
+
+        prob, recycle_count = _linear_problem(size, recycle=10)
+        Ainv = np.linalg.inv(prob.root.c.A)
+        for mode in ('fwd', 'rev'):
+            assert_rel_error(self, prob.calc_gradient(['p.b'], ['c.x'], mode=mode),
+                             Ainv, 1e-6)
+            if mode == 'fwd':
+                self.assertLess(recycle_count[0], count[0] / 4)
+
+        # the subspace is kept for a new linearization with a changed operator
+        recycle = prob.root.ln_solver._recycle[None, 'fwd'][0]
+        prob.root.c.A += 0.01 * np.eye(size)
+        J = prob.calc_gradient(['p.b'], ['c.x'], mode='fwd')
+        assert_rel_error(self, J, np.linalg.inv(prob.root.c.A), 1e-6)
+        self.assertIsNot(prob.root.ln_solver._recycle[None, 'fwd'][0], recycle)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,29 +1,63 @@
 """ Surrogate model based on Kriging. """
-from math import log
-
 from openmdao.surrogate_models.surrogate_model import SurrogateModel
 
 # pylint: disable-msg=E0611,F0401
 from numpy import zeros, dot, ones, eye, abs, exp, log10, diagonal,\
-    prod, square, column_stack, ndarray, sqrt, inf, einsum, sum, power
-from numpy.linalg import slogdet, linalg
+    square, column_stack, ndarray, sqrt, inf, einsum, sum, power,\
+    atleast_2d, maximum, outer, newaxis, log, logaddexp, triu_indices, \
+    asarray, arange, concatenate, vstack, triu
+from numpy.random import uniform, choice
+from numpy.linalg import slogdet, linalg, solve
 from numpy.dual import lstsq
-from scipy.linalg import cho_factor, cho_solve
+from scipy.linalg import cho_factor, cho_solve, cholesky, solve_triangular
 from scipy.optimize import minimize
+from scipy.spatial import cKDTree
 from six.moves import range
 
 
 class KrigingSurrogate(SurrogateModel):
     """Surrogate Modeling method based on the simple Kriging interpolation.
-    Predictions are returned as a tuple of mean and RMSE"""
-
-    def __init__(self):
+    Predictions are returned as a tuple of mean and RMSE
+
+    Args
+    ----
+    optimizer : str, optional
+        Optimizer used to find the correlation parameters, either 'COBYLA'
+        or 'L-BFGS-B'. 'L-BFGS-B' uses the analytic gradient of the
+        log-likelihood, so it needs far fewer evaluations when there are
+        many training points.
+
+    num_starts : int, optional
+        Number of starting points for the optimization of the correlation
+        parameters. The first start is at theta = 1 and the others are
+        random points within the bounds.
+    """
+
+    # the scipy optimizers aren't reentrant
+    thread_safe = False
+
+    # largest number of coordinate differences between the points and the
+    # training points that _correlation computes one by one, rather than
+    # through the faster but less accurate expanded distances
+    _direct_size = 2**20
+
+    def __init__(self, optimizer='COBYLA', num_starts=1):
         super(KrigingSurrogate, self).__init__()
 
+        if optimizer not in ('COBYLA', 'L-BFGS-B'):
+            raise ValueError("KrigingSurrogate: optimizer '%s' not supported."
+                             " optimizer must be one of ['COBYLA', 'L-BFGS-B']."
+                             % optimizer)
+
         self.m = 0       # number of independent
         self.n = 0       # number of training points
         self.thetas = zeros(0)
         self.nugget = 0     # nugget smoothing parameter from [Sasena, 2002]
+        self.optimizer = optimizer
+        self.num_starts = num_starts
+
+        # bounds on log10 of the correlation parameters
+        self.theta_bounds = (log10(1e-2), log10(3))
 
         self.R = zeros(0)
         self.R_fact = None
@@ -36,6 +70,24 @@ class KrigingSurrogate(SurrogateModel):
         self.X = zeros(0)
         self.Y = zeros(0)
 
+        # upper triangle indices of R and the squared distances between the
+        # corresponding training points, which don't depend on the thetas.
+        self._triu = None
+        self._sq_dists = zeros(0)
+        self._det_weight = 1.0
+
+    def __getstate__(self):
+        # the distances are only needed to fit the thetas and are as big as
+        # R times the number of inputs, so they aren't worth saving
+        state = self.__dict__.copy()
+        state['_triu'] = None
+        state['_sq_dists'] = zeros(0)
+        return state
+
+    def _cache_params(self):
+        return {'optimizer': self.optimizer, 'num_starts': self.num_starts,
+                'nugget': self.nugget, 'theta_bounds': self.theta_bounds}
+
     def train(self, x, y):
         """
         Train the surrogate model with the given set of inputs and outputs.
@@ -62,68 +114,203 @@ class KrigingSurrogate(SurrogateModel):
         self.X = x
         self.Y = y
 
+        self._triu = triu_indices(self.n, 1)
+        i, j = self._triu
+        self._sq_dists = square(x[i, ...] - x[j, ...])
+
         def _calcll(thetas):
             """ Callback function"""
             self.thetas = thetas
             self._calculate_log_likelihood()
             return -self.log_likelihood
 
+        def _calcll_grad(thetas):
+            """ Callback function that also returns the gradient"""
+            return _calcll(thetas), -self._log_likelihood_grad()
+
+        lower, upper = self.theta_bounds
+
         cons = []
         for i in range(self.m):
-            cons.append({'type': 'ineq', 'fun': lambda logt: logt[i] - log10(1e-2)})  # min
-            cons.append({'type': 'ineq', 'fun': lambda logt: log10(3) - logt[i]})     # max
-
-        self.thetas = minimize(_calcll, zeros(self.m), method='COBYLA',
-                               constraints=cons, tol=1e-8).x
+            cons.append({'type': 'ineq', 'fun': lambda logt, i=i: logt[i] - lower})  # min
+            cons.append({'type': 'ineq', 'fun': lambda logt, i=i: upper - logt[i]})  # max
+
+        best = None
+        for start in range(max(self.num_starts, 1)):
+            if start == 0:
+                x0 = zeros(self.m)
+            else:
+                x0 = uniform(lower, upper, self.m)
+
+            if self.optimizer == 'L-BFGS-B':
+                opt = minimize(_calcll_grad, x0, method='L-BFGS-B', jac=True,
+                               bounds=[self.theta_bounds] * self.m)
+            else:
+                opt = minimize(_calcll, x0, method='COBYLA',
+                               constraints=cons, tol=1e-8)
+
+            if best is None or opt.fun < best.fun:
+                best = opt
+
+        self.thetas = best.x
         self._calculate_log_likelihood()
 
+    def update(self, x, y):
+        """
+        Add training points to the trained model without changing the
+        correlation parameters. The Cholesky factorization of the correlation
+        matrix is extended with the new points, which costs O(n^2 k) for k
+        new points rather than the O(n^3) of refactoring it, and the theta
+        optimization is skipped entirely. Call `train` to refit the thetas.
+
+        Args
+        ----
+        x : array-like
+            New training input locations.
+
+        y : array-like
+            Model responses at the new inputs.
+        """
+        x = atleast_2d(asarray(x, dtype=float))
+        n_old = self.n
+        n = n_old + len(x)
+
+        B = self._correlation(x).T * (1.0 - self.nugget)
+        C = self._correlation(x, x) * (1.0 - self.nugget)
+        diag = arange(len(x))
+        C[diag, diag] = 1.0
+
+        R = zeros((n, n))
+        R[:n_old, :n_old] = self.R
+        R[:n_old, n_old:] = B
+        R[n_old:, :n_old] = B.T
+        R[n_old:, n_old:] = C
+
+        self.X = concatenate([self.X, x])
+        self.Y = concatenate([self.Y, asarray(y, dtype=float)])
+        self.n = n
+        self.R = R
+
+        if self.R_fact is not None:
+            # R = U^T U, so the new factor is [[U, S], [0, U2]] with
+            # U^T S = B and U2^T U2 = C - S^T S
+            U = self.R_fact[0]
+            try:
+                S = solve_triangular(U, B, trans='T')
+                U_new = zeros((n, n))
+                U_new[:n_old, :n_old] = triu(U)
+                U_new[:n_old, n_old:] = S
+                U_new[n_old:, n_old:] = cholesky(C - S.T.dot(S))
+                self.R_fact = (U_new, False)
+            except (linalg.LinAlgError, ValueError):
+                self.R_fact = None
+
+        if self.R_fact is None:
+            try:
+                self.R_fact = cho_factor(R)
+            except (linalg.LinAlgError, ValueError):
+                self.R_fact = None
+
+        # the distances are only needed to fit the thetas, so they are
+        # computed again by the next call to train
+        self._triu = None
+        self._sq_dists = zeros(0)
+
+        self._solve_log_likelihood()
+
     def _calculate_log_likelihood(self):
         """
         Calculates the log-likelihood (up to a constant) for a given
         self.theta.
 
         """
-        R = zeros((self.n, self.n))
-        X, Y = self.X, self.Y
+        n = self.n
+        Y = self.Y
         thetas = power(10., self.thetas)
 
         # exponentially weighted distance formula
-        for i in range(self.n):
-            R[i, i+1:self.n] = exp(-thetas.dot(square(X[i, ...] - X[i+1:self.n, ...]).T))
+        R = zeros((n, n))
+        R[self._triu] = exp(-self._sq_dists.dot(thetas))
 
         R *= (1.0 - self.nugget)
-        R += R.T + eye(self.n)
+        R += R.T + eye(n)
         self.R = R
 
-        one = ones(self.n)
-        rhs = column_stack([Y, one])
         try:
             # Cholesky Decomposition
             self.R_fact = cho_factor(R)
+        except (linalg.LinAlgError, ValueError):
+            self.R_fact = None
+
+        self._solve_log_likelihood()
+
+    def _solve_log_likelihood(self):
+        """
+        Calculates the mean, variance and log-likelihood from self.R and its
+        Cholesky factorization, using linear least squares if there is no
+        factorization.
+        """
+        n = self.n
+        Y = self.Y
+
+        one = ones(n)
+        rhs = column_stack([Y, one])
+        if self.R_fact is not None:
             sol = cho_solve(self.R_fact, rhs)
             solve = lambda x: cho_solve(self.R_fact, x)
-            det_factor = log(abs(prod(diagonal(self.R_fact[0])) ** 2) + 1.e-16)
+            # log(det(R) + 1.e-16), without underflow for large n
+            log_det = 2.0 * sum(log(abs(diagonal(self.R_fact[0]))))
+            det_factor = logaddexp(log_det, log(1.e-16))
+            self._det_weight = exp(log_det - det_factor)
 
-        except (linalg.LinAlgError, ValueError):
+        else:
             # Since Cholesky failed, try linear least squares
-            self.R_fact = None  # reset this to none, so we know not to use Cholesky
             sol = lstsq(self.R, rhs)[0]
             solve = lambda x: lstsq(self.R, x)[0]
             det_factor = slogdet(self.R)[1]
+            self._det_weight = 1.0
 
         self.mu = dot(one, sol[:, :-1]) / dot(one, sol[:, -1])
         y_minus_mu = Y - self.mu
         self.R_solve_ymu = solve(y_minus_mu)
         self.R_solve_one = sol[:, -1]
-        self.sig2 = dot(y_minus_mu.T, self.R_solve_ymu) / self.n
+        self.sig2 = dot(y_minus_mu.T, self.R_solve_ymu) / n
 
         if isinstance(self.sig2, ndarray):
-            self.log_likelihood = -self.n/2. * slogdet(self.sig2)[1] \
+            self.log_likelihood = -n/2. * slogdet(self.sig2)[1] \
                                   - 1./2.*det_factor
         else:
-            self.log_likelihood = -self.n/2. * log(self.sig2) \
+            self.log_likelihood = -n/2. * log(self.sig2) \
                                   - 1./2.*det_factor
 
+    def _log_likelihood_grad(self):
+        """
+        Returns the gradient of the log-likelihood with respect to
+        log10 of the thetas, using the values computed by the last call to
+        `_calculate_log_likelihood`.
+        """
+        n = self.n
+        A = self.R_solve_ymu
+
+        if self.R_fact is not None:
+            R_inv = cho_solve(self.R_fact, eye(n))
+        else:
+            R_inv = lstsq(self.R, eye(n))[0]
+
+        # The mean and variance are maximum likelihood estimates, so only
+        # the change in R matters: dL = 1/2 sum(dR * (A sig2^-1 A^T - w R^-1)),
+        # where w accounts for the small constant added to det(R).
+        if isinstance(self.sig2, ndarray):
+            M = A.dot(lstsq(self.sig2, A.T)[0])
+        else:
+            M = outer(A, A) / self.sig2
+        M -= self._det_weight * R_inv
+
+        # dR_ij/dtheta_k = -R_ij * sq_dist_ijk, and R is symmetric
+        weights = M[self._triu] * self.R[self._triu]
+        thetas = power(10., self.thetas)
+        return -log(10.) * thetas * weights.dot(self._sq_dists)
+
     def predict(self, x):
         """
         Calculates a predicted value of the response based on the current
@@ -180,6 +367,105 @@ class KrigingSurrogate(SurrogateModel):
         jac = gradr.dot(self.R_solve_ymu).T
         return jac
 
+    def _correlation(self, x, X=None):
+        """
+        Returns the correlation between each of the points in `x` and each of
+        the training points, or the points in `X` if given, as an array of
+        shape (num points, n).
+        """
+        if X is None:
+            X = self.X
+        sqrt_thetas = sqrt(power(10., self.thetas))
+        xs = x * sqrt_thetas
+        Xs = X * sqrt_thetas
+
+        if len(xs) * Xs.size <= self._direct_size:
+            # the differences are exact near the training points, where the
+            # RMSE depends on the correlations being very close to 1
+            return exp(-sum(square(xs[:, newaxis, :] - Xs), axis=2))
+
+        # the weighted squared distances, expanded so that the cross term is
+        # a single matrix product
+        dist = sum(square(xs), axis=1)[:, newaxis] + sum(square(Xs), axis=1) \
+            - 2.0 * xs.dot(Xs.T)
+        return exp(-maximum(dist, 0.0))
+
+    def predict_batch(self, x):
+        """
+        Calculates predicted values of the response at several points.
+
+        Args
+        ----
+        x : array-like
+            Points at which the surrogate is evaluated, one per row.
+
+        Returns
+        -------
+        tuple of ndarrays
+            The predicted mean and RMSE at each point. The RMSE of each output
+            only uses its own variance.
+        """
+        super(KrigingSurrogate, self).predict(x)
+
+        x = atleast_2d(x)
+        r = self._correlation(x)
+
+        if self.R_fact is not None:
+            # Cholesky Decomposition
+            sol = cho_solve(self.R_fact, r.T)
+        else:
+            # Linear Least Squares
+            sol = lstsq(self.R, r.T)[0]
+
+        f = self.mu + r.dot(self.R_solve_ymu)
+        term1 = einsum('ij,ji->i', r, sol)
+
+        # Note: sum(sol) should be 1, since Kriging is an unbiased
+        # estimator. This measures the effect of numerical instabilities.
+        bias = (1.0 - sum(sol, axis=0)) ** 2. / sum(self.R_solve_one)
+
+        if isinstance(self.sig2, ndarray):
+            mse = outer(1.0 - term1 + bias, diagonal(self.sig2))
+        else:
+            mse = self.sig2 * (1.0 - term1 + bias)
+
+        return f, sqrt(abs(mse))
+
+    def jacobian_batch(self, x):
+        """
+        Calculates the jacobian of the Kriging surface at several points.
+
+        Args
+        ----
+        x : array-like
+            Points at which the surrogate Jacobian is evaluated, one per row.
+
+        Returns
+        -------
+        ndarray
+            Array of shape (num points, num outputs, num inputs).
+        """
+        x = atleast_2d(x)
+        thetas = power(10., self.thetas)
+        r = self._correlation(x)
+
+        W = self.R_solve_ymu
+        if W.ndim == 1:
+            W = W[:, newaxis]
+        npts, nout = x.shape[0], W.shape[1]
+
+        # sum over the training points j of r[p, j] * (x[p] - X[j]) * W[j],
+        # split so that each part is a matrix product
+        rW = r.dot(W)
+        rXW = r.dot((self.X[:, :, newaxis] * W[:, newaxis, :]).reshape(self.n, -1))
+        rXW = rXW.reshape(npts, self.m, nout).transpose(0, 2, 1)
+
+        jac = -2.0 * thetas * (x[:, newaxis, :] * rW[:, :, newaxis] - rXW)
+
+        if self.R_solve_ymu.ndim == 1:
+            return jac[:, 0, :]
+        return jac
+
 
 class FloatKrigingSurrogate(KrigingSurrogate):
     """Surrogate model based on the simple Kriging interpolation. Predictions are returned as floats,
@@ -188,3 +474,267 @@ class FloatKrigingSurrogate(KrigingSurrogate):
     def predict(self, x):
         dist = super(FloatKrigingSurrogate, self).predict(x)
         return dist[0]  # mean value
+
+    def predict_batch(self, x):
+        dist = super(FloatKrigingSurrogate, self).predict_batch(x)
+        return dist[0]  # mean values
+
+
+class LocalKrigingSurrogate(KrigingSurrogate):
+    """Approximate Kriging surrogate for large training sets. The correlation
+    parameters and process variance are fit by maximum likelihood on a random
+    subset of the training points, and each prediction is then made by
+    ordinary Kriging on just the `num_neighbors` training points nearest to
+    it, found with a kd-tree. Training takes bounded time and O(n) memory
+    instead of the O(n^3) time and O(n^2) memory of `KrigingSurrogate`, and
+    each prediction costs O(num_neighbors^3) regardless of n.
+
+    The price is accuracy: the predicted mean, RMSE and jacobian only use
+    local information, and they jump slightly wherever the set of nearest
+    neighbors changes. More neighbors make the surface smoother and closer to
+    full Kriging, at a cubic cost per prediction. A larger `num_fit_points`
+    gives better correlation parameters, at a cubic cost in training time.
+    Predictions are returned as a tuple of mean and RMSE.
+
+    Args
+    ----
+    num_neighbors : int, optional
+        Number of nearest training points used for each prediction.
+
+    num_fit_points : int, optional
+        Maximum number of training points used to fit the correlation
+        parameters.
+
+    optimizer : str, optional
+        Optimizer used to find the correlation parameters, either 'COBYLA'
+        or 'L-BFGS-B'.
+
+    num_starts : int, optional
+        Number of starting points for the optimization of the correlation
+        parameters.
+    """
+
+    # number of points whose neighborhoods are solved together, which bounds
+    # the memory used by predict_batch and jacobian_batch
+    _chunk_size = 1000
+
+    def __init__(self, num_neighbors=50, num_fit_points=500,
+                 optimizer='COBYLA', num_starts=1):
+        super(LocalKrigingSurrogate, self).__init__(optimizer=optimizer,
+                                                    num_starts=num_starts)
+        self.num_neighbors = num_neighbors
+        self.num_fit_points = num_fit_points
+        self._tree = None
+
+    def _cache_params(self):
+        params = super(LocalKrigingSurrogate, self)._cache_params()
+        params['num_neighbors'] = self.num_neighbors
+        params['num_fit_points'] = self.num_fit_points
+        return params
+
+    def train(self, x, y):
+        """
+        Train the surrogate model with the given set of inputs and outputs.
+
+        Args
+        ----
+        x : array-like
+            Training input locations
+
+        y : array-like
+            Model responses at given inputs.
+        """
+        x = asarray(x, dtype=float)
+        y = asarray(y, dtype=float)
+        n = len(x)
+
+        if n > self.num_fit_points:
+            subset = choice(n, self.num_fit_points, replace=False)
+            super(LocalKrigingSurrogate, self).train(x[subset], y[subset])
+        else:
+            super(LocalKrigingSurrogate, self).train(x, y)
+
+        # only the fitted parameters are needed from the subset
+        self.R = zeros(0)
+        self.R_fact = None
+        self.R_solve_ymu = zeros(0)
+        self.R_solve_one = zeros(0)
+        self._sq_dists = zeros(0)
+        self._triu = None
+
+        self.n = n
+        self.X = x
+        self.Y = y
+        self._tree = cKDTree(x)
+
+    def update(self, x, y):
+        """
+        Add training points to the trained model without changing the
+        correlation parameters. This just rebuilds the kd-tree.
+
+        Args
+        ----
+        x : array-like
+            New training input locations.
+
+        y : array-like
+            Model responses at the new inputs.
+        """
+        self.X = concatenate([self.X, atleast_2d(asarray(x, dtype=float))])
+        self.Y = concatenate([self.Y, asarray(y, dtype=float)])
+        self.n = len(self.X)
+        self._tree = cKDTree(self.X)
+
+    def predict(self, x):
+        """
+        Calculates a predicted value of the response based on the current
+        trained model for the supplied list of inputs.
+
+        Args
+        ----
+        x : array-like
+            Point at which the surrogate is evaluated.
+        """
+        f, rmse = self.predict_batch(x)
+        return f[0], rmse[0]
+
+    def jacobian(self, x):
+        """
+        Calculates the jacobian of the Kriging surface at the requested point.
+
+        Args
+        ----
+        x : array-like
+            Point at which the surrogate Jacobian is evaluated.
+        """
+        return self.jacobian_batch(x)[0]
+
+    def predict_batch(self, x):
+        """
+        Calculates predicted values of the response at several points.
+
+        Args
+        ----
+        x : array-like
+            Points at which the surrogate is evaluated, one per row.
+
+        Returns
+        -------
+        tuple of ndarrays
+            The predicted mean and RMSE at each point.
+        """
+        SurrogateModel.predict(self, x)
+
+        x = atleast_2d(x)
+        f = []
+        rmse = []
+        for start in range(0, len(x), self._chunk_size):
+            fc, rmsec, _, _, _ = self._local_solve(x[start:start+self._chunk_size])
+            f.append(fc)
+            rmse.append(rmsec)
+
+        return self._shape_outputs(vstack(f)), self._shape_outputs(vstack(rmse))
+
+    def jacobian_batch(self, x):
+        """
+        Calculates the jacobian of the Kriging surface at several points.
+
+        Args
+        ----
+        x : array-like
+            Points at which the surrogate Jacobian is evaluated, one per row.
+
+        Returns
+        -------
+        ndarray
+            Array of shape (num points, num outputs, num inputs).
+        """
+        x = atleast_2d(x)
+        thetas = power(10., self.thetas)
+
+        jacs = []
+        for start in range(0, len(x), self._chunk_size):
+            xc = x[start:start+self._chunk_size]
+            _, _, Xn, r, W = self._local_solve(xc)
+
+            # d r_j / d x = -2 thetas (x - X_j) r_j
+            diff = xc[:, newaxis, :] - Xn
+            jacs.append(-2.0 * thetas * einsum('pj,pjk,pjo->pok', r, diff, W))
+
+        jac = vstack(jacs)
+        if self.Y.ndim == 1:
+            return jac[:, 0, :]
+        return jac
+
+    def _local_solve(self, x):
+        """
+        Solves the ordinary Kriging system on the neighborhood of each
+        point in `x`.
+
+        Returns
+        -------
+        tuple
+            The predicted means and RMSEs, shaped (num points, num outputs),
+            then for each point its neighbors, their correlations with the
+            point, and the Kriging weights R^-1 (Y - mu) of the neighborhood.
+        """
+        k = min(self.num_neighbors, self.n)
+        npts = len(x)
+
+        idx = self._tree.query(x, k=k)[1].reshape(npts, k)
+        Xn = self.X[idx]
+        Yn = self.Y[idx].reshape(npts, k, -1)
+        nout = Yn.shape[2]
+
+        sqrt_thetas = sqrt(power(10., self.thetas))
+        xs = x * sqrt_thetas
+        Xs = Xn * sqrt_thetas
+
+        # correlation between the neighbors, and between them and x
+        sq = sum(square(Xs), axis=2)
+        dist = sq[:, :, newaxis] + sq[:, newaxis, :] \
+            - 2.0 * einsum('pik,pjk->pij', Xs, Xs)
+        R = exp(-maximum(dist, 0.0)) * (1.0 - self.nugget)
+        diag = arange(k)
+        R[:, diag, diag] = 1.0
+        r = exp(-maximum(sum(square(xs[:, newaxis, :] - Xs), axis=2), 0.0))
+
+        rhs = concatenate([r[:, :, newaxis], Yn, ones((npts, k, 1))], axis=2)
+        sol = solve(R, rhs)
+        R_solve_r = sol[:, :, 0]
+        R_solve_y = sol[:, :, 1:-1]
+        R_solve_one = sol[:, :, -1]
+
+        mu = sum(R_solve_y, axis=1) / sum(R_solve_one, axis=1)[:, newaxis]
+        W = R_solve_y - R_solve_one[:, :, newaxis] * mu[:, newaxis, :]
+
+        f = mu + einsum('pj,pjo->po', r, W)
+        term1 = sum(r * R_solve_r, axis=1)
+        bias = (1.0 - sum(R_solve_r, axis=1)) ** 2. / sum(R_solve_one, axis=1)
+
+        if isinstance(self.sig2, ndarray):
+            sig2 = diagonal(atleast_2d(self.sig2))
+        else:
+            sig2 = ones(nout) * self.sig2
+        mse = outer(1.0 - term1 + bias, sig2)
+
+        return f, sqrt(abs(mse)), Xn, r, W
+
+    def _shape_outputs(self, values):
+        """ Drops the output axis when the training outputs are 1D."""
+        if self.Y.ndim == 1:
+            return values[:, 0]
+        return values
+
+
+class FloatLocalKrigingSurrogate(LocalKrigingSurrogate):
+    """Approximate Kriging surrogate for large training sets. Predictions are
+    returned as floats, which are the mean of the model's prediction."""
+
+    def predict(self, x):
+        dist = super(FloatLocalKrigingSurrogate, self).predict(x)
+        return dist[0]  # mean value
+
+    def predict_batch(self, x):
+        dist = super(FloatLocalKrigingSurrogate, self).predict_batch(x)
+        return dist[0]  # mean values
@@ -13,6 +13,9 @@ from scikit-learn package here to avoid scikit-learn dependency.
 ISAE/DMSM - ONERA/DCPS
 """
 
+import multiprocessing
+from multiprocessing import Pool
+
 import numpy as np
 from numpy import atleast_2d as array2d
 
@@ -132,16 +135,10 @@ D: array with shape (n_samples * (n_samples - 1) / 2, n_features)
 """
     if Y is None:
         X = array2d(X)
-        n_samples, n_features = X.shape
-        n_nonzero_cross_dist = n_samples * (n_samples - 1) // 2
-        D = np.zeros((n_nonzero_cross_dist, n_features))
-        ll_1 = 0
-        for k in range(n_samples - 1):
-            ll_0 = ll_1
-            ll_1 = ll_0 + n_samples - k - 1
-            D[ll_0:ll_1] = np.abs(X[k] - X[(k + 1):])
+        n_samples = X.shape[0]
+        i, j = np.triu_indices(n_samples, 1)
 
-        return D
+        return np.abs(X[i] - X[j])
 
     else:
         X = array2d(X)
@@ -152,15 +149,9 @@ D: array with shape (n_samples * (n_samples - 1) / 2, n_features)
             raise ValueError("X and Y must have the same dimensions.")
         n_features = n_features_X
 
-        n_nonzero_cross_dist = n_samples_X * n_samples_Y
-        D = np.zeros((n_nonzero_cross_dist, n_features))
-        ll_1 = 0
-        for k in range(n_samples_X):
-            ll_0 = ll_1
-            ll_1 = ll_0 + n_samples_Y# - k - 1
-            D[ll_0:ll_1] = np.abs(X[k] - Y)
+        D = np.abs(X[:, np.newaxis, :] - Y[np.newaxis, :, :])
 
-        return D
+        return D.reshape(n_samples_X * n_samples_Y, n_features)
 
 
 class MultiFiCoKriging(object):
@@ -224,6 +215,24 @@ thetaU: double, array_like or list, optional
     for all levels of code.
     if list: a list of nlevel arrays specifying value for each level
 
+optimizer: string, optional
+    Optimizer used for the maximum likelihood estimation, either 'COBYLA'
+    or 'L-BFGS-B'. 'L-BFGS-B' uses the analytic gradient of the reduced
+    likelihood function, so it needs far fewer evaluations when there are
+    many features.
+    Default is 'COBYLA'.
+
+num_starts: int, optional
+    Number of starting points for the maximum likelihood estimation. The
+    first start is at theta0 and the others are random points within the
+    bounds. The start with the lowest reduced likelihood function value is
+    kept, or the earliest one in case of a tie.
+    Default is 1.
+
+num_workers: int, optional
+    Number of processes used to run the starts in parallel.
+    Default is 1.
+
 
 Attributes
 ----------
@@ -290,8 +299,11 @@ References
         'constant': constant_regression,
         'linear': linear_regression}
 
+    _optimizers = ('COBYLA', 'L-BFGS-B')
+
     def __init__(self, regr='constant', rho_regr='constant',
-                 theta=None, theta0=None, thetaL=None, thetaU=None):
+                 theta=None, theta0=None, thetaL=None, thetaU=None,
+                 optimizer='COBYLA', num_starts=1, num_workers=1):
 
         self.corr     = squared_exponential_correlation
         self.regr     = regr
@@ -300,20 +312,33 @@ References
         self.theta0 = theta0
         self.thetaL = thetaL
         self.thetaU = thetaU
+        self.optimizer = optimizer
+        self.num_starts = num_starts
+        self.num_workers = num_workers
 
         self._nfev = 0
 
+    def _corr_values(self, lvl, theta):
+        """
+        Returns the correlations between each pair of samples of the
+        specified level, in the order of the cached squared distances.
+        """
+        theta = np.ravel(theta)
+        sq_D = self._sq_D[lvl]
+        if theta.size == 1:
+            return np.exp(-theta[0] * np.sum(sq_D, axis=1))
+        return np.exp(-sq_D.dot(theta))
+
     def _build_R(self, lvl, theta):
         """
         Builds the correlation matrix with given theta for the specified level.
         """
 
-        D = self.D[lvl]
         n_samples = self.n_samples[lvl]
 
         R = np.eye(n_samples) * (1. + NUGGET)
 
-        corr = squareform(self.corr(theta, D))
+        corr = squareform(self._corr_values(lvl, theta))
         R = R + corr
 
         return R
@@ -360,6 +385,7 @@ tol: float
         self.beta_regr = nlevel*[None]
         self.C = nlevel*[0]
         self.D = nlevel*[0]
+        self._sq_D = nlevel*[None]
         self.F = nlevel*[0]
         self.p = nlevel*[0]
         self.q = nlevel*[0]
@@ -384,6 +410,9 @@ tol: float
             if (np.min(np.sum(self.D[lvl], axis=1)) == 0.):
                 raise Exception("Multiple input features cannot have the same"
                                 " value.")
+            # the squared distances don't depend on theta, so they're
+            # computed once for all likelihood evaluations
+            self._sq_D[lvl] = np.square(self.D[lvl])
 
             # Regression matrix and parameters
             self.F[lvl] = self.regr(X[lvl])
@@ -423,7 +452,10 @@ tol: float
                 # Maximum Likelihood Estimation of the parameters
                 sol = self._max_rlf(lvl=lvl, initial_range=initial_range, tol=tol)
                 self.theta[lvl] = sol['theta']
-                self.rlf_value[lvl] = sol['rlf_value']
+
+                # the model parameters are those of the last evaluation,
+                # which may not have been at the optimum
+                self.rlf_value[lvl] = self.rlf(lvl=lvl)
 
                 if np.isinf(self.rlf_value[lvl]):
                     raise Exception("Bad parameter region. "
@@ -525,6 +557,36 @@ rlf_value: double
 
         return rlf_value
 
+    def _rlf_grad(self, lvl, theta):
+        """
+        Returns the negative reduced likelihood function value for the given
+        autocorrelation parameters theta, and its gradient with respect to
+        log10(theta).
+        """
+        rlf_value = self.rlf(lvl=lvl, theta=theta)
+
+        theta = np.ravel(theta)
+        if rlf_value == 1e20:
+            return rlf_value, np.zeros(theta.size)
+
+        C = self.C[lvl]
+        n_samples = self.n_samples[lvl]
+
+        # beta and sigma2 are the GLS estimates, so only the change in R
+        # matters: d(rlf) = sum(dR * (R^-1 - a a^T / sigma2)) / ln(10),
+        # where a = R^-1 (y - F beta).
+        a = solve_triangular(C.T, self._err, lower=False)
+        M = linalg.cho_solve((C, True), np.eye(n_samples))
+        M -= np.dot(a, a.T) / self.sigma2[lvl]
+
+        # dR_ij/dtheta_k = -R_ij * D_ijk^2, and R is symmetric
+        i, j = np.triu_indices(n_samples, 1)
+        weights = M[i, j] * self._corr_values(lvl, theta)
+        sq_D = self._sq_D[lvl]
+        if theta.size == 1:
+            sq_D = np.sum(sq_D, axis=1, keepdims=True)
+
+        return rlf_value, -2. * theta * weights.dot(sq_D)
 
     def _max_rlf(self, lvl, initial_range, tol):
         """
@@ -558,32 +620,37 @@ res: dict
     res['rlf_value']: optimal value for likelihood
 """
         # Initialize input
-        thetaL = self.thetaL[lvl]
-        thetaU = self.thetaU[lvl]
-
-        def rlf_transform(x):
-            return self.rlf(theta=10.**x, lvl=lvl)
-
-        # Use specified starting point as first guess
-        theta0 = self.theta0[lvl]
-        x0 = np.log10(theta0[0])
-
-        constraints = []
-        for i in range(theta0.size):
-            constraints.append({'type': 'ineq', 'fun': lambda log10t,i=i:
-                                log10t[i] - np.log10(thetaL[0][i])})
-            constraints.append({'type': 'ineq', 'fun': lambda log10t,i=i:
-                                np.log10(thetaU[0][i]) - log10t[i]})
-
-        constraints = tuple(constraints)
-        sol = minimize(rlf_transform, x0, method='COBYLA',
-                       constraints=constraints,
-                       options={'rhobeg': initial_range,
-                                'tol': tol, 'disp': 0})
+        lower = np.log10(self.thetaL[lvl][0])
+        upper = np.log10(self.thetaU[lvl][0])
+
+        # Use specified starting point as first guess. The other starting
+        # points are drawn before any optimization is run, so the result
+        # doesn't depend on the number of workers.
+        starts = [np.log10(self.theta0[lvl][0])]
+        for i in range(1, max(self.num_starts, 1)):
+            starts.append(np.random.uniform(lower, upper))
+
+        num_workers = min(self.num_workers, len(starts))
+
+        # worker processes can't start processes of their own
+        if num_workers > 1 and not multiprocessing.current_process().daemon:
+            pool = Pool(num_workers, initializer=_init_rlf_worker,
+                        initargs=(self,))
+            try:
+                results = pool.map(_minimize_rlf,
+                                   [(None, lvl, x0, initial_range, tol)
+                                    for x0 in starts])
+            finally:
+                pool.terminate()
+                pool.join()
+        else:
+            results = [_minimize_rlf((self, lvl, x0, initial_range, tol))
+                       for x0 in starts]
 
-        log10_optimal_x = sol['x']
-        optimal_rlf_value = sol['fun']
-        self._nfev += sol['nfev']
+        # the earliest start wins a tie
+        best = min(range(len(results)), key=lambda i: (results[i][1], i))
+        log10_optimal_x, optimal_rlf_value = results[best][:2]
+        self._nfev += sum(nfev for _, _, nfev in results)
 
         optimal_theta = 10. ** log10_optimal_x
 
@@ -593,6 +660,45 @@ res: dict
 
         return res
 
+    def _minimize_rlf(self, lvl, x0, initial_range, tol):
+        """
+        Minimizes the negative reduced likelihood function of the given level
+        from the starting point x0, in log10(theta).
+
+        Returns
+        -------
+
+        tuple
+            log10 of the optimal theta, the optimal value and the number of
+            function evaluations.
+        """
+        lower = np.log10(self.thetaL[lvl][0])
+        upper = np.log10(self.thetaU[lvl][0])
+
+        if self.optimizer == 'L-BFGS-B':
+            sol = minimize(lambda x: self._rlf_grad(theta=10.**x, lvl=lvl),
+                           x0, method='L-BFGS-B', jac=True,
+                           bounds=list(zip(lower, upper)),
+                           options={'ftol': tol})
+        else:
+            def rlf_transform(x):
+                return self.rlf(theta=10.**x, lvl=lvl)
+
+            constraints = []
+            for i in range(x0.size):
+                constraints.append({'type': 'ineq', 'fun': lambda log10t,i=i:
+                                    log10t[i] - lower[i]})
+                constraints.append({'type': 'ineq', 'fun': lambda log10t,i=i:
+                                    upper[i] - log10t[i]})
+
+            constraints = tuple(constraints)
+            sol = minimize(rlf_transform, x0, method='COBYLA',
+                           constraints=constraints,
+                           options={'rhobeg': initial_range,
+                                    'tol': tol, 'disp': 0})
+
+        return sol['x'], sol['fun'], sol['nfev']
+
 
     def predict(self, X, eval_MSE=True):
         """
@@ -760,6 +866,10 @@ MSE: array_like, optional (if eval_MSE is True)
 
     def _check_params(self):
 
+        if self.optimizer not in self._optimizers:
+            raise ValueError("optimizer should be one of %s, %s was given."
+                             % (list(self._optimizers), self.optimizer))
+
         # Check regression model
         if not callable(self.regr):
             if self.regr in self._regression_types:
@@ -817,21 +927,64 @@ MSE: array_like, optional (if eval_MSE is True)
         return
 
 
+# model whose likelihood is maximized in a worker process
+_worker_model = None
+
+
+def _init_rlf_worker(model):
+    global _worker_model
+    _worker_model = model
+
+
+def _minimize_rlf(job):
+    """
+    Runs one start of the maximum likelihood estimation, in a worker process
+    if no model is given.
+    """
+    model, lvl, x0, initial_range, tol = job
+    if model is None:
+        model = _worker_model
+    return model._minimize_rlf(lvl, x0, initial_range, tol)
+
+
 class MultiFiCoKrigingSurrogate(MultiFiSurrogateModel):
     """
     OpenMDAO adapter of multi-fidelity recursive cokriging method described
     in [LeGratiet2013]. See MultiFiCoKriging class.
     """
 
+    # the scipy optimizers aren't reentrant
+    thread_safe = False
+
     def __init__(self, regr='constant', rho_regr='constant',
                  theta=None, theta0=None, thetaL=None, thetaU=None,
-                 tolerance=TOLERANCE_DEFAULT, initial_range=INITIAL_RANGE_DEFAULT):
+                 tolerance=TOLERANCE_DEFAULT, initial_range=INITIAL_RANGE_DEFAULT,
+                 optimizer='COBYLA', num_starts=1, num_workers=1):
         super(MultiFiCoKrigingSurrogate, self).__init__()
 
         self.tolerance=tolerance
         self.initial_range=initial_range
         self.model = MultiFiCoKriging(regr=regr,rho_regr=rho_regr, theta=theta,
-                                      theta0=theta0, thetaL=thetaL, thetaU=thetaU)
+                                      theta0=theta0, thetaL=thetaL, thetaU=thetaU,
+                                      optimizer=optimizer, num_starts=num_starts,
+                                      num_workers=num_workers)
+
+        # fitting changes some of the model's attributes, so keep the
+        # settings it was created with
+        self._settings = {'regr': regr, 'rho_regr': rho_regr, 'theta': theta,
+                          'theta0': theta0, 'thetaL': thetaL,
+                          'thetaU': thetaU, 'optimizer': optimizer,
+                          'num_starts': num_starts}
+
+    def _cache_params(self):
+        params = dict(self._settings)
+        for name in ('regr', 'rho_regr'):
+            if callable(params[name]):
+                params[name] = '%s.%s' % (params[name].__module__,
+                                          params[name].__name__)
+        params['tolerance'] = self.tolerance
+        params['initial_range'] = self.initial_range
+        return params
 
     def predict(self, new_x):
         """Calculates a predicted value of the response based on the current
@@ -840,6 +993,13 @@ class MultiFiCoKrigingSurrogate(MultiFiSurrogateModel):
         Y_pred, MSE = self.model.predict([new_x])
         return Y_pred, np.sqrt(np.abs(MSE))
 
+    def predict_batch(self, x):
+        """Calculates predicted values of the response at several points,
+        given one per row of `x`.
+        """
+        Y_pred, MSE = self.model.predict(x)
+        return Y_pred, np.sqrt(np.abs(MSE))
+
     def train_multifi(self,X,Y):
         """Train the surrogate model with the given set of inputs and outputs.
         """
@@ -867,6 +1027,10 @@ class FloatMultiFiCoKrigingSurrogate(MultiFiCoKrigingSurrogate):
         dist = super(FloatMultiFiCoKrigingSurrogate, self).predict(new_x)
         return dist.mu
 
+    def predict_batch(self, x):
+        dist = super(FloatMultiFiCoKrigingSurrogate, self).predict_batch(x)
+        return dist[0]  # mean values
+
 
 if __name__ == "__main__":
     import doctest
@@ -2,6 +2,9 @@
 # https://github.com/SMarone/NDInterp
 
 from collections import OrderedDict
+
+import numpy as np
+
 from openmdao.surrogate_models.surrogate_model import SurrogateModel
 from openmdao.surrogate_models.nn_interpolators.linear_interpolator import \
     LinearInterpolator
@@ -48,6 +51,11 @@ class NearestNeighbor(SurrogateModel):
         self.interpolant_type = interpolant_type
         self.interpolant = None
 
+    def _cache_params(self):
+        params = dict(self.interpolant_init_args)
+        params['interpolant_type'] = self.interpolant_type
+        return params
+
     def train(self, x, y):
         """
         Train the surrogate model with the given set of inputs and outputs.
@@ -63,6 +71,22 @@ class NearestNeighbor(SurrogateModel):
         super(NearestNeighbor, self).train(x, y)
         self.interpolant = _interpolators[self.interpolant_type](x, y, **self.interpolant_init_args)
 
+    def update(self, x, y):
+        """
+        Add training points to the trained interpolant, without
+        renormalizing the existing training data.
+
+        Args
+        ----
+        x : array-like
+            New training input locations.
+
+        y : array-like
+            Model responses at the new inputs.
+        """
+        x = np.atleast_2d(x)
+        self.interpolant.add_points(x, np.asarray(y).reshape(x.shape[0], -1))
+
     def predict(self, x, **kwargs):
         """
         Calculates a predicted value of the response based on the current
@@ -95,3 +119,44 @@ class NearestNeighbor(SurrogateModel):
         if jac.shape[0] == 1 and len(jac.shape) > 2:
             return jac[0, ...]
         return jac
+
+    def predict_batch(self, x, **kwargs):
+        """
+        Calculates predicted values of the response at several points.
+
+        Args
+        ----
+        x : array-like
+            Points at which the surrogate is evaluated, one per row.
+
+        kwargs :
+            Additional keyword arguments passed to the interpolant.
+
+        Returns
+        -------
+        ndarray
+            Array of shape (num points, num outputs).
+        """
+        super(NearestNeighbor, self).predict(x)
+        return self.interpolant(np.atleast_2d(x), **kwargs)
+
+    def jacobian_batch(self, x, **kwargs):
+        """
+        Calculates the jacobian of the interpolant at several points.
+
+        Args
+        ----
+        x : array-like
+            Points at which the surrogate Jacobian is evaluated, one per row.
+
+        kwargs :
+            Additional keyword arguments passed to the interpolant.
+
+        Returns
+        -------
+        ndarray
+            Array of shape (num points, num outputs, num inputs).
+        """
+        x = np.atleast_2d(x)
+        jac = self.interpolant.gradient(x, **kwargs)
+        return jac.reshape((x.shape[0],) + jac.shape[-2:])
@@ -1,7 +1,6 @@
 import numpy as np
 
 from openmdao.surrogate_models.nn_interpolators.nn_base import NNBase
-from six.moves import range
 
 
 class LinearInterpolator(NNBase):
@@ -19,32 +18,26 @@ class LinearInterpolator(NNBase):
         # Number of Prediction Points
         nppts = nloc.shape[0]
 
-        # Preallocate storage
-        pc = np.empty((nppts, dep_dims), dtype='float')
-        normal = np.empty((nppts, indep_dims + 1, dep_dims), dtype='float')
-        nvect = np.empty((nppts, indep_dims, indep_dims + 1), dtype='float')
-        trnd = np.concatenate((self._tp[nloc, :],
-                               self._tv[nloc, 0].reshape(nppts, indep_dims + 1, 1)),
-                              axis=2)
-        nvect[:, :, :-1] = trnd[:, 1:, :-1] - trnd[:, :-1, :-1]
-
-        for i in range(dep_dims):
-            # Planar vectors need both dep and ind dimensions
-            trnd[:, :, -1] = self._tv[nloc, i]
-
-            # Go through each neighbor
-            # Creates array[neighbor, dimension] from NN results
-            nvect[:, :, -1] = trnd[:, 1:, -1] - trnd[:, :-1, -1]
-
-            # Normal vector is in the null space of nvect.
-            # Since nvect is of size indep x (indep + 1),
-            # the normal vector will be the last entry in
-            # V in the U, Sigma, V = svd(nvect).
-            normal[:, :, i] = np.linalg.svd(nvect)[2][:, -1, :]
-
-            # Use the point of the closest neighbor to
-            # solve for pc - the constant of the n-dimensional plane.
-            pc[:, i] = np.einsum('ij,ij->i', trnd[:, 0, :], normal[:, :, i])
+        # Creates arrays[point, neighbor, dimension] from NN results
+        tp = self._tp[nloc]
+        tv = self._tv[nloc]
+
+        # Planar vectors need both dep and ind dimensions, so there is a
+        # set of them for each point and dependent dimension.
+        nvect = np.empty((nppts, dep_dims, indep_dims, indep_dims + 1), dtype='float')
+        nvect[..., :-1] = (tp[:, 1:, :] - tp[:, :-1, :])[:, np.newaxis]
+        nvect[..., -1] = (tv[:, 1:, :] - tv[:, :-1, :]).transpose(0, 2, 1)
+
+        # Normal vector is in the null space of nvect.
+        # Since nvect is of size indep x (indep + 1),
+        # the normal vector will be the last entry in
+        # V in the U, Sigma, V = svd(nvect).
+        normal = np.linalg.svd(nvect)[2][..., -1, :].transpose(0, 2, 1)
+
+        # Use the point of the closest neighbor to
+        # solve for pc - the constant of the n-dimensional plane.
+        pc = (np.einsum('ij,ijk->ik', tp[:, 0, :], normal[:, :-1, :]) +
+              tv[:, 0, :] * normal[:, -1, :])
 
         return normal, pc
 
@@ -63,7 +56,7 @@ class LinearInterpolator(NNBase):
 
         # KData query takes (data, #ofneighbors) to determine closest
         # training points to predicted data
-        ndist, nloc = self._KData.query(normalized_pts.real, points_needed)
+        ndist, nloc = self._neighbors(normalized_pts, points_needed)
 
         normal, pc = self._find_hyperplane(nloc)
 
@@ -82,8 +75,6 @@ class LinearInterpolator(NNBase):
         # Rescale to original units
         predictions = (predictions * self._tvr) + self._tvm
 
-        self._pt_cache = (normalized_pts, ndist, nloc)
-
         return predictions
 
     def gradient(self, PredPoints):
@@ -100,16 +91,15 @@ class LinearInterpolator(NNBase):
         # Linear interp only uses as many neighbors as it has dimensions
         dims = self._indep_dims + 1
         # Find the neighbors
-        if self._pt_cache is not None and \
-                np.allclose(self._pt_cache[0], normPredPts):
-            ndist, nloc = self._pt_cache[1:]
-        else:
-                ndist, nloc = self._KData.query(normPredPts.real, dims)
+        ndist, nloc = self._neighbors(normPredPts, dims)
 
         normal, pc = self._find_hyperplane(nloc)
-        if np.any(normal[:, -1, :]) == 0:
-            return gradient
-        gradient[:] = (-normal[:, :-1, :] / normal[:, -1, :]).squeeze().T
+
+        # The gradient is zero wherever the neighbors are collinear
+        good = normal[:, -1, :] != 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slopes = -normal[:, :-1, :] / normal[:, -1:, :]
+        gradient[:] = np.where(good[:, np.newaxis, :], slopes, 0.).transpose(0, 2, 1)
 
         grad = gradient * (self._tvr[:, np.newaxis] / self._tpr)
         return grad
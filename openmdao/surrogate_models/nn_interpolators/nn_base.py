@@ -8,7 +8,7 @@ class NNBase(object):
     Base class for common functionality between nearest neighbor interpolants.
     """
 
-    def __init__(self, training_points, training_values, num_leaves=2):
+    def __init__(self, training_points, training_values, num_leaves=None):
         """
         Initialize the nearest neighbor interpolant by scaling input to the
         unit hypercube.
@@ -23,6 +23,11 @@ class NNBase(object):
             ndarray of shape (num_points x dependent dims) containing
             training output values.
 
+        num_leaves : int, optional
+            Number of leaves of the tree used to find neighbors. By default,
+            each leaf holds a few points, so finding the neighbors of a
+            point takes O(log(num_points)) time.
+
         """
         # training_points and training_values are the known points and their
         # respective values which will be interpolated against.
@@ -46,8 +51,59 @@ class NNBase(object):
         self._ntpts = training_points.shape[0]
 
         # Make training data into a Tree
-        leavesz = ceil(self._ntpts / float(num_leaves))
-        self._KData = cKDTree(self._tp, leafsize=leavesz)
+        self._num_leaves = num_leaves
+        self._KData = self._build_tree()
 
         # Cache for gradients
         self._pt_cache = None
+
+    def _build_tree(self):
+        if self._num_leaves is None:
+            return cKDTree(self._tp)
+        leavesz = ceil(self._ntpts / float(self._num_leaves))
+        return cKDTree(self._tp, leafsize=leavesz)
+
+    def _neighbors(self, normalized_pts, n):
+        """
+        Returns the distances to the `n` nearest training points of each of
+        the normalized points, and their indices, as arrays of shape
+        (num points, n). The result of the last query is reused if it was
+        for the same points, so the neighbors found to make predictions are
+        reused to find the gradient at the same points.
+        """
+        cache = self._pt_cache
+        if cache is not None and cache[1].shape[1] == n and \
+                cache[0].shape == normalized_pts.shape and \
+                np.array_equal(cache[0], normalized_pts):
+            return cache[1:]
+
+        ndist, nloc = self._KData.query(normalized_pts.real, n)
+        ndist = ndist.reshape(normalized_pts.shape[0], n)
+        nloc = nloc.reshape(normalized_pts.shape[0], n)
+
+        self._pt_cache = (normalized_pts.copy(), ndist, nloc)
+        return ndist, nloc
+
+    def add_points(self, training_points, training_values):
+        """
+        Add training points to the interpolant and rebuild the tree. The new
+        points are normalized the same way as the original ones, so points
+        outside the original range are still handled, but the result can
+        differ slightly from building a new interpolant from all the points.
+
+        Args
+        ----
+        training_points : ndarray
+            ndarray of shape (num_points x independent dims) containing
+            the new training input locations.
+
+        training_values : ndarray
+            ndarray of shape (num_points x dependent dims) containing
+            the new training output values.
+        """
+        self._tp = np.vstack([self._tp, (training_points - self._tpm) / self._tpr])
+        self._tv = np.vstack([self._tv, (training_values - self._tvm) / self._tvr])
+        self._ntpts = self._tp.shape[0]
+
+        self._KData = self._build_tree()
+        self._pt_cache = None
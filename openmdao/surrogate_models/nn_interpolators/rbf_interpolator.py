@@ -1,15 +1,15 @@
 import numpy as np
 
 from openmdao.surrogate_models.nn_interpolators.nn_base import NNBase
-from six.moves import range
 from scipy.sparse import csc_matrix
 from scipy.sparse.linalg import spsolve
 
 
 class RBFInterpolator(NNBase):
     # Compactly Supported Radial Basis Function
-    def _find_R(self, npp, T, loc):
-        R = np.zeros((npp, self._ntpts), dtype="float")
+    def _find_R(self, T):
+        # Returns the values of the basis function for each point's
+        # neighbors, which are the only nonzero entries of its row of R.
         # Choose type of CRBF R matrix
         if self.comp == -1:
             # Comp #1 - a
@@ -131,10 +131,7 @@ class RBFInterpolator(NNBase):
 
         Cb = np.polyval(cb_poly, T)
 
-        for i in range(npp):
-            R[i, loc[i, :-1]] = Cf[i, :] * Cb[i, :]
-
-        return R
+        return Cf * Cb
 
     def _find_dR(self, PrdPts, ploc, pdist):
         T = (pdist[:, :-1] / pdist[:, -1:])
@@ -262,7 +259,7 @@ class RBFInterpolator(NNBase):
 
         return grad.reshape((PrdPts.shape[0], self._dep_dims, self._indep_dims))
 
-    def __init__(self, training_points, training_values, num_leaves=2, n=5, comp=2):
+    def __init__(self, training_points, training_values, num_leaves=None, n=5, comp=2):
         super(RBFInterpolator, self).__init__(training_points, training_values, num_leaves)
 
         if self._ntpts < n:
@@ -273,15 +270,27 @@ class RBFInterpolator(NNBase):
         # Comp is an arbitrary value that picks a function to use
         self.comp = comp
 
+        self.N = n
+        self.weights = self._find_weights()
+
+    def _find_weights(self):
         # For weights, first find the training points radial neighbors
-        tdist, tloc = self._KData.query(self._tp, n)
+        tdist, tloc = self._KData.query(self._tp, self.N)
         Tt = tdist[:, :-1] / tdist[:, -1:]
-        # Next determine weight matrix
-        Rt = self._find_R(self._ntpts, Tt, tloc)
-        weights = (spsolve(csc_matrix(Rt), self._tv))[..., np.newaxis]
+        # Next determine the sparse weight matrix, without ever forming the
+        # dense (num_points x num_points) matrix
+        nnbrs = self.N - 1
+        rows = np.repeat(np.arange(self._ntpts), nnbrs)
+        Rt = csc_matrix((self._find_R(Tt).ravel(), (rows, tloc[:, :-1].ravel())),
+                        shape=(self._ntpts, self._ntpts))
+        return (spsolve(Rt, self._tv))[..., np.newaxis]
 
-        self.N = n
-        self.weights = weights
+    def add_points(self, training_points, training_values):
+        super(RBFInterpolator, self).add_points(training_points, training_values)
+
+        # the weights of every point depend on its neighbors, so they
+        # all have to be found again
+        self.weights = self._find_weights()
 
     def __call__(self, prediction_points):
 
@@ -292,7 +301,7 @@ class RBFInterpolator(NNBase):
         normalized_pts = (prediction_points - self._tpm) / self._tpr
         nppts = normalized_pts.shape[0]
         # Setup prediction points and find their radial neighbors
-        ndist, nloc = self._KData.query(normalized_pts, self.N)
+        ndist, nloc = self._neighbors(normalized_pts, self.N)
         # Check if complex step is being run
         if np.any(np.abs(normalized_pts[0, :].imag)) > 0:
             dimdiff = np.subtract(normalized_pts.reshape((nppts, 1, self._indep_dims)),
@@ -303,12 +312,11 @@ class RBFInterpolator(NNBase):
         # Take farthest distance of each point
         Tp = ndist[:, :-1] / ndist[:, -1:]
 
-        Rp = self._find_R(nppts, Tp, nloc)
-        predz = ((np.dot(Rp, self.weights[..., 0]) * self._tvr) + self._tvm).reshape(nppts, self._dep_dims)
-
-        self._pt_cache = (normalized_pts, ndist, nloc)
+        # Each prediction only involves the weights of its neighbors
+        weights = self.weights[..., 0].reshape(self._ntpts, self._dep_dims)
+        predz = np.einsum('ij,ijk->ik', self._find_R(Tp), weights[nloc[:, :-1]])
 
-        return predz
+        return (predz * self._tvr) + self._tvm
 
     def gradient(self, prediction_points):
 
@@ -318,11 +326,7 @@ class RBFInterpolator(NNBase):
 
         normalized_pts = (prediction_points - self._tpm) / self._tpr
         # Setup prediction points and find their radial neighbors
-        if self._pt_cache is not None and \
-                np.allclose(self._pt_cache[0], normalized_pts):
-            pdist, ploc = self._pt_cache[1:]
-        else:
-            pdist, ploc = self._KData.query(normalized_pts, self.N)
+        pdist, ploc = self._neighbors(normalized_pts, self.N)
 
         # Find Gradient
         grad = self._find_dR(normalized_pts[:, np.newaxis, :], ploc,
@@ -1,9 +1,9 @@
 """Surrogate Model based on second order response surface equations."""
 
-from numpy import zeros, einsum, squeeze
+from numpy import zeros, atleast_2d, triu_indices, tensordot, vstack, concatenate
 from numpy.dual import lstsq
+from numpy.linalg import qr
 from openmdao.surrogate_models.surrogate_model import SurrogateModel
-from six.moves import range
 
 
 class ResponseSurface(SurrogateModel):
@@ -14,6 +14,11 @@ class ResponseSurface(SurrogateModel):
         self.n = 0  # number of independents
         self.betas = zeros(0)  # vector of response surface equation coefficients
 
+        # triangular factor of the least squares problem and the projected
+        # responses, which summarize the training data for update()
+        self._qr_R = zeros(0)
+        self._qr_qty = zeros(0)
+
     def train(self, x, y):
         """ Calculate response surface equation coefficients using least
         squares regression.
@@ -29,12 +34,46 @@ class ResponseSurface(SurrogateModel):
 
         super(ResponseSurface, self).train(x, y)
 
-        m = self.m = x.shape[0]
-        n = self.n = x.shape[1]
+        self.m = x.shape[0]
+        self.n = x.shape[1]
 
-        X = zeros((m, ((n + 1) * (n + 2)) // 2))
+        # Determine response surface equation coefficients (betas) using least squares
+        X = self._features(x)
+        self.betas, rs, r, s = lstsq(X, y)
+
+        Q, self._qr_R = qr(X)
+        self._qr_qty = Q.T.dot(y)
 
-        # Modify X to include constant, squared terms and cross terms
+    def update(self, x, y):
+        """ Add training points and update the response surface equation
+        coefficients by recursive least squares. Only the small triangular
+        factor of the previous least squares problem is refactored with the
+        new points, so the cost doesn't depend on the number of points
+        already trained on.
+
+        Args
+        ----
+        x : array-like
+            New training input locations.
+
+        y : array-like
+            Model responses at the new inputs.
+        """
+        x = atleast_2d(x)
+        self.m += x.shape[0]
+
+        Q, self._qr_R = qr(vstack([self._qr_R, self._features(x)]))
+        self._qr_qty = Q.T.dot(concatenate([self._qr_qty, y]))
+
+        self.betas, rs, r, s = lstsq(self._qr_R, self._qr_qty)
+
+    def _features(self, x):
+        """
+        Returns an array with a row for each point in `x`, which holds the
+        constant, linear, squared and cross terms of the response surface.
+        """
+        m, n = x.shape
+        X = zeros((m, ((n + 1) * (n + 2)) // 2))
 
         # Constant Terms
         X[:, 0] = 1.0
@@ -42,17 +81,11 @@ class ResponseSurface(SurrogateModel):
         # Linear Terms
         X[:, 1:n+1] = x
 
-        # Quadratic Terms
-        X_offset = X[:, n + 1:]
-        for i in range(n):
-            # Z = einsum('i,ij->ij', X, Y) is equivalent to, but much faster and
-            # memory efficient than, diag(X).dot(Y) for vector X and 2D array Y.
-            # I.e. Z[i,j] = X[i]*Y[i,j]
-            X_offset[:, :n - i] = einsum('i,ij->ij', x[:, i], x[:, i:])
-            X_offset = X_offset[:, n-i:]
+        # Quadratic Terms, ordered x0*x0, x0*x1, ..., x1*x1, x1*x2, ...
+        i, j = triu_indices(n)
+        X[:, n+1:] = x[:, i] * x[:, j]
 
-        # Determine response surface equation coefficients (betas) using least squares
-        self.betas, rs, r, s = lstsq(X, y)
+        return X
 
     def predict(self, x):
         """
@@ -67,26 +100,27 @@ class ResponseSurface(SurrogateModel):
 
         super(ResponseSurface, self).predict(x)
 
-        n = x.size
-
-        X = zeros(((self.n + 1) * (self.n + 2)) // 2)
+        return self.predict_batch(x.reshape(1, -1))[0]
 
-        # Modify X to include constant, squared terms and cross terms
+    def predict_batch(self, x):
+        """
+        Calculates predicted values of the response at several points.
 
-        # Constant Terms
-        X[0] = 1.0
+        Args
+        ----
+        x : array-like
+            Points at which the surrogate is evaluated, one per row.
 
-        # Linear Terms
-        X[1:n + 1] = x
+        Returns
+        -------
+        ndarray
+            The prediction at each point.
+        """
 
-        # Quadratic Terms
-        X_offset = X[n + 1:]
-        for i in range(n):
-            X_offset[:n - i] = x[i] * x[i:]
-            X_offset = X_offset[n - i:]
+        super(ResponseSurface, self).predict(x)
 
         # Predict new_y using X and betas
-        return X.dot(self.betas)
+        return self._features(atleast_2d(x)).dot(self.betas)
 
     def jacobian(self, x):
         """
@@ -97,16 +131,34 @@ class ResponseSurface(SurrogateModel):
         x : array-like
             Point at which the surrogate Jacobian is evaluated.
         """
+        return self.jacobian_batch(x.reshape(1, -1))[0]
+
+    def jacobian_batch(self, x):
+        """
+        Calculates the jacobian of the response surface at several points.
+
+        Args
+        ----
+        x : array-like
+            Points at which the surrogate Jacobian is evaluated, one per row.
+
+        Returns
+        -------
+        ndarray
+            Array of shape (num points, num outputs, num inputs).
+        """
         n = self.n
-        betas = self.betas
+        betas = self.betas.reshape(self.betas.shape[0], -1)
 
-        x = x.flat
+        # The quadratic terms are x.T H x, with H[i, j] holding the coefficient
+        # of x[i]*x[j], so their gradient is (H + H.T) x.
+        H = zeros((n, n, betas.shape[1]))
+        i, j = triu_indices(n)
+        H[i, j] = betas[n + 1:]
+        H += H.transpose(1, 0, 2)
 
-        jac = betas[1:n + 1, :].copy()
-        beta_offset = betas[n + 1:, :]
-        for i in range(n):
-            jac[i, :] += x[i:].dot(beta_offset[:n - i, :])
-            jac[i:, :] += x[i] * beta_offset[:n - i, :]
-            beta_offset = beta_offset[n - i:, :]
+        jac = betas[1:n + 1].T + tensordot(atleast_2d(x), H, axes=(1, 1)).transpose(0, 2, 1)
 
-        return jac.T
+        if self.betas.ndim == 1:
+            return jac[:, 0, :]
+        return jac
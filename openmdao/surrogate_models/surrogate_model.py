@@ -2,11 +2,35 @@
 Class definition for SurrogateModel, the base class for all surrogate models.
 """
 
+import os
+import shutil
+import tempfile
+from os.path import join, exists
+
+import numpy as np
+from six.moves import cPickle as pickle
+
+# arrays with fewer elements than this are pickled along with the rest of a
+# saved surrogate, and larger ones are stored in their own .npy files
+_MIN_NPY_SIZE = 1024
+
+
 class SurrogateModel(object):
     """
     Base class for surrogate models.
+
+    Surrogates that can add training points without being trained again
+    from scratch should also define an `update(x, y)` method, which
+    `MetaModel` uses when it is warm restarted.
     """
 
+    # False if several instances can't be trained in different threads at
+    # the same time, e.g. because training uses a scipy optimizer that
+    # isn't reentrant. Surrogates that draw from numpy's random number
+    # generator during training must also set it to False, since the
+    # generator is shared by every thread.
+    thread_safe = True
+
     def __init__(self):
         self.trained = False
 
@@ -25,6 +49,136 @@ class SurrogateModel(object):
             .format(type(self).__name__)
         raise RuntimeError(msg)
 
+    def predict_batch(self, x):
+        """
+        Calculates predicted values of the response at several points.
+        This version just calls `predict` for each point, so surrogates
+        that can evaluate many points at once should override it.
+
+        Args
+        ----
+        x : array-like
+            Points at which the surrogate is evaluated, one per row.
+
+        Returns
+        -------
+        ndarray or tuple of ndarrays
+            The prediction for each point, stacked along the first axis. If
+            `predict` returns a tuple, each item is stacked separately.
+        """
+        SurrogateModel.predict(self, x)
+
+        results = [self.predict(pt) for pt in np.atleast_2d(x)]
+        if results and isinstance(results[0], tuple):
+            return tuple(np.array(r) for r in zip(*results))
+        return np.array(results)
+
+    def jacobian_batch(self, x):
+        """
+        Calculates the jacobian of the surrogate at several points.
+        This version just calls `jacobian` for each point, so surrogates
+        that can evaluate many points at once should override it.
+
+        Args
+        ----
+        x : array-like
+            Points at which the surrogate Jacobian is evaluated, one per row.
+
+        Returns
+        -------
+        ndarray
+            Array of shape (num points, num outputs, num inputs).
+        """
+        return np.array([self.jacobian(pt) for pt in np.atleast_2d(x)])
+
+    def save(self, path):
+        """
+        Save the surrogate, including any training, to the directory `path`,
+        replacing anything already there. Large arrays are stored in separate
+        .npy files so that `load` can memory-map them.
+
+        Args
+        ----
+        path : str
+            Directory where the surrogate is saved.
+        """
+        path = os.path.abspath(path)
+        tmp = tempfile.mkdtemp(dir=os.path.dirname(path))
+        try:
+            arrays = []
+
+            def persistent_id(obj):
+                # memory-mapped arrays from an earlier load are saved as
+                # .npy files too, but other subclasses would lose their type
+                if (type(obj) is np.ndarray or isinstance(obj, np.memmap)) and \
+                        not obj.dtype.hasobject and obj.size >= _MIN_NPY_SIZE:
+                    fname = 'array%d.npy' % len(arrays)
+                    np.save(join(tmp, fname), obj)
+                    arrays.append(fname)
+                    return fname
+                return None
+
+            with open(join(tmp, 'surrogate.pkl'), 'wb') as f:
+                pickler = pickle.Pickler(f, pickle.HIGHEST_PROTOCOL)
+                pickler.persistent_id = persistent_id
+                pickler.dump(self)
+
+            if exists(path):
+                shutil.rmtree(path)
+            try:
+                os.rename(tmp, path)
+            except OSError:
+                if not exists(path):  # not just saved by someone else
+                    raise
+                shutil.rmtree(tmp, ignore_errors=True)
+        except:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    def load(self, path, mmap_mode='c'):
+        """
+        Replace the state of this surrogate with one saved by `save`.
+
+        Args
+        ----
+        path : str
+            Directory where the surrogate was saved.
+
+        mmap_mode : str or None, optional
+            Mode used to memory-map the large arrays, as for `numpy.load`.
+            The default, 'c', maps them copy-on-write, so they are only read
+            from disk as needed and changes don't affect the saved file.
+            Use None to read them into memory.
+        """
+        def persistent_load(fname):
+            return np.load(join(path, fname), mmap_mode=mmap_mode)
+
+        with open(join(path, 'surrogate.pkl'), 'rb') as f:
+            unpickler = pickle.Unpickler(f)
+            unpickler.persistent_load = persistent_load
+            loaded = unpickler.load()
+
+        if type(loaded) is not type(self):
+            raise TypeError("Can't load a {0} from '{1}', which holds a {2}."
+                            .format(type(self).__name__, path,
+                                    type(loaded).__name__))
+
+        self.__dict__.clear()
+        self.__dict__.update(loaded.__dict__)
+
+    def _cache_params(self):
+        """
+        Returns the settings of the surrogate that change the result of
+        training, which `MetaModel` includes in the key of its cache of
+        trained surrogates. Surrogates with such settings must override this.
+
+        Returns
+        -------
+        dict
+            The value of each setting, keyed on its name.
+        """
+        return {}
+
 
 class MultiFiSurrogateModel(SurrogateModel):
     """
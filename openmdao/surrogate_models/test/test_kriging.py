@@ -4,10 +4,15 @@
 import unittest
 import random
 import itertools
+import os
+import shutil
+import tempfile
 
 from numpy import array, linspace, sin, cos, pi
+from numpy.random import RandomState, seed
 
-from openmdao.surrogate_models import KrigingSurrogate
+from openmdao.surrogate_models import KrigingSurrogate, LocalKrigingSurrogate, \
+    ResponseSurface
 from openmdao.test.util import assert_rel_error
 from six.moves import zip
 
@@ -70,15 +75,18 @@ class TestKrigingSurrogate(unittest.TestCase):
         surrogate = KrigingSurrogate()
         surrogate.train(x, y)
 
+        # the RMSE at the training points is only zero up to the rounding
+        # error of sqrt(sig2 * eps)
         for x0, y0 in zip(x, y):
             mu, sigma = surrogate.predict(x0)
             assert_rel_error(self, mu, y0, 1e-9)
-            assert_rel_error(self, sigma, 0, 1e-6)
+            assert_rel_error(self, sigma, 0, 1e-5)
 
         mu, sigma = surrogate.predict([5., 5.])
 
-        assert_rel_error(self, mu, branin([5., 5.]), 1e-1)
-        assert_rel_error(self, sigma, 5.79, 1e-2)
+        assert_rel_error(self, mu, 18.76, 1e-3)
+        assert_rel_error(self, sigma, 14.51, 1e-3)
+        self.assertLess(abs(mu - branin([5., 5.])), sigma)
 
     def test_no_training_data(self):
         surrogate = KrigingSurrogate()
@@ -151,5 +159,225 @@ class TestKrigingSurrogate(unittest.TestCase):
         jac = surrogate.jacobian(array([[0.5, 0.5]]))
         assert_rel_error(self, jac, array([[1, 1], [1, -1]]), 1e-5)
 
+    def test_batch(self):
+        surrogate = KrigingSurrogate()
+
+        x = array([[a, b] for a, b in
+                   itertools.product(linspace(0, 1, 5), repeat=2)])
+        y = array([[a + b, a * b] for a, b in x])
+        surrogate.train(x, y)
+
+        test_x = array([[0.1, 0.2], [0.55, 0.35], [0.9, 0.7]])
+        mu, sigma = surrogate.predict_batch(test_x)
+        jac = surrogate.jacobian_batch(test_x)
+
+        self.assertEqual(mu.shape, (3, 2))
+        self.assertEqual(sigma.shape, (3, 2))
+        self.assertEqual(jac.shape, (3, 2, 2))
+        for i, x0 in enumerate(test_x):
+            mu0, sigma0 = surrogate.predict(x0)
+            assert_rel_error(self, mu[i], mu0, 1e-8)
+            assert_rel_error(self, sigma[i], sigma0.diagonal(), 1e-6)
+            assert_rel_error(self, jac[i], surrogate.jacobian(x0), 1e-8)
+
+    def test_batch_offset(self):
+        # inputs far from the origin lose precision in the expanded distances,
+        # which shows up in the RMSE at the training points
+        x = linspace(0., 10., 8).reshape(-1, 1) + 1e5
+        y = sin(x[:, 0] / 3.)
+
+        surrogate = KrigingSurrogate()
+        surrogate.train(x, y)
+
+        mu, sigma = surrogate.predict_batch(x)
+        self.assertLess(abs(mu - y).max(), 1e-8)
+        self.assertLess(abs(sigma).max(), 1e-6)
+
+    def test_lbfgsb(self):
+        x = array([[0.0], [2.0], [3.0], [4.0], [6.0]])
+        y = array([[branin_1d(case)] for case in x])
+
+        cobyla = KrigingSurrogate()
+        cobyla.train(x, y)
+
+        surrogate = KrigingSurrogate(optimizer='L-BFGS-B', num_starts=3)
+        surrogate.train(x, y)
+
+        # both find the same optimum, within the bounds
+        assert_rel_error(self, surrogate.thetas, cobyla.thetas, 1e-4)
+        assert_rel_error(self, surrogate.log_likelihood, cobyla.log_likelihood, 1e-6)
+
+        for x0, y0 in zip(x, y):
+            mu, sigma = surrogate.predict(x0)
+            assert_rel_error(self, mu, y0, 1e-9)
+
+    def test_theta_bounds(self):
+        x = RandomState(0).uniform(0., 1., (20, 2))
+
+        # the likelihood of these functions is largest below the lower
+        # bound in the first dimension
+        for freq in (1., 2., 3.):
+            y = sin(freq * x).sum(axis=1).reshape(-1, 1)
+            for optimizer in ('COBYLA', 'L-BFGS-B'):
+                seed(11)
+                surrogate = KrigingSurrogate(optimizer=optimizer, num_starts=3)
+                surrogate.train(x, y)
+
+                lower, upper = surrogate.theta_bounds
+                for theta in surrogate.thetas:
+                    self.assertGreaterEqual(theta, lower - 1e-6)
+                    self.assertLessEqual(theta, upper + 1e-6)
+
+    def test_log_likelihood_grad(self):
+        x = array([[a, b] for a, b in
+                   itertools.product(linspace(0, 1, 4), repeat=2)])
+        y = array([[branin(case)] for case in 10. * x])
+
+        surrogate = KrigingSurrogate()
+        surrogate.train(x, y)
+
+        thetas = array([-0.5, 0.2])
+        surrogate.thetas = thetas
+        surrogate._calculate_log_likelihood()
+        grad = surrogate._log_likelihood_grad()
+
+        step = 1e-6
+        for i in range(2):
+            fd = []
+            for delta in (step, -step):
+                surrogate.thetas = thetas.copy()
+                surrogate.thetas[i] += delta
+                surrogate._calculate_log_likelihood()
+                fd.append(surrogate.log_likelihood)
+            assert_rel_error(self, grad[i], (fd[0] - fd[1]) / (2 * step), 1e-5)
+
+    def test_unknown_optimizer(self):
+        with self.assertRaises(ValueError) as cm:
+            KrigingSurrogate(optimizer='junk')
+
+        self.assertEqual(str(cm.exception),
+                         "KrigingSurrogate: optimizer 'junk' not supported."
+                         " optimizer must be one of ['COBYLA', 'L-BFGS-B'].")
+
+    def test_update(self):
+        x = array([[a, b] for a, b in
+                   itertools.product(linspace(-5, 10, 5), linspace(0, 15, 5))])
+        y = array([[branin(case)] for case in x])
+
+        surrogate = KrigingSurrogate()
+        surrogate.train(x[:15], y[:15])
+        thetas = surrogate.thetas.copy()
+        surrogate.update(x[15:20], y[15:20])
+        surrogate.update(x[20:], y[20:])
+
+        # the thetas stay fixed, so this is the same as factoring R again
+        full = KrigingSurrogate()
+        full.train(x, y)
+        full.thetas = thetas
+        full._calculate_log_likelihood()
+
+        assert_rel_error(self, surrogate.thetas, thetas, 1e-15)
+        assert_rel_error(self, surrogate.log_likelihood, full.log_likelihood, 1e-10)
+
+        xt = array([[1., 2.], [7., 11.], [-2., 14.]])
+        for actual, expected in zip(surrogate.predict_batch(xt), full.predict_batch(xt)):
+            assert_rel_error(self, actual, expected, 1e-8)
+        assert_rel_error(self, surrogate.jacobian_batch(xt), full.jacobian_batch(xt), 1e-8)
+
+        for x0, y0 in zip(x[15:], y[15:]):
+            mu, sigma = surrogate.predict(x0)
+            assert_rel_error(self, mu, y0, 1e-8)
+
+    def test_save_load(self):
+        x = array([[a, b] for a, b in
+                   itertools.product(linspace(0, 1, 40), linspace(0, 1, 40))])
+        y = sin(3. * x[:, 0]) + cos(2. * x[:, 1])
+
+        surrogate = KrigingSurrogate()
+        surrogate.nugget = 1e-8
+        surrogate.train(x[:5], y[:5])
+        surrogate.update(x[5:], y[5:])
+
+        tempdir = tempfile.mkdtemp(prefix='test_kriging-')
+        try:
+            path = os.path.join(tempdir, 'krig')
+            surrogate.save(path)
+
+            loaded = KrigingSurrogate()
+            loaded.load(path)
+
+            # R and its factorization are mapped from separate files
+            self.assertTrue(len(os.listdir(path)) > 2)
+
+            xt = array([[0.3, 0.4], [0.77, 0.01]])
+            for actual, expected in zip(loaded.predict_batch(xt), surrogate.predict_batch(xt)):
+                assert_rel_error(self, actual, expected, 1e-15)
+            assert_rel_error(self, loaded.jacobian_batch(xt), surrogate.jacobian_batch(xt), 1e-15)
+            assert_rel_error(self, loaded.log_likelihood, surrogate.log_likelihood, 1e-15)
+
+            # the mapped arrays are saved to separate files again
+            path2 = os.path.join(tempdir, 'krig2')
+            loaded.save(path2)
+            self.assertEqual(sorted(os.listdir(path2)), sorted(os.listdir(path)))
+
+            with self.assertRaises(TypeError) as cm:
+                ResponseSurface().load(path)
+
+            self.assertEqual(str(cm.exception),
+                             "Can't load a ResponseSurface from '%s', which holds a "
+                             "KrigingSurrogate." % path)
+        finally:
+            shutil.rmtree(tempdir)
+
+
+
+class TestLocalKrigingSurrogate(unittest.TestCase):
+
+    def test_all_neighbors(self):
+        # with every training point in the neighborhood, local Kriging
+        # is the same as full Kriging
+        x = array([[a, b] for a, b in
+                   itertools.product(linspace(-5, 10, 5), linspace(0, 15, 5))])
+        y = array([[branin(case)] for case in x])
+
+        full = KrigingSurrogate()
+        full.train(x, y)
+        local = LocalKrigingSurrogate(num_neighbors=25)
+        local.train(x, y)
+
+        xt = array([[1., 2.], [7., 11.], [-2., 14.]])
+        for actual, expected in zip(local.predict_batch(xt), full.predict_batch(xt)):
+            assert_rel_error(self, actual, expected, 1e-8)
+        assert_rel_error(self, local.jacobian_batch(xt), full.jacobian_batch(xt), 1e-8)
+
+        mu, sigma = local.predict(xt[0])
+        assert_rel_error(self, mu, full.predict(xt[0])[0], 1e-8)
+        assert_rel_error(self, local.jacobian(xt[0]), full.jacobian(xt[0]), 1e-8)
+
+    def test_large(self):
+        rand = RandomState(3)
+        x = rand.uniform(0., 1., (20000, 2))
+        y = sin(3. * x[:, 0]) + cos(2. * x[:, 1])
+
+        seed(0)  # the points used to fit the thetas are picked at random
+        surrogate = LocalKrigingSurrogate(num_neighbors=30, num_fit_points=200)
+        surrogate.train(x, y)
+
+        for x0, y0 in zip(x[:5], y[:5]):
+            mu, sigma = surrogate.predict(x0)
+            assert_rel_error(self, mu, y0, 1e-4)
+
+        xt = rand.uniform(0.1, 0.9, (50, 2))
+        mu, sigma = surrogate.predict_batch(xt)
+        self.assertEqual(mu.shape, (50,))
+        self.assertEqual(sigma.shape, (50,))
+        self.assertLess(abs(mu - sin(3. * xt[:, 0]) - cos(2. * xt[:, 1])).max(), 1e-4)
+
+        jac = surrogate.jacobian_batch(xt)
+        self.assertEqual(jac.shape, (50, 2))
+        self.assertLess(abs(jac[:, 0] - 3. * cos(3. * xt[:, 0])).max(), 1e-3)
+        self.assertLess(abs(jac[:, 1] + 2. * sin(2. * xt[:, 1])).max(), 1e-3)
+
+
 if __name__ == "__main__":
     unittest.main()
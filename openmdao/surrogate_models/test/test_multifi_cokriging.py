@@ -1,6 +1,8 @@
 import unittest
+import numpy as np
 from numpy import array, sin, cos, pi, ones
 from openmdao.surrogate_models import MultiFiCoKrigingSurrogate
+from openmdao.surrogate_models.multifi_cokriging import MultiFiCoKriging
 from openmdao.test.util import assert_rel_error
 
 class CoKrigingSurrogateTest(unittest.TestCase):
@@ -171,6 +173,81 @@ class CoKrigingSurrogateTest(unittest.TestCase):
         else:
             self.fail("ValueError Expected")
 
+    def test_batch(self):
+        x = array([[0.05], [.25], [0.61], [0.95]])
+        y = array([0.738513784857542, -0.210367746201974, -0.489015457891476, 12.3033138316612])
+        krig = MultiFiCoKrigingSurrogate()
+        krig.train(x, y)
+
+        test_x = array([[0.05], [0.5], [0.8]])
+        mu, sigma = krig.predict_batch(test_x)
+
+        self.assertEqual(mu.shape, (3, 1))
+        for i, x0 in enumerate(test_x):
+            mu0, sigma0 = krig.predict(x0)
+            assert_rel_error(self, mu[i], mu0[0], 1e-10)
+            assert_rel_error(self, sigma[i], sigma0[0], 1e-10)
+
+
+    def _2fi_data(self):
+        def f(x):
+            return np.sin(4.*x).dot([1., 2., 3.])
+
+        np.random.seed(0)
+        Xe = np.random.rand(15, 3)
+        Xc = np.vstack((np.random.rand(40, 3), Xe))
+        return [Xc, Xe], [0.5*f(Xc) + Xc[:, 0], f(Xe)]
+
+    def test_rlf_grad(self):
+        X, y = self._2fi_data()
+        model = MultiFiCoKriging()
+        model.fit(X, y)
+
+        log10t = np.log10([0.3, 1.2, 4.])
+        value, grad = model._rlf_grad(1, 10.**log10t)
+        assert_rel_error(self, value, model.rlf(1, 10.**log10t), 1e-10)
+
+        fd = np.zeros(3)
+        for k in range(3):
+            dx = np.zeros(3)
+            dx[k] = 1e-6
+            fd[k] = (model.rlf(1, 10.**(log10t + dx)) -
+                     model.rlf(1, 10.**(log10t - dx))) / 2e-6
+        assert_rel_error(self, grad, fd, 1e-5)
+
+    def test_multi_start(self):
+        X, y = self._2fi_data()
+
+        single = MultiFiCoKriging()
+        single.fit(X, y)
+
+        for optimizer in ('COBYLA', 'L-BFGS-B'):
+            fits = []
+            for num_workers in (1, 2):
+                np.random.seed(1)
+                model = MultiFiCoKriging(optimizer=optimizer, num_starts=4,
+                                         num_workers=num_workers)
+                model.fit(X, y)
+                fits.append(model)
+
+            # the best start doesn't depend on the number of workers
+            assert_rel_error(self, fits[0].theta[1], fits[1].theta[1], 1e-12)
+            assert_rel_error(self, fits[0].rlf_value, fits[1].rlf_value, 1e-12)
+
+            # the first start is the same as the single start
+            if optimizer == 'COBYLA':
+                self.assertTrue(np.all(fits[0].rlf_value <= single.rlf_value + 1e-8))
+
+    def test_bad_optimizer(self):
+        X, y = self._2fi_data()
+        model = MultiFiCoKriging(optimizer='junk')
+        with self.assertRaises(ValueError) as cm:
+            model.fit(X, y)
+
+        self.assertEqual(str(cm.exception),
+                         "optimizer should be one of ['COBYLA', 'L-BFGS-B'], "
+                         "junk was given.")
+
 
 if __name__ == "__main__":
     unittest.main()
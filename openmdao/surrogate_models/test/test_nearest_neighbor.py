@@ -1,5 +1,8 @@
 import numpy as np
 import unittest
+import os
+import shutil
+import tempfile
 
 from openmdao.surrogate_models import NearestNeighbor
 from openmdao.test.util import assert_rel_error
@@ -137,6 +140,21 @@ class TestLinearInterpolatorND(unittest.TestCase):
             mu = self.surrogate.jacobian(x0)
             assert_rel_error(self, mu, y0, 1e-9)
 
+    def test_batch(self):
+        test_x = np.array([[1., 0.5],
+                           [0.5, 1.],
+                           [1., 1.5],
+                           [1.5, 1.]
+                           ])
+
+        mu = self.surrogate.predict_batch(test_x)
+        jac = self.surrogate.jacobian_batch(test_x)
+
+        self.assertEqual(jac.shape, (4, 4, 2))
+        for i, x0 in enumerate(test_x):
+            assert_rel_error(self, mu[i], self.surrogate.predict(x0.copy())[0], 1e-10)
+            assert_rel_error(self, jac[i], self.surrogate.jacobian(x0.copy()), 1e-10)
+
 
 class TestWeightedInterpolator1D(unittest.TestCase):
     def setUp(self):
@@ -283,6 +301,33 @@ class TestWeightedInterpolatorND(unittest.TestCase):
             mu = self.surrogate.jacobian(x0)
             assert_rel_error(self, mu, y0, 1e-6)
 
+    def test_batch(self):
+        test_x = np.array([[1., 0.5],
+                           [0.5, 1.],
+                           [1., 1.5],
+                           [1.5, 1.]
+                           ])
+
+        mu = self.surrogate.predict_batch(test_x)
+        jac = self.surrogate.jacobian_batch(test_x)
+
+        self.assertEqual(jac.shape, (4, 4, 2))
+        for i, x0 in enumerate(test_x):
+            assert_rel_error(self, mu[i], self.surrogate.predict(x0.copy())[0], 1e-10)
+            assert_rel_error(self, jac[i], self.surrogate.jacobian(x0.copy()), 1e-10)
+
+    def test_pt_cache(self):
+        test_x = np.array([[1., 0.5], [0.5, 1.]])
+
+        mu = self.surrogate.predict_batch(test_x, n=5)
+
+        # neighbors found for other points, or a different number of
+        # neighbors, must not be reused
+        self.surrogate.predict_batch(test_x, n=3)
+        assert_rel_error(self, self.surrogate.predict_batch(test_x, n=5), mu, 1e-10)
+        self.surrogate.predict(test_x[0].copy(), n=5)
+        assert_rel_error(self, self.surrogate.predict_batch(test_x, n=5), mu, 1e-10)
+
 
 class TestRBFInterpolator1D(unittest.TestCase):
     def setUp(self):
@@ -420,3 +465,55 @@ class TestRBFInterpolatorND(unittest.TestCase):
         for x0, y0 in zip(test_x, expected_deriv):
             mu = self.surrogate.jacobian(x0)
             assert_rel_error(self, mu, y0, 1e-6)
+
+    def test_batch(self):
+        test_x = np.array([[0.5, 0.5],
+                           [0.5, 1.5],
+                           [1.5, 1.5],
+                           [1.5, 0.5]
+                           ])
+
+        mu = self.surrogate.predict_batch(test_x)
+        jac = self.surrogate.jacobian_batch(test_x)
+
+        self.assertEqual(jac.shape, (4, 4, 2))
+        for i, x0 in enumerate(test_x):
+            assert_rel_error(self, mu[i], self.surrogate.predict(x0.copy())[0], 1e-10)
+            assert_rel_error(self, jac[i], self.surrogate.jacobian(x0.copy()), 1e-10)
+
+    def test_update(self):
+        # within the ranges of the original data, so the normalization
+        # is the same as for a new interpolant
+        x = np.array([[0.5, 0.5], [1.5, 1.5], [0.5, 1.5]])
+        y = np.array([[0., 1., .5, 0.],
+                      [0.5, 1., .5, 0.],
+                      [1., 0.5, .5, 0.]])
+        self.surrogate.update(x, y)
+
+        full = NearestNeighbor(interpolant_type='rbf', n=5)
+        full.train(np.vstack([self.x, x]), np.vstack([self.y, y]))
+
+        # the jacobian is undefined at the training points, so none are used
+        test_x = np.array([[0.75, 0.25], [0.25, 1.], [1.5, 0.75]])
+        jac = self.surrogate.jacobian_batch(test_x)
+        self.assertFalse(np.isnan(jac).any())
+
+        assert_rel_error(self, self.surrogate.predict_batch(test_x),
+                         full.predict_batch(test_x), 1e-10)
+        assert_rel_error(self, jac, full.jacobian_batch(test_x), 1e-10)
+
+    def test_save_load(self):
+        tempdir = tempfile.mkdtemp(prefix='test_nearest_neighbor-')
+        try:
+            path = os.path.join(tempdir, 'nn')
+            self.surrogate.save(path)
+            loaded = NearestNeighbor()
+            loaded.load(path)
+        finally:
+            shutil.rmtree(tempdir)
+
+        test_x = np.array([[0.5, 0.5], [0.25, 1.], [1.5, 0.75]])
+        assert_rel_error(self, loaded.predict_batch(test_x),
+                         self.surrogate.predict_batch(test_x), 1e-15)
+        assert_rel_error(self, loaded.jacobian_batch(test_x),
+                         self.surrogate.jacobian_batch(test_x), 1e-15)
@@ -1,6 +1,7 @@
 # pylint: disable-msg=C0111,C0103
 
 import unittest, itertools
+import os, shutil, tempfile
     
 
 from numpy import array, linspace, sin, cos, pi
@@ -137,6 +138,62 @@ class TestResponseSurfaceSurrogate(unittest.TestCase):
         jac = surrogate.jacobian(array([[0.5, 0.5]]))
         assert_rel_error(self, jac, array([[1, 1], [1, -1]]), 1e-5)
 
+    def test_batch(self):
+        surrogate = ResponseSurface()
+
+        x = array([[a, b, c] for a, b, c in
+                   itertools.product(linspace(0, 1, 4), repeat=3)])
+        y = array([[a + b*c, a*a - 3*c] for a, b, c in x])
+        surrogate.train(x, y)
+
+        test_x = array([[0.1, 0.2, 0.3], [0.55, 0.35, 0.15], [0.9, 0.7, 0.2]])
+        mu = surrogate.predict_batch(test_x)
+        jac = surrogate.jacobian_batch(test_x)
+
+        assert_rel_error(self, mu, array([[a + b*c, a*a - 3*c] for a, b, c in test_x]), 1e-8)
+        assert_rel_error(self, jac, array([[[1, c, b], [2*a, 0, -3]]
+                                           for a, b, c in test_x]), 1e-8)
+
+    def test_update(self):
+        x = array([[a, b] for a, b in
+                   itertools.product(linspace(-5, 10, 4), linspace(0, 15, 4))])
+        y = array([[branin(case)] for case in x])
+
+        surrogate = ResponseSurface()
+        surrogate.train(x[:3], y[:3])
+        surrogate.update(x[3:8], y[3:8])
+        surrogate.update(x[8:], y[8:])
+
+        full = ResponseSurface()
+        full.train(x, y)
+
+        self.assertEqual(surrogate.m, 16)
+        assert_rel_error(self, surrogate.betas, full.betas, 1e-10)
+
+    def test_save_load(self):
+        x = array([[a, b] for a, b in
+                   itertools.product(linspace(-5, 10, 4), linspace(0, 15, 4))])
+        y = array([[branin(case)] for case in x])
+
+        surrogate = ResponseSurface()
+        surrogate.train(x[:10], y[:10])
+
+        tempdir = tempfile.mkdtemp(prefix='test_response_surface-')
+        try:
+            path = os.path.join(tempdir, 'rs')
+            surrogate.save(path)
+            loaded = ResponseSurface()
+            loaded.load(path, mmap_mode=None)
+        finally:
+            shutil.rmtree(tempdir)
+
+        assert_rel_error(self, loaded.betas, surrogate.betas, 1e-15)
+
+        # updates continue from the saved state
+        loaded.update(x[10:], y[10:])
+        surrogate.update(x[10:], y[10:])
+        assert_rel_error(self, loaded.betas, surrogate.betas, 1e-15)
+
 
 if __name__ == "__main__":
     unittest.main()
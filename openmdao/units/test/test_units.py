@@ -5,9 +5,12 @@ import math
 import os
 import unittest
 
+import numpy as np
+
 from openmdao.test.util import assert_rel_error
 from openmdao.units import PhysicalQuantity, NumberDict, UnitsOnlyPQ, PhysicalUnit, convert_units, get_conversion_tuple
-from openmdao.units.units import import_library, add_unit, add_offset_unit 
+from openmdao.units.units import import_library, add_unit, add_offset_unit, \
+     _parse_unit, _UNIT_LIB
 
 
 class test_NumberDict(unittest.TestCase):
@@ -759,5 +762,39 @@ class test__moduleFunctions(unittest.TestCase):
         else:
             self.fail("Expecting Key Error")
 
+    def test_parse_unit(self):
+        table = _UNIT_LIB.unit_table
+        self.assertEqual(_parse_unit('kg*m/s**2', table), table['N'])
+        self.assertEqual(_parse_unit('W/(m**2*K**-4)', table),
+                         table['W'] / (table['m']**2 * table['K']**-4))
+        self.assertEqual(_parse_unit('-2**2 + 1', table), -3)
+
+        # only names from the table can be used
+        with self.assertRaises(NameError) as cm:
+            _parse_unit('__import__', table)
+        self.assertEqual(str(cm.exception), "name '__import__' is not defined")
+
+        for expr in ('m*', 'm)', '(m', 'm.s', 'm;s'):
+            with self.assertRaises(SyntaxError):
+                _parse_unit(expr, table)
+
+    def test_convert_units_array(self):
+        temps = np.array([[0., 100.], [-40., 37.]])
+        converted = convert_units(temps, 'degC', 'degF')
+        assert_rel_error(self, converted, temps * 9. / 5. + 32., 1e-10)
+
+        self.assertEqual(convert_units(2.0, 'm', 'cm'), 200.0)
+
+    def test_conversion_cache(self):
+        conv = get_conversion_tuple('ft/s', 'm/min')
+        self.assertTrue(get_conversion_tuple('ft/s', 'm/min') is conv)
+        assert_rel_error(self, conv[0], 0.3048 * 60., 1e-12)
+
+        # errors aren't cached
+        for i in range(2):
+            with self.assertRaises(TypeError) as cm:
+                get_conversion_tuple('ft', 's')
+            self.assertEqual(str(cm.exception), 'Incompatible units')
+
 if __name__ == "__main__":
     unittest.main()
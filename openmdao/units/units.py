@@ -654,6 +654,127 @@ class PhysicalUnit(object):
 
 _UNIT_CACHE = {}
 
+# (src_units, target_units) -> (factor, offset)
+_CONVERSION_CACHE = {}
+
+_TOKEN = re.compile(r'\s*(?:(\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)'
+                    r'|([A-Za-z_][A-Za-z_0-9]*)|(\*\*|[-+*/()]))')
+
+
+def _parse_unit(expr, namespace):
+    """
+    Evaluates a unit expression made of numbers, names from `namespace`,
+    parentheses and the operators +, -, *, / and **, with the same
+    precedence and result as the equivalent python expression.
+
+    Args
+    ----
+    expr : str
+        The unit expression, e.g., 'kg*m/s**2'.
+
+    namespace : dict
+        Maps each name that may appear in `expr` to its value.
+
+    Returns
+    -------
+    PhysicalUnit or float
+        The value of the expression.
+
+    Raises
+    ------
+    NameError
+        If `expr` contains a name that isn't in `namespace`.
+
+    SyntaxError
+        If `expr` isn't a valid expression.
+    """
+    tokens = []
+    pos = 0
+    expr = expr.rstrip()
+    while pos < len(expr):
+        match = _TOKEN.match(expr, pos)
+        if match is None:
+            raise SyntaxError("invalid unit expression '%s'" % expr)
+        number, name, op = match.groups()
+        if number is not None:
+            if '.' in number or 'e' in number or 'E' in number:
+                tokens.append(('value', float(number)))
+            else:
+                tokens.append(('value', int(number)))
+        elif name is not None:
+            try:
+                tokens.append(('value', namespace[name]))
+            except KeyError:
+                raise NameError("name '%s' is not defined" % name)
+        else:
+            tokens.append(('op', op))
+        pos = match.end()
+
+    tokens.append(('op', None))
+    idx = [0]
+
+    def peek():
+        return tokens[idx[0]]
+
+    def take(op=None):
+        token = tokens[idx[0]]
+        if op is not None and token != ('op', op):
+            raise SyntaxError("invalid unit expression '%s'" % expr)
+        idx[0] += 1
+        return token
+
+    def atom():
+        kind, value = take()
+        if kind == 'value':
+            return value
+        if value == '(':
+            value = additive()
+            take(')')
+            return value
+        raise SyntaxError("invalid unit expression '%s'" % expr)
+
+    def power():
+        # ** binds tighter than a unary operator on its left, but not on
+        # its right, so -x**2 is -(x**2) and x**-2 is x**(-2)
+        value = atom()
+        if peek() == ('op', '**'):
+            take()
+            value = value ** unary()
+        return value
+
+    def unary():
+        if peek() == ('op', '-'):
+            take()
+            return -unary()
+        if peek() == ('op', '+'):
+            take()
+            return +unary()
+        return power()
+
+    def multiplicative():
+        value = unary()
+        while peek() in (('op', '*'), ('op', '/')):
+            if take()[1] == '*':
+                value = value * unary()
+            else:
+                value = value / unary()
+        return value
+
+    def additive():
+        value = multiplicative()
+        while peek() in (('op', '+'), ('op', '-')):
+            if take()[1] == '+':
+                value = value + multiplicative()
+            else:
+                value = value - multiplicative()
+        return value
+
+    value = additive()
+    if peek() != ('op', None):
+        raise SyntaxError("invalid unit expression '%s'" % expr)
+    return value
+
+
 def _find_unit(unit):
     """Find unit helper function."""
     if isinstance(unit, str):
@@ -662,7 +783,7 @@ def _find_unit(unit):
             unit = _UNIT_CACHE[name]
         except KeyError:
             try:
-                unit = eval(name, {'__builtins__':None}, _UNIT_LIB.unit_table)
+                unit = _parse_unit(name, _UNIT_LIB.unit_table)
             except Exception:
 
                 # This unit might include prefixed units that aren't in the
@@ -676,9 +797,7 @@ def _find_unit(unit):
                 for item in regex.findall(name):
                     #check if this was a compound unit, so each substring might
                     # be a unit
-                    try:
-                        eval(item, {'__builtins__':None}, _UNIT_LIB.unit_table)
-                    except Exception: #maybe is a prefixed unit then
+                    if item not in _UNIT_LIB.unit_table: #maybe is a prefixed unit then
                         #check for single letter prefix before unit
                         if(item[0] in _UNIT_LIB.prefixes and \
                            item[1:] in _UNIT_LIB.unit_table):
@@ -696,7 +815,7 @@ def _find_unit(unit):
                             raise ValueError("no unit named '%s' is defined"
                                              % item)
 
-                unit = eval(name, {'__builtins__':None}, _UNIT_LIB.unit_table)
+                unit = _parse_unit(name, _UNIT_LIB.unit_table)
 
             _UNIT_CACHE[name] = unit
 
@@ -735,8 +854,9 @@ def add_unit(name, unit, comment=''):
     if comment:
         _UNIT_LIB.help.append((name, comment, unit))
     if isinstance(unit, str):
-        unit = eval(unit, {'__builtins__':None, 'pi':pi},
-                           _UNIT_LIB.unit_table)
+        namespace = dict(_UNIT_LIB.unit_table)
+        namespace['pi'] = pi
+        unit = _parse_unit(unit, namespace)
     unit.set_name(name)
     if name in _UNIT_LIB.unit_table:
         if (_UNIT_LIB.unit_table[name].factor!=unit.factor or \
@@ -761,7 +881,9 @@ def import_library(libfilepointer):
     """Imports a units library, replacing any existing definitions."""
     global _UNIT_LIB
     global _UNIT_CACHE
+    global _CONVERSION_CACHE
     _UNIT_CACHE = {}
+    _CONVERSION_CACHE = {}
     _UNIT_LIB = ConfigParser()
     _UNIT_LIB.optionxform = _do_nothing
     _UNIT_LIB.readfp(libfilepointer)
@@ -877,8 +999,9 @@ def convert_units(value, units, convunits):
 
     Args
     ----
-    value : float
-        Quantity you would like to convert.
+    value : float or ndarray
+        Quantity you would like to convert. All the values in an array
+        are converted at once.
 
     units : string
         Valid unit string that declares the source units.
@@ -888,20 +1011,17 @@ def convert_units(value, units, convunits):
 
     Returns
     -------
-    float : Converted quantity.
+    float or ndarray : Converted quantity.
     """
-    pq = PhysicalQuantity(value, units)
-    pq.convert_to_unit(convunits)
-    return pq.value
+    factor, offset = get_conversion_tuple(units, convunits)
+    return (value + offset) * factor
 
 def get_conversion_tuple(src_units, target_units):
     """Return the factor and offset between the 2 compatible units.
+    The result for each pair of units is cached.
 
     Args
     ----
-    value : float
-        Quantity you would like to convert.
-
     src_units : string
         Valid unit string that declares the source units.
 
@@ -912,9 +1032,15 @@ def get_conversion_tuple(src_units, target_units):
     -------
     tuple(float, float) : Tuple containing the conversion factor and offset.
     """
-    pq = PhysicalQuantity(1.0, src_units)
-    target = _find_unit(target_units)
-    return pq.unit.conversion_tuple_to(target)
+    try:
+        return _CONVERSION_CACHE[src_units, target_units]
+    except (KeyError, TypeError):
+        pass
+
+    conv = _find_unit(src_units).conversion_tuple_to(_find_unit(target_units))
+    if isinstance(src_units, str) and isinstance(target_units, str):
+        _CONVERSION_CACHE[src_units, target_units] = conv
+    return conv
 
 
 # Load in the default unit library
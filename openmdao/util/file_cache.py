@@ -0,0 +1,223 @@
+""" A persistent, content-addressed store for sets of files. """
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+from os.path import join, exists, getsize, getmtime
+
+
+def hash_file(path, blocksize=1 << 20):
+    """
+    Args
+    ----
+    path : str
+        Path of the file to hash.
+
+    blocksize : int, optional
+        Number of bytes read at a time.
+
+    Returns
+    -------
+    str
+        Hex digest of the SHA-1 hash of the file contents.
+    """
+    sha = hashlib.sha1()
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(blocksize)
+            if not block:
+                break
+            sha.update(block)
+    return sha.hexdigest()
+
+
+class FileCache(object):
+    """
+    Stores named sets of files on disk under a key. The contents of each file
+    are stored once under their hash, so identical files shared by several
+    entries only take up space once. When the total size of the stored
+    contents exceeds `max_size`, the least recently used entries are evicted.
+
+    The cache lives entirely in `directory`, so it persists between runs and
+    can be shared by several processes. Its lock only serializes the threads
+    of one process, though. Files and entries are written under temporary
+    names and renamed into place, so other processes never read a partial
+    file, but an entry that is evicted or replaced by another process while
+    it's being read or written can be lost, which shows up as a miss.
+
+    Args
+    ----
+    directory : str
+        Directory where the cache is stored. It is created if necessary.
+
+    max_size : int, optional
+        Maximum total size in bytes of the stored file contents. A value of
+        zero implies no limit.
+    """
+
+    def __init__(self, directory, max_size=0):
+        self.directory = os.path.abspath(directory)
+        self.max_size = max_size
+        self._entry_dir = join(self.directory, 'entries')
+        self._blob_dir = join(self.directory, 'blobs')
+        self._lock = threading.Lock()
+
+        for dname in (self._entry_dir, self._blob_dir):
+            if not exists(dname):
+                try:
+                    os.makedirs(dname)
+                except OSError:
+                    if not exists(dname):  # not just created by someone else
+                        raise
+
+    def get(self, key, dest):
+        """
+        Copy the files stored under `key` to their destinations and mark the
+        entry as recently used.
+
+        Args
+        ----
+        key : str
+            Key of the entry.
+
+        dest : callable
+            Called with the name of each stored file to get the path where
+            it should be copied.
+
+        Returns
+        -------
+        dict or None
+            The metadata stored with the entry, or None if there is no
+            complete entry for `key`.
+        """
+        entry_path = self._entry_path(key)
+        with self._lock:
+            try:
+                with open(entry_path, 'r') as f:
+                    entry = json.load(f)
+                for name, (digest, size) in entry['files'].items():
+                    path = dest(name)
+                    dname = os.path.dirname(path)
+                    if dname and not exists(dname):
+                        os.makedirs(dname)
+                    shutil.copyfile(self._blob_path(digest), path)
+                os.utime(entry_path, None)
+            except (IOError, OSError, ValueError):
+                return None
+
+        return entry['meta']
+
+    def put(self, key, files, meta=None):
+        """
+        Store files under `key`, replacing any existing entry, then evict
+        least recently used entries if the cache is too large.
+
+        Args
+        ----
+        key : str
+            Key of the entry.
+
+        files : dict
+            Maps the name of each file to the path of an existing file whose
+            contents are to be stored.
+
+        meta : dict, optional
+            JSON serializable data to be stored with the entry.
+        """
+        entry = { 'files': {}, 'meta': meta or {} }
+        with self._lock:
+            for name, path in files.items():
+                digest = hash_file(path)
+                blob = self._blob_path(digest)
+                if not exists(blob):
+                    self._atomic_copy(path, blob)
+                entry['files'][name] = (digest, getsize(blob))
+
+            fd, tmp = tempfile.mkstemp(dir=self._entry_dir)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            self._replace(tmp, self._entry_path(key))
+
+            if self.max_size > 0:
+                self._evict(keep=key)
+
+    def size(self):
+        """
+        Returns
+        -------
+        int
+            Total size in bytes of the stored file contents.
+        """
+        return sum(getsize(join(self._blob_dir, b))
+                   for b in os.listdir(self._blob_dir) if not b.startswith('tmp'))
+
+    def clear(self):
+        """ Remove all entries from the cache. """
+        with self._lock:
+            for dname in (self._entry_dir, self._blob_dir):
+                for name in os.listdir(dname):
+                    _remove(join(dname, name))
+
+    def _evict(self, keep):
+        """ Remove least recently used entries until the cache fits in
+        max_size, never removing the entry for `keep`."""
+        entries = []
+        for name in os.listdir(self._entry_dir):
+            if not name.endswith('.json'):
+                continue
+            path = join(self._entry_dir, name)
+            try:
+                with open(path, 'r') as f:
+                    files = json.load(f)['files']
+                entries.append((getmtime(path), name[:-5], path, files))
+            except (IOError, OSError, ValueError):
+                continue
+
+        # total size of the contents referenced by each blob
+        blob_refs = {}
+        blob_sizes = {}
+        for _, _, _, files in entries:
+            for digest, size in files.values():
+                blob_refs[digest] = blob_refs.get(digest, 0) + 1
+                blob_sizes[digest] = size
+        total = sum(blob_sizes.values())
+
+        for _, key, path, files in sorted(entries):
+            if total <= self.max_size:
+                break
+            if key == keep:
+                continue
+            _remove(path)
+            for digest, size in files.values():
+                blob_refs[digest] -= 1
+                if blob_refs[digest] == 0:
+                    total -= size
+                    _remove(self._blob_path(digest))
+
+    def _entry_path(self, key):
+        return join(self._entry_dir, '%s.json' % key)
+
+    def _blob_path(self, digest):
+        return join(self._blob_dir, digest)
+
+    def _atomic_copy(self, src, dst):
+        fd, tmp = tempfile.mkstemp(dir=self._blob_dir)
+        os.close(fd)
+        shutil.copyfile(src, tmp)
+        self._replace(tmp, dst)
+
+    def _replace(self, src, dst):
+        if os.name == 'nt' and exists(dst):
+            _remove(dst)
+        os.rename(src, dst)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -2,6 +2,8 @@
 
 import itertools
 import os
+import shutil
+import threading
 import warnings
 import pprint
 from six import string_types, iteritems
@@ -18,9 +20,15 @@ def build_directory(dct, force=False, topdir='.'):
     is False. If force is True, the file will be overwritten.
 
     The structure of the dict is as follows: if the value at a key is a
-    dict, then that key is used to create a directory. Otherwise, the key is
-    used to create a file, and the value stored at that key is written to the
-    file. All keys must be relative names or a RuntimeError will be raised.
+    dict, then that key is used to create a directory. If the value is
+    callable, it is called with the absolute path of the file to be created
+    and is responsible for creating it (see `link_file`). Otherwise, the key
+    is used to create a file, and the value stored at that key is written to
+    the file. All keys must be relative names or a RuntimeError will be
+    raised.
+
+    The current working directory is not changed, so it is safe to call this
+    from multiple threads.
 
     Args
     ----
@@ -31,32 +39,84 @@ def build_directory(dct, force=False, topdir='.'):
     topdir : string, optional
         Specify a top directory.
     """
-    #TODO: if a value stored in the dict is a callable, then call it and store
-    #      its return value as the contents of the file
-    startdir = os.getcwd()
     topdir = os.path.abspath(topdir)
-    try:
-        for key, val in iteritems(dct):
-            os.chdir(topdir)
-            if os.path.isabs(key):
-                raise RuntimeError("build_directory: key (%s) is not a relative name" % key)
-            if isinstance(val, dict):  # it's a dict, so this is a directory
-                if not os.path.exists(key):
-                    os.makedirs(key)
-                os.chdir(key)
-                build_directory(val, force)
+    for key, val in iteritems(dct):
+        if os.path.isabs(key):
+            raise RuntimeError("build_directory: key (%s) is not a relative name" % key)
+        path = join(topdir, key)
+        if isinstance(val, dict):  # it's a dict, so this is a directory
+            if not os.path.exists(path):
+                os.makedirs(path)
+            build_directory(val, force, path)
+        elif os.path.lexists(path) and force is False:
+            warnings.warn("File '%s' already exists and will not be overwritten."
+                          % key, Warning)
+        else:
+            dname = os.path.dirname(path)
+            if not os.path.isdir(dname):
+                os.makedirs(dname)
+            if callable(val):
+                if os.path.lexists(path):
+                    os.remove(path)
+                val(path)
             else:  # assume a string value. Use that value to create a file
-                if os.path.exists(key) and force is False:
-                    warnings.warn("File '%s' already exists and will not be overwritten."
-                                  % key, Warning)
-                else:
-                    dname = os.path.dirname(key)
-                    if dname and not os.path.isdir(dname):
-                        os.makedirs(dname)
-                    with open(key, 'w') as f:
-                        f.write(val)
-    finally:
-        os.chdir(startdir)
+                with open(path, 'w') as f:
+                    f.write(val)
+
+
+def link_file(src, dst, mode='symlink'):
+    """Make `dst` refer to the existing file `src`. Symbolic and hard links
+    avoid copying the file contents, so they should only be used for files
+    that will not be modified through `dst`. If a link can't be created (for
+    example a hard link across filesystems), the file is copied instead.
+
+    Args
+    ----
+    src : str
+        Path of the existing file.
+    dst : str
+        Path of the file to be created.
+    mode : str, optional
+        One of 'symlink', 'hardlink' or 'copy'.
+    """
+    src = os.path.abspath(src)
+    if mode == 'symlink' and hasattr(os, 'symlink'):
+        try:
+            os.symlink(src, dst)
+            return
+        except OSError:
+            pass
+    elif mode == 'hardlink' and hasattr(os, 'link'):
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+    elif mode not in ('symlink', 'hardlink', 'copy'):
+        raise ValueError("link_file: unknown mode '%s'" % mode)
+
+    shutil.copy2(src, dst)
+
+
+def remove_directory(path, background=False):
+    """Remove a directory tree, ignoring any errors.
+
+    Args
+    ----
+    path : str
+        Directory to be removed.
+    background : bool, optional
+        If True, remove the directory in a daemon thread and return that
+        thread without waiting for it to finish.
+    """
+    if not background:
+        shutil.rmtree(path, ignore_errors=True)
+        return None
+
+    remover = threading.Thread(target=shutil.rmtree, args=(path, True))
+    remover.daemon = True
+    remover.start()
+    return remover
 
 
 def find_files(start, match=None, exclude=None,
@@ -2,12 +2,61 @@ import os.path
 import signal
 import subprocess
 import sys
+import threading
 import time
+from contextlib import contextmanager
 
 PIPE = subprocess.PIPE
 STDOUT = subprocess.STDOUT
 DEV_NULL = 'nul:' if sys.platform == 'win32' else '/dev/null'
 
+# Time allowed for a process to exit after being terminated before it is killed.
+TERMINATE_GRACE = 1.0
+
+# Semaphore limiting the number of processes run within `proc_slot` at once.
+# None means there is no limit.
+_proc_slots = None
+_max_procs = 0
+
+
+def set_max_procs(max_procs):
+    """
+    Set the maximum number of external processes that may run at the same
+    time within :func:`proc_slot`. This limit is global to the current
+    Python process.
+
+    max_procs: int
+        Maximum number of concurrent processes. A value of zero implies no
+        limit.
+    """
+    global _proc_slots, _max_procs
+    if max_procs < 0:
+        raise ValueError('max_procs must be >= 0')
+    _max_procs = max_procs
+    _proc_slots = threading.Semaphore(max_procs) if max_procs > 0 else None
+
+
+def get_max_procs():
+    """ Return the current global limit on concurrent processes. """
+    return _max_procs
+
+
+@contextmanager
+def proc_slot():
+    """
+    Context manager that blocks until one of the global process slots is
+    available and holds it for the duration of the block.
+    """
+    slots = _proc_slots
+    if slots is None:
+        yield
+    else:
+        slots.acquire()
+        try:
+            yield
+        finally:
+            slots.release()
+
 
 class CalledProcessError(subprocess.CalledProcessError):
     """ :class:`subprocess.CalledProcessError` plus `errormsg` attribute. """
@@ -41,10 +90,14 @@ class ShellProc(subprocess.Popen):
 
     env: dict
         Environment variables for the command.
+
+    cwd: string
+        Directory in which to run the command. Stream file names are
+        not affected by this.
     """
 
     def __init__(self, args, stdin=None, stdout=None, stderr=None, env=None,
-                 universal_newlines=False):
+                 universal_newlines=False, cwd=None):
         environ = os.environ.copy()
         if env:
             environ.update(env)
@@ -73,7 +126,7 @@ class ShellProc(subprocess.Popen):
         try:
             subprocess.Popen.__init__(self, args, stdin=self._inp,
                                       stdout=self._out, stderr=self._err,
-                                      shell=shell, env=environ,
+                                      shell=shell, env=environ, cwd=cwd,
                                       universal_newlines=universal_newlines)
         except Exception:
             self.close_files()
@@ -104,13 +157,15 @@ class ShellProc(subprocess.Popen):
 
     def wait(self, poll_delay=0., timeout=0.):
         """
-        Polls for command completion or timeout.
+        Waits for command completion or timeout.
         Closes any files implicitly opened.
         Returns ``(return_code, error_msg)``.
 
         poll_delay: float (seconds)
             Time to delay between polling for command completion.
-            A value of zero uses an internal default.
+            A value of zero waits for the process to exit without polling,
+            which allows many processes to be waited on concurrently from
+            separate threads.
 
         timeout: float (seconds)
             Maximum time to wait for command completion.
@@ -118,20 +173,10 @@ class ShellProc(subprocess.Popen):
         """
         return_code = None
         try:
-            if poll_delay <= 0:
-                poll_delay = max(0.1, timeout/100.)
-                poll_delay = min(10., poll_delay)
-            npolls = int(timeout / poll_delay) + 1
-
-            time.sleep(poll_delay)
-            return_code = self.poll()
-            while return_code is None:
-                npolls -= 1
-                if (timeout > 0) and (npolls < 0):
-                    self.terminate()
-                    break
-                time.sleep(poll_delay)
-                return_code = self.poll()
+            if poll_delay > 0:
+                return_code = self._poll_wait(poll_delay, timeout)
+            else:
+                return_code = self._event_wait(timeout)
         finally:
             self.close_files()
 
@@ -142,6 +187,51 @@ class ShellProc(subprocess.Popen):
             self.errormsg = 'Timed out'
         return (return_code, self.errormsg)
 
+    def _poll_wait(self, poll_delay, timeout):
+        """ Sleep for `poll_delay` between checks for command completion. """
+        npolls = int(timeout / poll_delay) + 1
+
+        time.sleep(poll_delay)
+        return_code = self.poll()
+        while return_code is None:
+            npolls -= 1
+            if (timeout > 0) and (npolls < 0):
+                self.terminate()
+                break
+            time.sleep(poll_delay)
+            return_code = self.poll()
+
+        return return_code
+
+    def _event_wait(self, timeout):
+        """
+        Block in a helper thread until the process exits and wake up as soon
+        as it does. If `timeout` expires first, the process is terminated
+        (and killed if it doesn't exit within `TERMINATE_GRACE`) and None is
+        returned.
+        """
+        done = threading.Event()
+
+        def _reap():
+            try:
+                subprocess.Popen.wait(self)
+            finally:
+                done.set()
+
+        waiter = threading.Thread(target=_reap)
+        waiter.daemon = True
+        waiter.start()
+
+        if done.wait(timeout if timeout > 0 else None):
+            waiter.join()
+            return self.returncode
+
+        super(ShellProc, self).terminate()
+        if not done.wait(TERMINATE_GRACE):
+            self.kill()
+        waiter.join()
+        return None
+
     def error_message(self, return_code):
         """
         Return error message for `return_code`.
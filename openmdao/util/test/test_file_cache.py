@@ -0,0 +1,86 @@
+"""
+Test FileCache.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from openmdao.util.file_cache import FileCache
+
+
+class FileCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.startdir = os.getcwd()
+        self.tempdir = tempfile.mkdtemp(prefix='test_filecache-')
+        os.chdir(self.tempdir)
+
+    def tearDown(self):
+        os.chdir(self.startdir)
+        if not os.environ.get('OPENMDAO_KEEPDIRS', False):
+            try:
+                shutil.rmtree(self.tempdir)
+            except OSError:
+                pass
+
+    def _write(self, name, contents):
+        with open(name, 'w') as f:
+            f.write(contents)
+        return name
+
+    def _read(self, name):
+        with open(name) as f:
+            return f.read()
+
+    def test_put_get(self):
+        cache = FileCache('cache')
+        self.assertEqual(cache.get('k1', lambda n: n), None)
+
+        cache.put('k1', {'a.out': self._write('a', 'aaaa'),
+                         'b.out': self._write('b', 'aaaa')}, meta={'x': 1})
+
+        # identical contents are only stored once
+        self.assertEqual(cache.size(), 4)
+
+        os.mkdir('restore')
+        meta = cache.get('k1', lambda n: os.path.join('restore', n))
+        self.assertEqual(meta, {'x': 1})
+        self.assertEqual(self._read(os.path.join('restore', 'a.out')), 'aaaa')
+        self.assertEqual(self._read(os.path.join('restore', 'b.out')), 'aaaa')
+
+        # the cache persists on disk
+        cache = FileCache('cache')
+        self.assertEqual(cache.get('k1', lambda n: n), {'x': 1})
+        self.assertEqual(self._read('a.out'), 'aaaa')
+
+        cache.clear()
+        self.assertEqual(cache.get('k1', lambda n: n), None)
+        self.assertEqual(cache.size(), 0)
+
+    def test_lru_eviction(self):
+        cache = FileCache('cache', max_size=25)
+
+        for i in range(3):
+            cache.put('k%d' % i, {'out': self._write('f%d' % i, str(i)*10)})
+            time.sleep(0.05)
+
+        # k0 was evicted to make room for k2
+        self.assertEqual(cache.size(), 20)
+        self.assertEqual(cache.get('k0', lambda n: n), None)
+
+        # using k1 makes k2 the least recently used
+        self.assertEqual(cache.get('k1', lambda n: n), {})
+        time.sleep(0.05)
+        cache.put('k3', {'out': self._write('f3', '3'*10)})
+
+        self.assertEqual(cache.get('k2', lambda n: n), None)
+        self.assertEqual(cache.get('k1', lambda n: n), {})
+        self.assertEqual(cache.get('k3', lambda n: n), {})
+        self.assertEqual(self._read('out'), '3'*10)
+
+
+if __name__ == '__main__':
+    unittest.main()
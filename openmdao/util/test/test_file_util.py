@@ -9,7 +9,10 @@ import unittest
 import tempfile
 from fnmatch import fnmatch
 
-from openmdao.util.file_util import build_directory, find_files
+from functools import partial
+
+from openmdao.util.file_util import build_directory, find_files, link_file, \
+                                    remove_directory
 
 
 STRUCTURE = {
@@ -89,6 +92,30 @@ class FileUtilTestCase(unittest.TestCase):
         self.assertEqual(set([os.path.basename(f) for f in flist]),
                          set(['d1d1f1.exe', 'd1d2f2']))
 
+    def test_build_directory_links(self):
+        src = os.path.join(self.tempdir, 'd1', 'd1d2', 'd1d2f2')
+        topdir = os.path.join(self.tempdir, 'linked')
+        build_directory({
+            'sym': partial(link_file, src, mode='symlink'),
+            'sub/hard': partial(link_file, src, mode='hardlink'),
+            'copy': partial(link_file, src, mode='copy'),
+        }, topdir=topdir)
+
+        self.assertEqual(os.getcwd(), self.tempdir)
+        for name in ('sym', 'sub/hard', 'copy'):
+            with open(os.path.join(topdir, name)) as f:
+                self.assertEqual(f.read(), '# a comment')
+
+        if hasattr(os, 'symlink'):
+            self.assertTrue(os.path.islink(os.path.join(topdir, 'sym')))
+        if hasattr(os, 'link'):
+            self.assertTrue(os.path.samefile(src, os.path.join(topdir, 'sub', 'hard')))
+        self.assertFalse(os.path.islink(os.path.join(topdir, 'copy')))
+
+        remove_directory(topdir, background=True).join()
+        self.assertFalse(os.path.exists(topdir))
+        self.assertTrue(os.path.exists(src))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -8,6 +8,7 @@ import signal
 import sys
 import tempfile
 import shutil
+import time
 import unittest
 
 from openmdao.util.shell_proc import call, check_call, CalledProcessError, \
@@ -95,6 +96,29 @@ class TestCase(unittest.TestCase):
         else:
             self.assertEqual(msg, ': SIGTERM')
 
+    def test_timeout(self):
+        logging.debug('')
+        logging.debug('test_timeout')
+
+        if sys.platform == 'win32':
+            return
+
+        start = time.time()
+        return_code, error_msg = call('sleep 5', timeout=0.5)
+        elapsed = time.time() - start
+
+        self.assertEqual(return_code, None)
+        self.assertEqual(error_msg, 'Timed out')
+        self.assertTrue(elapsed < 3.0)
+
+        # completion is noticed without waiting for a poll interval
+        start = time.time()
+        return_code, error_msg = call('sleep 0.1', timeout=30.)
+        elapsed = time.time() - start
+
+        self.assertEqual(return_code, 0)
+        self.assertTrue(elapsed < 1.0)
+
 
 if __name__ == '__main__':
     import nose
@@ -0,0 +1,62 @@
+"""
+Test WorkerThreads.
+"""
+
+import threading
+import unittest
+
+from openmdao.util.thread_util import WorkerThreads
+
+
+class TestCase(unittest.TestCase):
+    """ Test WorkerThreads. """
+
+    def test_batches(self):
+        lock = threading.Lock()
+        calls = []
+
+        def func(item):
+            with lock:
+                calls.append((item, threading.current_thread()))
+
+        threads = WorkerThreads(func, [[1, 3, 5], [2, 4], []])
+        threads.start()
+        threads.join()
+        threads.reraise([1, 2, 3, 4, 5])
+
+        self.assertEqual(sorted(item for item, thread in calls), [1, 2, 3, 4, 5])
+
+        # each batch runs in order in a single thread
+        for batch in ([1, 3, 5], [2, 4]):
+            self.assertEqual([item for item, thread in calls if item in batch], batch)
+            self.assertEqual(len(set(thread for item, thread in calls
+                                     if item in batch)), 1)
+        self.assertNotIn(threading.current_thread(),
+                         [thread for item, thread in calls])
+
+    def test_reraise_order(self):
+        calls = []
+
+        def func(item):
+            calls.append(item)
+            if item in (2, 3):
+                raise RuntimeError('%d failed' % item)
+
+        threads = WorkerThreads(func, [[1, 3, 5], [2, 4]])
+        threads.start()
+        threads.join()
+
+        # each batch stops at its first failure
+        self.assertEqual(sorted(calls), [1, 2, 3])
+
+        with self.assertRaises(RuntimeError) as cm:
+            threads.reraise([1, 2, 3, 4, 5])
+        self.assertEqual(str(cm.exception), '2 failed')
+
+        with self.assertRaises(RuntimeError) as cm:
+            threads.reraise([5, 4, 3, 2, 1])
+        self.assertEqual(str(cm.exception), '3 failed')
+
+
+if __name__ == '__main__':
+    unittest.main()
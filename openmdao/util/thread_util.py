@@ -0,0 +1,71 @@
+""" Utility for running a function on several items at once in threads. """
+
+import sys
+import threading
+
+from six import reraise
+
+
+class WorkerThreads(object):
+    """Calls a function on batches of items, each batch in its own thread.
+    Any exception is saved so that it can be raised in the calling thread.
+
+    Args
+    ----
+    func : callable
+        Function that is called with each item.
+
+    batches : list of lists
+        Each list of items is passed to `func` in turn by a single thread,
+        which stops at the first item that fails.
+    """
+
+    def __init__(self, func, batches):
+        self._threads = [_WorkerThread(func, batch) for batch in batches if batch]
+
+    def start(self):
+        """ Starts the threads."""
+        for thread in self._threads:
+            thread.start()
+
+    def join(self):
+        """ Waits for all of the threads to finish."""
+        for thread in self._threads:
+            thread.join()
+
+    def reraise(self, order):
+        """ Raises the exception of the first item in `order` that failed,
+        if any.
+
+        Args
+        ----
+        order : list
+            Items in the order in which they would have been run serially.
+        """
+        failed = dict((id(thread.failed), thread.exc_info)
+                      for thread in self._threads if thread.exc_info is not None)
+        for item in order:
+            if id(item) in failed:
+                reraise(*failed[id(item)])
+
+
+class _WorkerThread(threading.Thread):
+    """Calls a function on some items in turn, stopping at the first one
+    that fails and saving the exception."""
+
+    def __init__(self, func, items):
+        super(_WorkerThread, self).__init__()
+        self.daemon = True
+        self.func = func
+        self.items = items
+        self.failed = None
+        self.exc_info = None
+
+    def run(self):
+        for item in self.items:
+            try:
+                self.func(item)
+            except Exception:
+                self.failed = item
+                self.exc_info = sys.exc_info()
+                return